@@ -6,29 +6,110 @@ Works for any number of agents - NO HEADLESS MODE (more stable)
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
 import pandas as pd
+import asyncio
 import time
-import re
 import logging
 import os
+import functools
+import threading
+
+from http_fetcher import create_fetcher, SeleniumFetcher, rebind_driver
+from driver_manager import DriverManager, DEFAULT_PROFILE_DIR, DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB
+from resource_blocking import ResourceBlocker
+from async_scraper import fetch_profiles
+from browser_pool import scrape_with_browser_pool
+from tab_pool import TabPool
+from waits import PageWaiter, AGENT_CARD_SELECTOR
+from structured_extract import extract_structured_fields
+from field_extraction import fill_missing_fields
+from html_parsers import get_parser
+from metrics import MetricsRegistry
+from page_checks import classify_page, looks_blocked, CHALLENGE, EMPTY, ERROR
+from throttle import AdaptiveThrottle, SiteBlocked, DEFAULT_MAX_RATE
+from checkpoint import CheckpointLog, load_seen_urls, import_csv, export_csv, iter_records, log_size
+from records import RecordCounts, profile_id
+from parquet_sink import ParquetSink, require_pyarrow
+from crawl_frontier import CrawlFrontier, IN_FLIGHT, DONE, FAILED
+from page_cache import PageCache, CachingFetcher, DEFAULT_TTL, SEARCH_PAGE_TTL
+from recrawl import latest_records, diff_records, write_changes_csv
+from search_pages import discover_profile_urls, SITE_URL
+from pipeline import Pipeline
+from dom_harvest import DomHarvester
+from devtools_capture import (enable_performance_logging, NetworkCapture, cards_from_html,
+                              card_is_complete, CARD_FIELDS)
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
 class RealtorAgentScraperStable:
-    def __init__(self):
+    use_structured_data = True  # Read embedded page JSON before falling back to text + regex
+    use_direct_pagination = True  # Fetch result pages by URL (pg-N) before falling back to clicking Next
+    use_identity_index = True  # Link agents already scraped for another city instead of fetching them again
+    use_adaptive_throttle = True  # AIMD request pacing + circuit breaker driven by each response's outcome
+
+    def __init__(self, fetch_backend='selenium', concurrency=1, requests_per_second=None, browser_workers=1,
+                 tabs=1, parser='html.parser', frontier_path='crawl_state.db', cache_dir=None,
+                 cache_ttl=DEFAULT_TTL, freshness_window=None, capture_network=False, block_resources='minimal',
+                 streaming=False, parquet_dir=None, headless=False, base_url=SITE_URL, metrics_report=None,
+                 metrics_port=None, profile_dir=DEFAULT_PROFILE_DIR, max_pages_per_driver=DEFAULT_MAX_PAGES,
+                 max_driver_rss_mb=DEFAULT_MAX_RSS_MB):
+        if parquet_dir:
+            require_pyarrow()  # Fail before Chrome starts, not at the first record
+        self.metrics = MetricsRegistry()  # Per-stage latency histograms and counters for this session
+        self.metrics_report = metrics_report  # JSON run report written on close
+        if metrics_port is not None:
+            self.metrics.serve(metrics_port)  # Prometheus text at /metrics while the run lasts
         logger.info("Initializing ChromeDriver...")
+        self.parser = get_parser(parser)  # HTML parser for the text fallback
+        self.tabs = tabs  # Tabs in this one Chrome (>1 = multi-tab mode)
+        self.headless = headless
+        self.base_url = base_url
+        self.search_url = f"{base_url.rstrip('/')}/realestateagents"  # Search page and pg-N results live under it
+        self.capture_network = capture_network  # Read search results from the page's JSON responses
+        # Persistent Chrome profile; the browser is replaced after N pages or past an RSS threshold
+        self.drivers = DriverManager(self.chrome_options, profile_dir=profile_dir, max_pages=max_pages_per_driver,
+                                     max_rss_mb=max_driver_rss_mb, warm_url=base_url, metrics=self.metrics)
         self.driver = self.setup_driver()
-        self.agents = []
-        self.save_frequency = 50  # Save every 50 agents
+        self.driver_lock = threading.RLock()  # Streaming mode: discovery and profile fetches share the driver
+        self.network_capture = NetworkCapture(self.driver) if capture_network else None
+        self.resource_blocker = ResourceBlocker(self.driver, block_resources)  # Network-level blocklist preset
+        self.resource_blocker.start()
+        self.card_fields = {}  # profile_url -> fields from the search results JSON (complete ones skip the visit)
+        self.waiter = PageWaiter(self.driver)
+        self.harvester = DomHarvester(self.driver)  # Result links read in one script call per page
+        # requests_per_second is the throttle's ceiling; it starts lower and climbs while responses are clean
+        self.throttle = (AdaptiveThrottle(max_rate=requests_per_second or DEFAULT_MAX_RATE)
+                         if self.use_adaptive_throttle else None)
+        self.fetcher = create_fetcher(fetch_backend, self.driver, settle_time=0.8, waiter=self.waiter,
+                                      blocker=self.resource_blocker, lock=self.driver_lock, metrics=self.metrics,
+                                      on_load=self.drivers.page_loaded)
+        self.page_cache = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None  # Fetched pages on disk
+        if self.page_cache:
+            self.fetcher = CachingFetcher(self.fetcher, self.page_cache)
+        self.scraped = RecordCounts()  # Running totals for agents scraped in this session (records go to the log)
+        self.run_log_start = None  # Progress log offset where this session's records begin
+        self.checkpoint = None  # Append-only progress log for the current city
+        self.parquet_dir = parquet_dir  # Also write agents to a state/city partitioned Parquet dataset
+        self.parquet = None
+        self.save_frequency = 10  # Flush the progress log every 10 agents
+        self.concurrency = concurrency  # Profile fetches in flight (>1 = asyncio HTTP mode)
+        self.requests_per_second = requests_per_second  # Global cap for concurrent mode
+        self.browser_workers = browser_workers  # Chrome processes (>1 = worker pool mode)
+        self.worker_drivers = {}  # Pool mode: worker id -> per-generation driver stats
         self.collected_urls = set()  # Store URLs collected during pagination
+        self.frontier = CrawlFrontier(frontier_path) if frontier_path else None  # Per-URL crawl state
+        self.current_city = None  # (city, state) being scraped, for frontier updates
+        self.freshness_window = freshness_window  # Seconds; set = incremental refresh of older profiles only
+        self.previous_records = {}  # Incremental mode: records as they were before this run
+        self.search_page_batch = 8  # Result pages fetched at once during discovery
+        self.tab_batch = 50  # Multi-tab mode: profiles per tab pool run; Chrome can be recycled between runs
+        self.streaming = streaming  # Scrape profiles while discovery is still running
 
-    def setup_driver(self):
+    def chrome_options(self):
+        """Fresh ChromeOptions for each driver launch"""
         options = uc.ChromeOptions()
         
         # Optimize for speed - disable images
@@ -38,50 +119,291 @@ class RealtorAgentScraperStable:
         }
         options.add_experimental_option("prefs", prefs)
         
-        options.add_argument("--start-maximized")
+        if self.headless:
+            options.add_argument("--headless=new")
+        else:
+            options.add_argument("--start-maximized")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         
-        driver = uc.Chrome(options=options, version_main=134)
-        logger.info("ChromeDriver ready (Browser visible - more stable)")
+        # Multi-tab mode: don't block on navigation, the tab pool polls readiness itself
+        if self.tabs > 1:
+            options.page_load_strategy = 'none'
+        
+        # Network events in the performance log, for reading search results JSON
+        if self.capture_network:
+            enable_performance_logging(options)
+        return options
+
+    def setup_driver(self):
+        driver = self.drivers.start()
+        logger.info("ChromeDriver ready" + (" (headless)" if self.headless else " (Browser visible - more stable)")
+                    + f" in {self.drivers.current['startup_seconds']}s, {self.drivers.current['profile']} profile")
         return driver
 
+    def recycle_driver_if_due(self):
+        """Swap in a fresh Chrome once the current one has loaded enough pages or grown too large
+
+        Only called between profiles or cities, where no page state is held;
+        the crawl position is in the frontier and progress log, so nothing is lost.
+        """
+        if self.drivers.recycle_reason() is None:
+            return
+        with self.driver_lock:
+            # Re-check under the lock: another fetch thread may have just recycled it
+            reason = self.drivers.recycle_reason()
+            if reason is None:
+                return
+            self.driver = self.drivers.recycle(reason)
+            # Everything bound to the old driver follows the new one
+            for helper in (self.waiter, self.harvester, self.resource_blocker, self.network_capture):
+                if helper is not None:
+                    helper.driver = self.driver
+            rebind_driver(self.fetcher, self.driver)
+            self.resource_blocker.tabs = {}  # The old driver's tabs went with it
+            self.resource_blocker.apply_to_current_tab()
+            if self.network_capture:
+                self.network_capture.pending = {}
+
     def search_city(self, city, state):
-        """Search for agents in specified city"""
+        """Search for agents in specified city; returns the agent count, or None on error"""
+        agent_count = None
         try:
             search_query = f"{city}, {state}"
-            logger.info(f"\nSearching for agents in {search_query}...")
-            
-            # Navigate to search page
-            self.driver.get("https://www.realtor.com/realestateagents")
-            time.sleep(2)
-            
-            # Find and fill search input
-            search_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder, 'City')]"))
-            )
-            search_input.click()
-            time.sleep(0.3)
-            search_input.clear()
-            search_input.send_keys(search_query)
-            time.sleep(0.5)
-            search_input.send_keys(Keys.RETURN)
-            time.sleep(3)
+            self.current_city = (city, state)
+            self.recycle_driver_if_due()
             
-            # Wait for results to load
-            logger.info("Waiting for search results to load...")
-            time.sleep(2)
-            
-            # Load all pages with pagination
-            self.load_all_pages()
+            if self.streaming:
+                agent_count = self.stream_city(city, state)
+            elif self.discovery_is_fresh(city, state):
+                # An earlier run already walked every results page (recently enough, when refreshing)
+                self.collected_urls = set(self.frontier.urls(city, state))
+                logger.info(f"\nDiscovery for {search_query} already complete - "
+                            f"resuming with {len(self.collected_urls)} known URLs")
+            else:
+                discovery_started = time.time()
+                logger.info(f"\nSearching for agents in {search_query}...")
+                
+                pages = self.load_pages_directly(city, state) if self.use_direct_pagination else None
+                if pages is None:
+                    if self.use_direct_pagination:
+                        logger.info("Direct page URLs found no agents - clicking through the search instead")
+                    pages = self.search_and_click_through(search_query)
+                if self.frontier:
+                    self.frontier.mark_discovery_complete(city, state, pages=pages, started_at=discovery_started)
+                self.metrics.observe('discovery', time.time() - discovery_started)
             
             # Collect and scrape agents with progress saving
-            agent_count = self.scrape_agents_with_progress_saving(city, state)
+            if not self.streaming:
+                agent_count = self.scrape_agents_with_progress_saving(city, state)
             logger.info(f"✓ Extracted {agent_count} agents from {search_query}")
             
         except Exception as e:
             logger.error(f"Error during search: {e}")
+        
+        self.waiter.log_summary()
+        return agent_count
+    
+    def reset_city_state(self):
+        """Forget the previous city's in-memory state so a warm driver can take the next one"""
+        self.scraped = RecordCounts()
+        self.run_log_start = None
+        self.collected_urls = set()
+        self.card_fields = {}
+        self.previous_records = {}
+        self.current_city = None
+        if self.throttle:
+            self.throttle.reset_breaker()  # A block that ended the last city shouldn't fail this one unseen
+    
+    def discovery_is_fresh(self, city, state):
+        """True if the frontier has a finished pagination walk to reuse (within the freshness window, if set)"""
+        discovery = self.frontier.discovery(city, state) if self.frontier else None
+        return bool(discovery) and (self.freshness_window is None
+                                    or time.time() - discovery['completed_at'] < self.freshness_window)
+    
+    def stream_city(self, city, state):
+        """Discovery and profile scraping overlapped: profiles are fetched as result pages yield URLs
+
+        Direct page discovery streams page by page. The click-through fallback
+        needs the driver for its whole walk, so its URLs arrive all at once.
+        """
+        scraped_urls = self.load_progress(city, state)
+        already_scraped = len(scraped_urls)
+        found = set()
+        
+        def emit_new(urls, emit):
+            for url in list(urls):
+                if url not in found:
+                    found.add(url)
+                    if url not in scraped_urls:
+                        emit(url)
+        
+        def discover(emit):
+            if self.discovery_is_fresh(city, state):
+                emit_new(self.frontier.urls(city, state), emit)
+                return
+            
+            started = time.time()
+            logger.info(f"\nSearching for agents in {city}, {state} (streaming)...")
+            
+            def on_page(page_num, new_urls):
+                if self.frontier:
+                    self.frontier.add_urls(city, state, new_urls)
+                emit_new(new_urls, emit)
+            
+            pages = None
+            if self.use_direct_pagination:
+                urls, pages = discover_profile_urls(city, state, self.fetch_search_pages,
+                                                    batch_size=self.search_page_batch, base_url=self.search_url,
+                                                    on_page=on_page)
+                if urls is None:
+                    pages = None
+            if pages is None:
+                if self.use_direct_pagination:
+                    logger.info("Direct page URLs found no agents - clicking through the search instead")
+                with self.driver_lock:
+                    pages = self.search_and_click_through(f"{city}, {state}")
+                emit_new(self.collected_urls, emit)
+            if self.frontier:
+                self.frontier.mark_discovery_complete(city, state, pages=pages, started_at=started)
+            self.metrics.observe('discovery', time.time() - started)
+        
+        linked = set()  # URLs answered from the identity index (fetch hands back the record itself)
+        
+        def fetch(url):
+            record = self.known_record(url)
+            if record is not None:
+                linked.add(url)
+                return record
+            self.mark_url(url, IN_FLIGHT)
+            self.recycle_driver_if_due()
+            return self.fetch_profile(url)
+        
+        def parse(url, page):
+            if url in linked:
+                return page
+            agent = self.parse_agent_page(page, url)
+            self.check_page(page, agent)
+            return agent
+        
+        def sink(agent):
+            self.store_agent(agent, linked=agent['profile_url'] in linked)
+            logger.info(f"  ✓ [{self.scraped.total}] {agent['name']} - Phone: {agent['phone_number'] or 'N/A'}")
+        
+        self.open_outputs(city, state)
+        try:
+            pipeline = Pipeline(
+                discover, fetch, parse, sink,
+                on_error=lambda url, error: self.mark_url(url, FAILED, error),
+                fetch_workers=self.concurrency,
+                stop_on=(SiteBlocked,),
+            )
+            try:
+                pipeline.run()
+            finally:
+                pipeline.log_summary()
+        finally:
+            self.close_outputs()
+            self.collected_urls = found
+        
+        return already_scraped + self.scraped.total
+    
+    def search_and_click_through(self, search_query):
+        """Run the search in the browser and click through every results page"""
+        # Navigate to search page
+        with self.metrics.timer('search_navigate'):
+            self.driver.get(self.search_url)
+        
+        # Find and fill search input as soon as it is usable
+        search_input = self.waiter.wait_for_element(
+            'search', By.XPATH, "//input[contains(@placeholder, 'City')]", clickable=True
+        )
+        if search_input is None:
+            raise RuntimeError("Search box did not appear")
+        search_input.click()
+        search_input.clear()
+        search_input.send_keys(search_query)
+        self.waiter.wait_for_network_idle('search', idle_time=0.3)  # Autocomplete request
+        search_input.send_keys(Keys.RETURN)
+        
+        # Wait for results to load
+        logger.info("Waiting for search results to load...")
+        self.waiter.wait_for_cards_settled('results')
+        
+        # Load all pages with pagination
+        return self.load_all_pages()
+    
+    def load_pages_directly(self, city, state):
+        """Collect URLs by fetching the pg-N result pages in concurrent batches
+
+        Returns the number of pages read, or None if page 1 had no agent links.
+        """
+        def on_page(page_num, new_urls):
+            if self.frontier:
+                self.frontier.add_urls(city, state, new_urls)
+        
+        urls, pages = discover_profile_urls(city, state, self.fetch_search_pages,
+                                            batch_size=self.search_page_batch, base_url=self.search_url,
+                                            on_page=on_page)
+        if urls is None:
+            return None
+        
+        logger.info(f"\n{'='*70}")
+        logger.info(f"FINISHED LOADING {pages} PAGES")
+        logger.info(f"Total unique agent URLs collected: {len(urls)}")
+        logger.info(f"{'='*70}\n")
+        self.collected_urls = urls
+        return pages
+    
+    def fetch_search_pages(self, urls):
+        """Fetch a batch of result pages: page cache, then concurrent HTTP, then the browser
+
+        Cached result pages are only reused for SEARCH_PAGE_TTL, and never on
+        an incremental refresh, which has to see the current listings.
+        """
+        pages = {}
+        misses = []
+        use_cache = self.page_cache and self.freshness_window is None
+        for url in urls:
+            html = self.page_cache.get(url, max_age=SEARCH_PAGE_TTL) if use_cache else None
+            if html is None:
+                misses.append(url)
+            else:
+                pages[url] = html
+        if not misses:
+            return self.read_page_cards(pages)
+        
+        needs_browser = asyncio.run(fetch_profiles(
+            misses, pages.__setitem__,
+            concurrency=len(misses),
+            requests_per_second=self.requests_per_second,
+        ))
+        for url in needs_browser:
+            try:
+                with self.driver_lock:
+                    with self.metrics.timer('search_navigate'):
+                        self.driver.get(url)
+                    self.drivers.page_loaded()
+                    self.waiter.wait_for_cards_settled('results')
+                    with self.metrics.timer('page_source'):
+                        pages[url] = self.driver.page_source
+            except Exception as e:
+                logger.warning(f"Could not load results page {url}: {e}")
+        
+        if self.page_cache:
+            for url in misses:
+                if url in pages and not looks_blocked(200, pages[url]):
+                    self.page_cache.put(url, pages[url])
+        return self.read_page_cards(pages)
+    
+    def read_page_cards(self, pages):
+        """Keep the agent cards embedded in fetched result pages, so complete ones skip the profile visit"""
+        for html in pages.values():
+            if html:
+                for url, card in cards_from_html(html, self.search_url).items():
+                    self.card_fields.setdefault(url, {}).update(card)
+        return pages
     
     def load_all_pages(self):
         """Load all pages by clicking through pagination and collect URLs from each"""
@@ -96,28 +418,35 @@ class RealtorAgentScraperStable:
             # Scroll current page to load all agents on this page
             logger.info("Scrolling current page...")
             
-            for _ in range(5):  # Scroll 5 times per page
+            for _ in range(5):  # At most 5 scrolls per page - stop once no new cards load
+                cards_before = len(self.driver.find_elements(By.CSS_SELECTOR, AGENT_CARD_SELECTOR))
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.5)
+                cards_after = self.waiter.wait_for_cards_settled('scroll', settle_time=0.3)
+                if not cards_after or cards_after <= cards_before:
+                    break
             
-            # Collect URLs from THIS page before moving to next
+            # Collect URLs (and card text) from THIS page in one script call before moving to next
             logger.info(f"Collecting URLs from page {page_num}...")
-            agent_links = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="agent-name"]')
-            if not agent_links:
-                agent_links = self.driver.find_elements(By.CSS_SELECTOR, 'a[href*="/realestateagents/5"]')
+            self.harvester.reset()
+            self.harvester.harvest()
+            first_link = self.harvester.first_link
             
-            page_url_count = 0
-            for link in agent_links:
-                try:
-                    url = link.get_attribute('href')
-                    if url and '/realestateagents/5' in url:
-                        all_agent_urls.add(url)
-                        page_url_count += 1
-                except:
-                    pass
+            cards = self.harvest_cards(first_page=page_num == 1) if self.network_capture else {}
+            if cards:
+                # IDs straight from the search JSON
+                all_agent_urls.update(cards)
+                page_url_count = len(cards)
+            else:
+                # Card text fields are regex guesses - they stay on the harvester, never replace a visit
+                all_agent_urls.update(self.harvester.urls())
+                page_url_count = len(self.harvester.cards)
             
             logger.info(f"✓ Collected {page_url_count} URLs from page {page_num} (Total: {len(all_agent_urls)})")
             
+            # Persist as we go so a crash mid-walk keeps what was found
+            if self.frontier and self.current_city:
+                self.frontier.add_urls(*self.current_city, all_agent_urls)
+            
             # Look for "Next" button to go to next page
             try:
                 next_button = None
@@ -147,7 +476,6 @@ class RealtorAgentScraperStable:
                     
                     # Scroll to button and click
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-                    time.sleep(0.5)
                     
                     try:
                         next_button.click()
@@ -155,7 +483,10 @@ class RealtorAgentScraperStable:
                         # Try JavaScript click if regular click fails
                         self.driver.execute_script("arguments[0].click();", next_button)
                     
-                    time.sleep(3)  # Wait for next page to load
+                    # Wait for next page: old cards gone, new cards settled
+                    if first_link:
+                        self.waiter.wait_for_stale('pagination', first_link)
+                    self.waiter.wait_for_cards_settled('pagination')
                     page_num += 1
                 else:
                     logger.info(f"✓ No more pages. Loaded {page_num} page(s) total.")
@@ -177,24 +508,94 @@ class RealtorAgentScraperStable:
         
         # Store collected URLs for later use
         self.collected_urls = all_agent_urls
+        return page_num
     
-    def scrape_agents_with_progress_saving(self, city, state):
-        """Collect URLs and scrape with progress saving every N agents"""
-        
-        # Check for existing progress file
-        filename = f"agents_{city.replace(' ', '_')}_{state}_progress.csv"
-        scraped_urls = set()
-        
-        if os.path.exists(filename):
-            logger.info(f"Found existing file: {filename}")
+    def harvest_cards(self, first_page=False):
+        """Agent cards from the search JSON the page fetched since the last call
+
+        The first results page is usually server-rendered, so its cards come
+        from the embedded JSON instead. Later pages keep page 1's embedded
+        JSON after client-side navigation, so they only use the responses.
+        """
+        cards = self.network_capture.cards(self.search_url)
+        if not cards and first_page:
+            cards = cards_from_html(self.driver.page_source, self.search_url)
+        for url, card in cards.items():
+            self.card_fields.setdefault(url, {}).update(card)
+        return cards
+    
+    def store_complete_cards(self, urls_to_scrape):
+        """Agents whose search JSON card already had every field skip the profile visit"""
+        remaining = []
+        for url in urls_to_scrape:
+            card = self.card_fields.get(url)
+            if card and card_is_complete(card):
+                self.store_agent(dict({field: card[field] for field in CARD_FIELDS}, profile_url=url))
+            else:
+                remaining.append(url)
+        if len(remaining) < len(urls_to_scrape):
+            logger.info(f"{len(urls_to_scrape) - len(remaining)} agents fully filled from search results - no visit needed")
+        return remaining
+    
+    def progress_filename(self, city, state):
+        """Append-only progress log for a city"""
+        return f"agents_{city.replace(' ', '_')}_{state}_progress.jsonl"
+    
+    def open_outputs(self, city, state):
+        """Progress log (and Parquet part file) that store_agent writes to"""
+        self.checkpoint = CheckpointLog(self.progress_filename(city, state), flush_every=self.save_frequency)
+        if self.parquet_dir:
+            self.parquet = ParquetSink(self.parquet_dir, city, state)
+    
+    def close_outputs(self):
+        self.checkpoint.close()
+        self.checkpoint = None
+        if self.parquet:
+            self.parquet.close()
+            self.parquet = None
+    
+    def load_progress(self, city, state, urls=None):
+        """URLs already in the city's progress log, minus any due for an incremental refresh
+
+        Only stale URLs in `urls` are re-scraped when it is given.
+        """
+        filename = self.progress_filename(city, state)
+        legacy_filename = f"agents_{city.replace(' ', '_')}_{state}_progress.csv"
+        if not os.path.exists(filename) and os.path.exists(legacy_filename):
             try:
-                existing_df = pd.read_csv(filename)
-                if 'profile_url' in existing_df.columns:
-                    scraped_urls = set(existing_df['profile_url'].dropna())
-                    logger.info(f"Already scraped {len(scraped_urls)} agents. Will skip these.")
-                    self.agents = existing_df.to_dict('records')
+                imported = import_csv(legacy_filename, filename)
+                logger.info(f"Imported {imported} agents from {legacy_filename} into {filename}")
             except Exception as e:
-                logger.warning(f"Could not load existing file: {e}")
+                logger.warning(f"Could not import {legacy_filename}: {e}")
+        if self.run_log_start is None:
+            self.run_log_start = log_size(filename)
+        
+        # The log stays the source of truth for what was scraped: a URL marked done
+        # in the frontier whose record never got flushed is scraped again
+        scraped_urls = load_seen_urls(filename)
+        if scraped_urls:
+            logger.info(f"Found existing file: {filename}")
+            logger.info(f"Already scraped {len(scraped_urls)} agents. Will skip these.")
+            self.index_progress_log(city, state)
+        if self.frontier:
+            interrupted = self.frontier.reset_in_flight(city, state)
+            if interrupted:
+                logger.info(f"{interrupted} profiles were in flight when the last run stopped")
+        
+        # Incremental refresh: profiles scraped longer ago than the window count as not scraped
+        if self.frontier and self.freshness_window is not None:
+            stale = self.frontier.stale_urls(city, state, self.freshness_window)
+            if urls is not None:
+                stale &= urls
+            logger.info(f"{len(stale)} profiles are older than the freshness window and will be re-scraped")
+            self.previous_records = latest_records(filename, stale)
+            scraped_urls -= stale
+        return scraped_urls
+    
+    def scrape_agents_with_progress_saving(self, city, state):
+        """Collect URLs and scrape, appending every agent to the progress log"""
+        
+        scraped_urls = self.load_progress(city, state, self.collected_urls)
         
         # Use URLs collected during pagination
         agent_urls = self.collected_urls
@@ -211,165 +612,390 @@ class RealtorAgentScraperStable:
         
         if len(urls_to_scrape) == 0:
             logger.info("All agents already scraped!")
-            return len(self.agents)
+            return already_scraped
         
-        # Scrape remaining agents with progress saving
+        # Scrape remaining agents, each one appended to the log as it is extracted
+        self.open_outputs(city, state)
+        try:
+            urls_to_scrape = self.store_complete_cards(urls_to_scrape)
+            urls_to_scrape = self.link_known_agents(urls_to_scrape)
+            if self.concurrency > 1:
+                self.scrape_urls_concurrently(urls_to_scrape)
+            elif self.browser_workers > 1:
+                self.scrape_urls_with_browser_pool(urls_to_scrape)
+            elif self.tabs > 1:
+                self.scrape_urls_with_tabs(urls_to_scrape)
+            else:
+                self.scrape_urls_sequentially(urls_to_scrape, already_scraped, total_urls)
+        finally:
+            self.close_outputs()
+        logger.info(f"✓ Final save complete!")
+        
+        return already_scraped + self.scraped.total
+    
+    def scrape_urls_sequentially(self, urls_to_scrape, already_scraped, total_urls):
+        """Visit profiles one at a time with the configured fetch backend"""
         for idx, url in enumerate(urls_to_scrape, 1):
+            self.recycle_driver_if_due()
+            if self.throttle:
+                self.throttle.wait()  # Raises SiteBlocked (ending the city) if the breaker gives up
             try:
                 logger.info(f"Scraping agent {idx}/{len(urls_to_scrape)} (Total: {already_scraped + idx}/{total_urls})")
-                self.driver.get(url)
-                time.sleep(0.8)
+                self.mark_url(url, IN_FLIGHT)
+                page_source = self.fetch_profile(url, paced=False)
                 
                 # Extract data
-                self.extract_agent_data_from_page(url)
-                
-                # Save progress every N agents
-                if idx % self.save_frequency == 0:
-                    self.save_progress(filename)
-                    logger.info(f"✓ Progress saved ({idx} agents scraped in this session)")
+                self.extract_agent_data_from_page(url, page_source)
                 
             except Exception as e:
                 logger.error(f"Error scraping agent {idx}: {e}")
+                self.mark_url(url, FAILED, e)
+    
+    def scrape_urls_concurrently(self, urls_to_scrape):
+        """Fetch profiles over HTTP with several requests in flight (asyncio)"""
+        logger.info(f"Concurrent mode: {self.concurrency} in flight, "
+                    f"{self.requests_per_second or 'unlimited'} requests/sec")
+        urls_to_scrape = self.scrape_cached(urls_to_scrape)
+        done = 0
         
-        # Final save
-        self.save_progress(filename)
-        logger.info(f"✓ Final save complete!")
+        def on_page(url, page_source):
+            nonlocal done
+            done += 1
+            logger.info(f"Scraped agent {done}/{len(urls_to_scrape)}")
+            if self.page_cache:
+                self.page_cache.put(url, page_source)
+            self.extract_agent_data_from_page(url, page_source)
+        
+        needs_browser = asyncio.run(fetch_profiles(
+            urls_to_scrape, on_page,
+            concurrency=self.concurrency,
+            requests_per_second=self.requests_per_second,
+            throttle=self.throttle,
+        ))
         
-        return len(self.agents)
+        # Blocked / incomplete responses get one more try in the real browser
+        if needs_browser:
+            logger.info(f"Retrying {len(needs_browser)} profiles in the browser...")
+            browser = SeleniumFetcher(self.driver, waiter=self.waiter, blocker=self.resource_blocker,
+                                      metrics=self.metrics, on_load=self.drivers.page_loaded)
+            if self.page_cache:
+                browser = CachingFetcher(browser, self.page_cache)
+            for url in needs_browser:
+                self.recycle_driver_if_due()
+                rebind_driver(browser, self.driver)
+                if self.throttle:
+                    self.throttle.wait()
+                try:
+                    self.extract_agent_data_from_page(url, browser.fetch(url))
+                except Exception as e:
+                    logger.error(f"Error scraping agent {url}: {e}")
+                    self.mark_url(url, FAILED, e)
+    
+    def scrape_urls_with_browser_pool(self, urls_to_scrape):
+        """Shard profiles across several Chrome worker processes; this process writes the file"""
+        done = 0
+        
+        def on_record(agent):
+            nonlocal done
+            done += 1
+            self.store_agent(agent)
+            logger.info(f"  ✓ [{done}/{len(urls_to_scrape)}] {agent['name']} - Phone: {agent['phone_number'] or 'N/A'}")
+        
+        # Workers only fetch and parse; the frontier is updated here. They share the page cache directory.
+        worker_class = functools.partial(
+            RealtorAgentScraperStable, frontier_path=None,
+            profile_dir=None,  # A Chrome profile can only be open in one browser at a time
+            fetch_backend=self.fetcher.name, parser=self.parser.name, headless=self.headless,
+            base_url=self.base_url, block_resources=self.resource_blocker.preset,
+            max_pages_per_driver=self.drivers.max_pages, max_driver_rss_mb=self.drivers.max_rss_mb,
+            cache_dir=self.page_cache.directory if self.page_cache else None,
+            cache_ttl=self.page_cache.ttl if self.page_cache else DEFAULT_TTL,
+        )
+        worker_drivers = scrape_with_browser_pool(
+            worker_class, urls_to_scrape, on_record,
+            workers=self.browser_workers,
+            requests_per_second=self.requests_per_second,
+            on_error=lambda url, error: self.mark_url(url, FAILED, error),
+        )
+        for worker_id, generations in worker_drivers.items():
+            self.worker_drivers.setdefault(worker_id, []).extend(generations)
     
-    def extract_agent_data_from_page(self, profile_url):
-        """Extract agent data from current profile page"""
+    def scrape_urls_with_tabs(self, urls_to_scrape):
+        """Overlap profile loads across several tabs of this one driver
+
+        URLs go through the tabs in batches of tab_batch; between batches all
+        extra tabs are closed, so the driver can be recycled and a new tab
+        pool opened on the fresh one.
+        """
+        urls_to_scrape = self.scrape_cached(urls_to_scrape)
+        done = 0
+        
+        def on_page(url, page_source):
+            nonlocal done
+            done += 1
+            logger.info(f"Scraped agent {done}/{len(urls_to_scrape)}")
+            if self.page_cache:
+                self.page_cache.put(url, page_source)
+            self.extract_agent_data_from_page(url, page_source)
+        
+        def before_load():
+            if self.throttle:
+                self.throttle.wait()  # Raises SiteBlocked out of the tab pool if the breaker gives up
+            self.resource_blocker.apply_to_current_tab()
+        
+        def after_load():
+            self.resource_blocker.record_page()
+            self.drivers.page_loaded()
+        
+        def on_error(url, error):
+            if self.throttle:
+                self.throttle.record(ERROR)
+            self.mark_url(url, FAILED, error)
+        
+        for start in range(0, len(urls_to_scrape), self.tab_batch):
+            self.recycle_driver_if_due()
+            TabPool(self.driver, tabs=self.tabs, before_load=before_load, after_load=after_load).scrape(
+                urls_to_scrape[start:start + self.tab_batch], on_page, on_error=on_error
+            )
+    
+    def scrape_cached(self, urls_to_scrape):
+        """Extract every profile the page cache already has; returns the URLs still to fetch"""
+        if not self.page_cache:
+            return urls_to_scrape
+        
+        remaining = []
+        for url in urls_to_scrape:
+            page_source = self.page_cache.get(url)
+            if page_source is None:
+                remaining.append(url)
+            else:
+                self.extract_agent_data_from_page(url, page_source)
+        if len(remaining) < len(urls_to_scrape):
+            logger.info(f"Served {len(urls_to_scrape) - len(remaining)} profiles from the page cache")
+        return remaining
+    
+    def extract_agent_data_from_page(self, profile_url, page_source=None):
+        """Extract agent data from a profile page (current driver page if no HTML given)"""
         try:
-            time.sleep(0.3)
-            
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            text = soup.get_text(separator='\n', strip=True)
+            if page_source is None:
+                self.waiter.wait_for_profile()
+                with self.metrics.timer('page_source'):
+                    page_source = self.driver.page_source
             
-            # Extract name
-            agent_name = ''
-            try:
-                name_elem = self.driver.find_element(By.TAG_NAME, 'h1')
-                agent_name = name_elem.text.strip()
-            except:
-                pass
-            
-            # Extract other fields
-            phone = self.extract_phone(text)
-            address = self.extract_address(text)
-            brokerage = self.extract_brokerage(text)
-            license_num = self.extract_license(text)
+            agent = self.parse_agent_page(page_source, profile_url)
+            self.check_page(page_source, agent)
+            self.store_agent(agent)
             
-            # Store with profile URL for resume capability
-            self.agents.append({
-                'name': agent_name,
-                'phone_number': phone,
-                'address': address,
-                'brokerage': brokerage,
-                'agent_license': license_num,
-                'profile_url': profile_url
-            })
-            
-            logger.info(f"  ✓ {agent_name} - Phone: {phone or 'N/A'}")
+            logger.info(f"  ✓ {agent['name']} - Phone: {agent['phone_number'] or 'N/A'}")
             
         except Exception as e:
+            self.metrics.count('profile_errors')
             logger.error(f"Error extracting agent data: {e}")
+            self.mark_url(profile_url, FAILED, e)
 
-    def extract_phone(self, text):
-        """Extract phone number"""
-        patterns = [
-            r'\((\d{3})\)\s*(\d{3})-(\d{4})\s+mobile',
-            r'(\d{3})-(\d{3})-(\d{4})\s+mobile',
-            r'\((\d{3})\)\s*(\d{3})-(\d{4})\s+office',
-            r'(\d{3})-(\d{3})-(\d{4})\s+office',
-            r'\((\d{3})\)\s*(\d{3})-(\d{4})',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                if len(groups) == 3:
-                    return f"({groups[0]}) {groups[1]}-{groups[2]}"
-        return ''
-
-    def extract_address(self, text):
-        """Extract office address"""
-        patterns = [
-            r'(\d+\s+[A-Za-z\s]+(?:Road|Street|Avenue|Drive|Boulevard|Lane|Way|Court|Circle|Parkway|Ave|St|Dr|Blvd|Ln|Rd|Ct|Cir|Pkwy)\s+[A-Za-z\s,]+[A-Z]{2}\s+\d{5})',
-            r'(\d+\s+[A-Za-z\s]+\s+[A-Za-z\s,]+[A-Z]{2}\s+\d{5})',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                addr = match.group(1).strip()
-                addr = re.sub(r'\s+', ' ', addr)
-                return addr
-        return ''
-
-    def extract_brokerage(self, text):
-        """Extract brokerage name"""
-        lines = text.split('\n')
-        keywords = ['Realty', 'Real Estate', 'Broker', 'Group', 'Associates', 'Company', 'Properties']
-        for line in lines:
-            line = line.strip()
-            if any(kw in line for kw in keywords):
-                if 10 < len(line) < 100 and not line.startswith('©'):
-                    excluded = ['find a', 'search for', 'contact', 'call', 'email', 'sign in', 
-                                'register', 'save', 'filter', 'sort by', 'view', 'show']
-                    if not any(phrase in line.lower() for phrase in excluded):
-                        return line
-        return ''
-
-    def extract_license(self, text):
-        """Extract agent license number"""
-        patterns = [
-            r'Agent license\s*#\s*(\d+)',
-            r'License\s*#\s*(\d+)',
-            r'#(\d{6,})',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        return ''
-    
-    def save_progress(self, filename):
-        """Save current progress to CSV"""
+    def fetch_profile(self, url, paced=True):
+        """Fetch one profile with the configured backend, paced by the throttle and reporting fetch errors to it"""
+        if paced and self.throttle:
+            self.throttle.wait()
         try:
-            df = pd.DataFrame(self.agents)
-            df.to_csv(filename, index=False)
-        except Exception as e:
-            logger.error(f"Error saving progress: {e}")
+            return self.fetcher.fetch(url)
+        except Exception:
+            if self.throttle:
+                self.throttle.record(ERROR)
+            raise
+
+    def check_page(self, page_source, agent):
+        """Classify a fetched profile for the throttle; challenge and empty pages raise, so no record is written
+
+        The URL is then marked failed and picked up again by retry_failed or the next run.
+        """
+        outcome = classify_page(page_source, record=agent)
+        if self.throttle:
+            self.throttle.record(outcome)
+        if outcome in (CHALLENGE, EMPTY):
+            self.metrics.count(f'{outcome}_pages')
+            if self.page_cache and agent.get('profile_url'):
+                self.page_cache.discard(agent['profile_url'])  # Otherwise a retry gets the same page back
+            raise RuntimeError(f"{outcome} page - no record written")
+
+    def parse_agent_page(self, page_source, profile_url):
+        """Build an agent record from profile page HTML"""
+        # Embedded JSON state first; text + regex only for the fields it lacks
+        fields = {}
+        if self.use_structured_data:
+            with self.metrics.timer('extract_structured'):
+                fields = extract_structured_fields(page_source)
+        fields = fill_missing_fields(fields, page_source, self.parser, self.metrics)
+        
+        # Store with profile URL for resume capability
+        return {
+            'name': fields.get('name', ''),
+            'phone_number': fields.get('phone_number', ''),
+            'address': fields.get('address', ''),
+            'brokerage': fields.get('brokerage', ''),
+            'agent_license': fields.get('agent_license', ''),
+            'profile_url': profile_url
+        }
+
+    def store_agent(self, agent, linked=False):
+        """Append an agent to the progress log, count it and index it across cities
+
+        linked: the record came from the identity index (scraped for another
+        city), so it is only linked to this city, not re-indexed as fresh.
+        """
+        self.scraped.add(agent)
+        self.metrics.count('agents_linked' if linked else 'agents_scraped')
+        with self.metrics.timer('save_progress'):
+            if self.checkpoint:
+                self.checkpoint.append(agent)
+            if self.parquet:
+                self.parquet.append(agent)
+            self.mark_url(agent['profile_url'], DONE)
+            agent_id = profile_id(agent['profile_url'])
+            if self.use_identity_index and self.frontier and self.current_city and agent_id:
+                if linked:
+                    self.frontier.link_agent(agent_id, *self.current_city)
+                else:
+                    self.frontier.remember_agent(agent_id, agent, *self.current_city)
+        if self.network_capture and self.scraped.total % self.save_frequency == 0:
+            with self.driver_lock:
+                self.network_capture.discard()  # Profile pages aren't read from the log
+
+    def known_record(self, url):
+        """The agent's record if it was already scraped for any city (within the freshness window, if set)"""
+        agent_id = profile_id(url)
+        if not (self.use_identity_index and self.frontier and agent_id):
+            return None
+        known = self.frontier.known_agent(agent_id, max_age=self.freshness_window)
+        if known is None:
+            return None
+        record, _, _ = known
+        return dict(record, profile_url=url)
+    
+    def link_known_agents(self, urls_to_scrape):
+        """Agents already scraped for another city are linked from the index; returns the URLs still to fetch"""
+        remaining = []
+        linked = 0
+        for url in urls_to_scrape:
+            record = self.known_record(url)
+            if record is None:
+                remaining.append(url)
+                continue
+            self.store_agent(record, linked=True)
+            linked += 1
+        if linked:
+            logger.info(f"{linked} agents were already scraped for other cities - linked from the index, no visit needed")
+        return remaining
+    
+    def index_progress_log(self, city, state):
+        """One-off: add a city's existing progress log to the identity index (runs before the index existed)"""
+        if not (self.use_identity_index and self.frontier) or self.frontier.agents_indexed(city, state):
+            return
+        filename = self.progress_filename(city, state)
+        items = ((profile_id(record.get('profile_url')), record) for record in iter_records(filename))
+        indexed = self.frontier.backfill_agents(((agent_id, record) for agent_id, record in items if agent_id),
+                                                city, state, scraped_at=os.path.getmtime(filename))
+        logger.info(f"Indexed {indexed} agents from {filename} for cross-city reuse")
+    
+    def mark_url(self, url, status, error=None):
+        """Record a profile's crawl status in the frontier"""
+        if self.frontier and self.current_city:
+            self.frontier.set_status(*self.current_city, url, status, error)
+
+    def retry_failed(self, city, state, max_attempts=3):
+        """Re-scrape only the profiles that failed in earlier runs - no search or pagination"""
+        self.current_city = (city, state)
+        failed = self.frontier.failed(city, state, max_attempts=max_attempts)
+        logger.info(f"Retrying {len(failed)} failed profiles for {city}, {state} "
+                    f"(fewer than {max_attempts} attempts so far)")
+        for url, attempts, last_error in failed:
+            logger.info(f"  {url} - {attempts} attempt(s), last error: {last_error}")
+        
+        self.collected_urls = {url for url, _, _ in failed}
+        if not self.collected_urls:
+            return 0
+        return self.scrape_agents_with_progress_saving(city, state)
 
     def save_final(self, city, state):
-        """Final save with summary"""
-        filename = f"agents_{city.replace(' ', '_')}_{state}_progress.csv"
+        """Final save with summary - the CSV is written from the progress log in one pass"""
+        filename = self.progress_filename(city, state)
         
         # Remove profile_url from final output
-        df = pd.DataFrame(self.agents)
-        final_df = df.drop('profile_url', axis=1) if 'profile_url' in df.columns else df
         final_filename = f"agents_{city.replace(' ', '_')}_{state}_FINAL.csv"
-        final_df.to_csv(final_filename, index=False)
+        with self.metrics.timer('save_final'):
+            counts = export_csv(filename, final_filename, drop_columns=['profile_url'])
+        self.metrics.record_counts(city, state, counts)
         
         # Print summary
         print("\n" + "="*70)
         print(f"RESULTS: {city}, {state}")
         print("="*70)
-        print(f"Total agents: {len(self.agents)}")
-        print(f"With phone: {sum(1 for a in self.agents if a.get('phone_number'))}")
-        print(f"With address: {sum(1 for a in self.agents if a.get('address'))}")
-        print(f"With brokerage: {sum(1 for a in self.agents if a.get('brokerage'))}")
-        print(f"With license: {sum(1 for a in self.agents if a.get('agent_license'))}")
+        print(f"Total agents: {counts.total}")
+        print(f"With phone: {counts.fields['phone_number']}")
+        print(f"With address: {counts.fields['address']}")
+        print(f"With brokerage: {counts.fields['brokerage']}")
+        print(f"With license: {counts.fields['agent_license']}")
+        if self.frontier:
+            frontier_counts = self.frontier.counts(city, state)
+            print(f"Failed profiles: {frontier_counts[FAILED]} (re-run with scraper.retry_failed)")
         print(f"\nProgress file: {filename}")
         print(f"Final file: {final_filename}")
         print("="*70 + "\n")
         
         return final_filename
 
+    def save_changes(self, city, state):
+        """Incremental mode: write only added / changed / removed agents instead of a full CSV"""
+        # Agents missing from the latest pagination walk
+        discovery = self.frontier.discovery(city, state) if self.frontier else None
+        removed_urls = set()
+        if discovery and discovery['started_at']:
+            removed_urls = self.frontier.unseen_urls(city, state, since=discovery['started_at'])
+        filename = self.progress_filename(city, state)
+        logged = latest_records(filename, removed_urls)
+        removed = [logged.get(url, {'profile_url': url}) for url in sorted(removed_urls)]
+        
+        # This run's records are streamed back from the log; profiles with no earlier record count as added
+        current = iter_records(filename, start=self.run_log_start) if self.run_log_start is not None else ()
+        changes = diff_records(self.previous_records, current, removed)
+        changes_filename = f"agents_{city.replace(' ', '_')}_{state}_changes_{time.strftime('%Y%m%d')}.csv"
+        counts = write_changes_csv(changes_filename, changes)
+        self.metrics.record_counts(city, state, self.scraped)
+        if removed_urls:
+            self.frontier.mark_removed(city, state, removed_urls)
+        
+        print("\n" + "="*70)
+        print(f"CHANGES: {city}, {state}")
+        print("="*70)
+        print(f"Scraped this run: {self.scraped.total}")
+        print(f"Added: {counts['added']}")
+        print(f"Changed: {counts['changed']}")
+        print(f"Removed: {counts['removed']}")
+        print(f"\nChanges file: {changes_filename}")
+        print("="*70 + "\n")
+        
+        return changes_filename
+
     def close(self):
+        self.harvester.log_summary()
+        self.resource_blocker.log_summary()
+        self.fetcher.close()
+        if self.frontier:
+            self.frontier.close()
         if self.driver:
-            self.driver.quit()
+            self.drivers.quit()
+            self.driver = None
             logger.info("Browser closed")
+        self.drivers.log_summary()
+        logger.info("Stage timings:")
+        self.metrics.log_summary()
+        if self.throttle:
+            self.throttle.log_summary()
+        if self.metrics_report:
+            self.metrics.write_report(self.metrics_report, scraper='stable', harvest_calls=self.harvester.round_trips,
+                                      throttle=self.throttle.summary() if self.throttle else None,
+                                      drivers=self.drivers.summary(), worker_drivers=self.worker_drivers or None)
+        self.metrics.close()
 
 
 def main():
@@ -377,13 +1003,26 @@ def main():
     print("REALTOR.COM AGENT SCRAPER - STABLE VERSION")
     print("="*70)
     print("\nFEATURES:")
-    print("  ✓ Auto-saves progress every 50 agents")
+    print("  ✓ Every agent appended to a crash-safe progress log")
     print("  ✓ Resume from where it stopped")
     print("  ✓ Optimized for speed (images disabled)")
     print("  ✓ Browser visible (more stable)")
     print("="*70 + "\n")
     
-    scraper = RealtorAgentScraperStable()
+    http_choice = input("Fetch profiles over HTTP (falls back to browser)? (yes/no): ").strip().lower()
+    fetch_backend = 'http' if http_choice in ['yes', 'y'] else 'selenium'
+    concurrency = 1
+    if fetch_backend == 'http':
+        concurrency_choice = input("Profile fetches in flight at once [1]: ").strip()
+        concurrency = int(concurrency_choice) if concurrency_choice.isdigit() else 1
+    refresh_choice = input("Incremental refresh - re-scrape profiles older than N days (blank = full run): ").strip()
+    freshness_window = int(refresh_choice) * 24 * 3600 if refresh_choice.isdigit() else None
+    streaming_choice = input("Scrape profiles while search pages are still loading? (yes/no): ").strip().lower()
+    
+    scraper = RealtorAgentScraperStable(fetch_backend=fetch_backend, concurrency=concurrency,
+                                        requests_per_second=5 if concurrency > 1 else None,
+                                        freshness_window=freshness_window,
+                                        streaming=streaming_choice in ['yes', 'y'])
     
     try:
         city = input("Enter city name: ").strip()
@@ -393,24 +1032,41 @@ def main():
             print("City and state required!")
             return
         
+        if scraper.frontier and scraper.frontier.discovery(city, state):
+            rediscover_choice = input("Search results already walked - walk them again? (yes/no): ").strip().lower()
+            if rediscover_choice in ['yes', 'y']:
+                scraper.frontier.forget_discovery(city, state)
+        
         start_time = time.time()
         
-        # Search and extract
-        scraper.search_city(city, state)
+        # Search and extract (or just revisit earlier failures)
+        failed = scraper.frontier.failed(city, state) if scraper.frontier else []
+        retry_choice = 'no'
+        if failed:
+            retry_choice = input(f"Retry only the {len(failed)} profiles that failed last time? (yes/no): ").strip().lower()
+        if retry_choice in ['yes', 'y']:
+            scraper.retry_failed(city, state)
+        else:
+            scraper.search_city(city, state)
         
         elapsed_time = time.time() - start_time
         
-        # Final save
-        if scraper.agents:
-            scraper.save_final(city, state)
+        # Final save (also covers a resumed run that had nothing left to scrape);
+        # an incremental refresh writes just the changes
+        if os.path.exists(scraper.progress_filename(city, state)):
+            if freshness_window is not None:
+                scraper.save_changes(city, state)
+            else:
+                scraper.save_final(city, state)
             
             print(f"\n⚡ Total time: {elapsed_time/60:.1f} minutes")
-            print(f"   Average: {elapsed_time/len(scraper.agents):.1f} seconds per agent")
-            
-            # Preview
-            df = pd.DataFrame(scraper.agents)
-            print("\nData Preview (first 5 agents):")
-            print(df.head()[['name', 'phone_number', 'brokerage']].to_string(index=False))
+            if scraper.scraped.total:
+                print(f"   Average: {elapsed_time/scraper.scraped.total:.1f} seconds per agent")
+                
+                # Preview
+                df = pd.DataFrame([record.as_dict() for record in scraper.scraped.preview])
+                print("\nData Preview (first 5 agents):")
+                print(df.head()[['name', 'phone_number', 'brokerage']].to_string(index=False))
     
     finally:
         scraper.close()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Concurrent Profile Fetching
+asyncio + aiohttp: keeps up to a fixed number of profile fetches in flight
+under a global requests-per-second cap, or paced by an AdaptiveThrottle
+"""
+
+import aiohttp
+import asyncio
+import logging
+
+from http_fetcher import DEFAULT_HEADERS
+from page_checks import classify_page, looks_blocked, looks_incomplete, OK, EMPTY, ERROR
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Global requests-per-second cap shared by every in-flight fetch"""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            now = loop.time()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def fetch_profiles(urls, on_page, concurrency=8, requests_per_second=None,
+                         timeout=15, headers=None, throttle=None):
+    """Fetch profile pages concurrently and hand each good page to on_page(url, html)
+
+    Returns the URLs whose responses looked blocked, incomplete or failed,
+    so the caller can retry them with the browser. With a throttle, it
+    paces the requests (instead of requests_per_second) and is told each
+    response's outcome; pages handed to on_page are classified by the caller.
+    """
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    limiter = RateLimiter(requests_per_second)
+    needs_browser = []
+
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     headers=headers or DEFAULT_HEADERS) as session:
+
+        async def worker():
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                if throttle:
+                    await throttle.wait_async()
+                else:
+                    await limiter.wait()
+                try:
+                    async with session.get(url) as response:
+                        status = response.status
+                        html = await response.text()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning(f"  HTTP fetch failed ({e.__class__.__name__}): {url}")
+                    if throttle:
+                        throttle.record(ERROR)
+                    needs_browser.append(url)
+                    continue
+
+                if looks_blocked(status, html) or status != 200 or looks_incomplete(html):
+                    logger.warning(f"  HTTP response unusable ({status}): {url}")
+                    if throttle:
+                        outcome = classify_page(html, status)
+                        throttle.record(EMPTY if outcome == OK else outcome)  # 200 but incomplete
+                    needs_browser.append(url)
+                    continue
+
+                on_page(url, html)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    return needs_browser
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Batch Runner
+Non-interactive entry point for scheduled runs: scrapes a list of
+city/state pairs with a few long-lived worker processes, each keeping
+one warm Chrome across all the cities it takes from a shared queue.
+Writes the usual per-city outputs plus a JSON summary of the run, with
+each worker's stage timings and counters.
+
+Usage:
+  python batch_runner.py "Seattle, WA" "London, KY"
+  python batch_runner.py --cities-file cities.txt --workers 2 --output-dir runs/2026-10-17
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+import logging
+
+from browser_pool import STARTUP_STAGGER
+
+logger = logging.getLogger(__name__)
+
+
+def parse_city(text):
+    """'Seattle, WA' / 'Seattle,WA' -> ('Seattle', 'WA'), or None for blank and comment lines"""
+    text = text.strip()
+    if not text or text.startswith('#') or ',' not in text:
+        return None
+    city, state = text.rsplit(',', 1)
+    city, state = city.strip(), state.strip().upper()
+    if not city or not state or city.lower() == 'city':  # CSV header
+        return None
+    return city, state
+
+
+def load_cities(path):
+    with open(path, encoding='utf-8') as f:
+        cities = [parse_city(line) for line in f]
+    return [city for city in cities if city]
+
+
+def batch_worker(worker_id, cities, results, scraper_kwargs, output_dir, rediscover=False):
+    """Worker process: one warm scraper for every city it pulls off the queue
+
+    rediscover: walk every city's search results again, even where the
+    frontier has a finished walk.
+    """
+    from agent_scraper_stable import RealtorAgentScraperStable
+    from crawl_frontier import FAILED
+
+    time.sleep(worker_id * STARTUP_STAGGER)
+    os.chdir(output_dir)
+    scraper = None
+    stats = {'driver_start_seconds': None, 'cities': 0}
+    if scraper_kwargs.get('metrics_port') is not None:
+        scraper_kwargs = dict(scraper_kwargs, metrics_port=scraper_kwargs['metrics_port'] + worker_id)
+    if scraper_kwargs.get('profile_dir'):
+        # One Chrome per profile directory; each worker keeps its own warm profile between runs
+        scraper_kwargs = dict(scraper_kwargs, profile_dir=os.path.join(scraper_kwargs['profile_dir'], f"worker{worker_id}"))
+    try:
+        started = time.time()
+        scraper = RealtorAgentScraperStable(**scraper_kwargs)
+        stats['driver_start_seconds'] = round(time.time() - started, 2)
+
+        while True:
+            try:
+                item = cities.get(timeout=1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+
+            city, state = item
+            started = time.time()
+            scraper.reset_city_state()
+            result = {'city': city, 'state': state, 'worker': worker_id, 'error': None}
+            try:
+                if rediscover and scraper.frontier:
+                    scraper.frontier.forget_discovery(city, state)
+                result['agents'] = scraper.search_city(city, state)
+                result['scraped_this_run'] = scraper.scraped.total
+                if result['agents'] is None:
+                    result['error'] = 'search failed (see log)'
+                if os.path.exists(scraper.progress_filename(city, state)):
+                    if scraper.freshness_window is not None:
+                        result['output'] = scraper.save_changes(city, state)
+                    else:
+                        result['output'] = scraper.save_final(city, state)
+                if scraper.frontier:
+                    result['failed_profiles'] = scraper.frontier.counts(city, state)[FAILED]
+            except Exception as e:
+                result['error'] = str(e)
+            result['seconds'] = round(time.time() - started, 1)
+            stats['cities'] += 1
+            results.put(('city', worker_id, result))
+    except Exception as e:
+        results.put(('error', worker_id, f"worker failed: {e}"))
+    finally:
+        if scraper:
+            stats['metrics'] = scraper.metrics.report()
+            scraper.close()
+            stats['drivers'] = scraper.drivers.summary()
+        results.put(('done', worker_id, stats))
+
+
+def run_batch(cities, workers=1, output_dir='.', scraper_kwargs=None, rediscover=False):
+    """Scrape every (city, state) with up to `workers` warm browsers; returns the run summary"""
+    os.makedirs(output_dir, exist_ok=True)
+    output_dir = os.path.abspath(output_dir)
+    workers = max(1, min(workers, len(cities)))
+
+    ctx = mp.get_context('spawn')
+    city_queue = ctx.Queue()
+    results = ctx.Queue()
+    for city in cities:
+        city_queue.put(city)
+    for _ in range(workers):
+        city_queue.put(None)
+
+    logger.info(f"Batch: {len(cities)} cities, {workers} worker(s), outputs in {output_dir}")
+    started = time.time()
+    processes = [
+        ctx.Process(target=batch_worker,
+                    args=(worker_id, city_queue, results, scraper_kwargs or {}, output_dir, rediscover))
+        for worker_id in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    city_results = []
+    worker_stats = {}
+    running = len(processes)
+    while running:
+        try:
+            kind, worker_id, payload = results.get(timeout=5)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                logger.error("All batch workers exited unexpectedly")
+                break
+            continue
+
+        if kind == 'city':
+            city_results.append(payload)
+            status = payload['error'] or f"{payload.get('agents')} agents"
+            logger.info(f"[{len(city_results)}/{len(cities)}] {payload['city']}, {payload['state']}: "
+                        f"{status} in {payload['seconds']}s")
+        elif kind == 'error':
+            logger.error(f"Worker {worker_id}: {payload}")
+        elif kind == 'done':
+            running -= 1
+            worker_stats[worker_id] = payload
+
+    for process in processes:
+        process.join(timeout=10)
+
+    finished = {(r['city'], r['state']) for r in city_results}
+    return {
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+        'seconds': round(time.time() - started, 1),
+        'workers': workers,
+        'driver_starts': sum(len(stats.get('drivers') or []) for stats in worker_stats.values()),
+        'cities_total': len(cities),
+        'cities_ok': sum(1 for r in city_results if not r['error']),
+        'cities_failed': sum(1 for r in city_results if r['error']),
+        'cities_not_run': [f"{city}, {state}" for city, state in cities if (city, state) not in finished],
+        'agents': sum(r.get('agents') or 0 for r in city_results),
+        'worker_stats': worker_stats,
+        'results': city_results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape many cities in one run, without prompts")
+    parser.add_argument('cities', nargs='*', help='"City, ST" pairs')
+    parser.add_argument('--cities-file', help='one "City, ST" per line (# comments allowed)')
+    parser.add_argument('--workers', type=int, default=1, help='warm browsers / cities in parallel')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--fetch-backend', default='selenium', choices=['selenium', 'http'])
+    parser.add_argument('--concurrency', type=int, default=1, help='profile fetches in flight (http backend)')
+    parser.add_argument('--requests-per-second', type=float)
+    parser.add_argument('--block', default='minimal', choices=['none', 'minimal', 'aggressive'])
+    parser.add_argument('--cache-dir')
+    parser.add_argument('--freshness-days', type=float, help='incremental refresh: re-scrape profiles older than this')
+    parser.add_argument('--streaming', action='store_true', help='scrape profiles while discovery is still running')
+    parser.add_argument('--rediscover', action='store_true',
+                        help='walk the search results again even where an earlier run finished them')
+    parser.add_argument('--parquet-dir', help='also write agents to a state/city partitioned Parquet dataset')
+    parser.add_argument('--profile-dir', default='chrome_profile',
+                        help="persistent Chrome profiles (one subdirectory per worker); '' = throwaway profiles")
+    parser.add_argument('--max-pages-per-driver', type=int, default=500, help='recycle Chrome after this many pages')
+    parser.add_argument('--max-driver-rss-mb', type=int, default=2048,
+                        help='recycle Chrome past this much memory (needs psutil)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='serve Prometheus metrics at http://127.0.0.1:PORT/metrics (worker N uses PORT+N)')
+    args = parser.parse_args()
+
+    cities = [parse_city(text) for text in args.cities]
+    if args.cities_file:
+        cities += load_cities(args.cities_file)
+    cities = list(dict.fromkeys(city for city in cities if city))
+    if not cities:
+        parser.error('no cities given (positional "City, ST" or --cities-file)')
+
+    logging.basicConfig(level=logging.INFO, format='%(processName)s %(levelname)s - %(message)s')
+    scraper_kwargs = {
+        'fetch_backend': args.fetch_backend,
+        'concurrency': args.concurrency,
+        'requests_per_second': args.requests_per_second,
+        'block_resources': args.block,
+        'cache_dir': os.path.abspath(args.cache_dir) if args.cache_dir else None,  # Workers run in output_dir
+        'freshness_window': args.freshness_days * 24 * 3600 if args.freshness_days else None,
+        'streaming': args.streaming,
+        'parquet_dir': os.path.abspath(args.parquet_dir) if args.parquet_dir else None,
+        'metrics_port': args.metrics_port,
+        'profile_dir': os.path.abspath(args.profile_dir) if args.profile_dir else None,
+        'max_pages_per_driver': args.max_pages_per_driver,
+        'max_driver_rss_mb': args.max_driver_rss_mb,
+    }
+    summary = run_batch(cities, workers=args.workers, output_dir=args.output_dir, scraper_kwargs=scraper_kwargs,
+                        rediscover=args.rediscover)
+
+    summary_path = os.path.join(args.output_dir, f"run_summary_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    print("\n" + "="*70)
+    print(f"BATCH COMPLETE: {summary['cities_ok']}/{summary['cities_total']} cities, "
+          f"{summary['agents']} agents in {summary['seconds'] / 60:.1f} minutes")
+    print(f"Chrome started {summary['driver_starts']} time(s)")
+    if summary['cities_failed'] or summary['cities_not_run']:
+        print(f"Failed: {summary['cities_failed']}, not run: {len(summary['cities_not_run'])}")
+    print(f"Summary: {summary_path}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
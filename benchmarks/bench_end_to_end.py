@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark: both scrapers end to end against the local stand-in site
+Starts benchmarks/fixture_server.py with a synthetic search flow, runs
+RealtorAgentScraperStable and RealtorAgentScraperOptimized over the same
+cities (each in its own scratch directory, headless Chrome) and reports
+agents/sec, time to first record and where the time went per stage.
+Nothing touches the live site, so runs are comparable over time.
+
+Usage:
+  python benchmarks/bench_end_to_end.py
+  python benchmarks/bench_end_to_end.py --city "London, KY" --city "Corbin, KY" --agents 120 \
+      --latency 0.05 --json bench_results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import StandInSite, start_server  # noqa: E402
+from metrics import LatencyHistogram  # noqa: E402
+from search_pages import city_slug  # noqa: E402
+
+DEFAULT_CITIES = ['London, KY', 'Corbin, KY']
+
+# Methods timed per scraper, by stage ('fetcher.fetch' = the scraper's fetcher)
+STAGES = {
+    'stable': {
+        'discovery': ['load_pages_directly', 'search_and_click_through'],
+        'profile_fetch': ['fetcher.fetch'],
+        'parse': ['parse_agent_page'],
+        'save': ['save_final'],
+    },
+    'optimized': {
+        'collect': ['scrape_agents_by_collecting_urls'],  # Link harvest plus the profile visits below
+        'profile_fetch': ['fetcher.fetch'],
+        'parse': ['parse_agent_page'],
+        'save': ['save_to_csv'],
+    },
+}
+
+
+def time_method(owner, name, histogram):
+    """Replace owner.name with a wrapper that observes each call's duration"""
+    original = getattr(owner, name)
+
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    setattr(owner, name, timed)
+
+
+def instrument(scraper, kind, run):
+    """Stage histograms plus a store_agent hook that counts records and stamps the first one"""
+    for stage, methods in STAGES[kind].items():
+        histogram = run['stages'].setdefault(stage, LatencyHistogram())
+        for method in methods:
+            owner, _, name = method.rpartition('.')
+            target = getattr(scraper, owner) if owner else scraper
+            if hasattr(target, name):
+                time_method(target, name, histogram)
+
+    store_agent = scraper.store_agent
+
+    def counted(agent, *args, **kwargs):
+        run['records'] += 1
+        if run['first_record_seconds'] is None:
+            run['first_record_seconds'] = round(time.perf_counter() - run['started'], 3)
+        return store_agent(agent, *args, **kwargs)
+
+    scraper.store_agent = counted
+
+
+def create_scraper(kind, base_url, args):
+    if kind == 'stable':
+        from agent_scraper_stable import RealtorAgentScraperStable
+        return RealtorAgentScraperStable(headless=True, base_url=base_url, block_resources='none',
+                                         fetch_backend=args.fetch_backend, streaming=args.streaming)
+    from agent_scraper_optimized import RealtorAgentScraperOptimized
+    return RealtorAgentScraperOptimized(headless=True, base_url=base_url, block_resources='none',
+                                        fetch_backend=args.fetch_backend)
+
+
+def run_scraper(kind, cities, base_url, args):
+    """Scrape every city with one scraper in a scratch directory; returns the run stats"""
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix=f"bench_{kind}_"))
+    run = {'scraper': kind, 'records': 0, 'first_record_seconds': None, 'stages': {}, 'error': None}
+    scraper = None
+    try:
+        started = time.perf_counter()
+        scraper = create_scraper(kind, base_url, args)
+        run['driver_start_seconds'] = round(time.perf_counter() - started, 2)
+        instrument(scraper, kind, run)
+
+        run['started'] = time.perf_counter()
+        for city, state in cities:
+            if kind == 'stable':
+                scraper.reset_city_state()
+                scraper.search_city(city, state)
+                scraper.save_final(city, state)
+            else:
+                scraper.search_city(city, state)
+                scraper.save_to_csv(city, state)
+        run['seconds'] = round(time.perf_counter() - run['started'], 2)
+    except Exception as e:
+        run['error'] = str(e)
+    finally:
+        if scraper:
+            scraper.close()
+        os.chdir(cwd)
+
+    run.pop('started', None)
+    seconds = run.get('seconds')
+    run['agents_per_sec'] = round(run['records'] / seconds, 2) if seconds else None
+    run['stages'] = {stage: dict(histogram.summary(), total=histogram.total)
+                     for stage, histogram in run['stages'].items() if histogram.count}
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run both scrapers end to end against a local stand-in site")
+    parser.add_argument('--city', action='append', help='"City, ST" (repeatable)')
+    parser.add_argument('--agents', type=int, default=60, help='agents per city')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--overlap', type=float, default=0.2)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds added to every server response')
+    parser.add_argument('--scrapers', nargs='+', default=['stable', 'optimized'], choices=list(STAGES))
+    parser.add_argument('--fetch-backend', default='selenium', choices=['selenium', 'http'])
+    parser.add_argument('--streaming', action='store_true', help='stable scraper in streaming mode')
+    parser.add_argument('--json', help='also write the results here')
+    args = parser.parse_args()
+
+    cities = [tuple(part.strip() for part in text.rsplit(',', 1)) for text in (args.city or DEFAULT_CITIES)]
+    site = StandInSite(cities, args.agents, args.page_size, args.overlap)
+    server, base_url = start_server(site=site, latency=args.latency)
+    expected = sum(len(site.cities[city_slug(city, state)][2]) for city, state in cities)
+
+    try:
+        results = [run_scraper(kind, cities, base_url, args) for kind in args.scrapers]
+    finally:
+        server.shutdown()
+
+    print("\n" + "="*70)
+    print(f"END-TO-END BENCHMARK ({len(cities)} cities, {expected} agent records expected, "
+          f"{args.latency * 1000:.0f}ms server latency)")
+    print("="*70)
+    print(f"{'scraper':<11}{'records':>9}{'seconds':>10}{'agents/s':>10}{'1st rec s':>11}")
+    for run in results:
+        print(f"{run['scraper']:<11}{run['records']:>9}{run.get('seconds') or 0:>10.1f}"
+              f"{run['agents_per_sec'] or 0:>10.2f}{run['first_record_seconds'] or 0:>11.2f}"
+              + (f"  ERROR: {run['error']}" if run['error'] else ""))
+    for run in results:
+        print(f"\n{run['scraper']} stages:")
+        for stage, stats in run['stages'].items():
+            print(f"  {stage:<14} total={stats['total']:.2f}s n={stats['count']} "
+                  f"mean={stats['mean'] * 1000:.0f}ms p95={stats['p95'] * 1000:.0f}ms")
+        if run['records'] != expected:
+            print(f"  ! {run['records']} records, expected {expected}")
+    print("="*70 + "\n")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'cities': [f"{city}, {state}" for city, state in cities], 'expected_records': expected,
+                       'latency': args.latency, 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
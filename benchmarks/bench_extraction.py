@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: structured (embedded JSON) extraction vs text + regex extraction
+Runs both paths over the saved profile fixtures and reports time per page
+and how often each field gets filled.
+
+Usage:
+  python benchmarks/bench_extraction.py --iterations 200
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_scraper_stable import RealtorAgentScraperStable  # noqa: E402
+from html_parsers import get_parser  # noqa: E402
+from metrics import MetricsRegistry  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'profiles')
+FIELDS = ['name', 'phone_number', 'address', 'brokerage', 'agent_license']
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def run_path(scraper, pages, iterations):
+    """Time parse_agent_page over every fixture; returns (seconds per page, records)"""
+    records = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        records = [scraper.parse_agent_page(html, name) for name, html in pages]
+    elapsed = time.perf_counter() - started
+    return elapsed / (iterations * len(pages)), records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare structured vs regex profile extraction")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--parser', default='html.parser', help="HTML parser for the regex path")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        print(f"No fixtures found in {args.fixtures}")
+        return
+
+    # Extraction never touches the driver, so skip __init__ (no Chrome launch)
+    structured = RealtorAgentScraperStable.__new__(RealtorAgentScraperStable)
+    structured.use_structured_data = True
+    structured.parser = get_parser(args.parser)
+    structured.metrics = MetricsRegistry()
+    regex_only = RealtorAgentScraperStable.__new__(RealtorAgentScraperStable)
+    regex_only.use_structured_data = False
+    regex_only.parser = get_parser(args.parser)
+    regex_only.metrics = MetricsRegistry()
+
+    results = {
+        'structured': run_path(structured, pages, args.iterations),
+        'regex': run_path(regex_only, pages, args.iterations),
+    }
+
+    print("\n" + "="*70)
+    print(f"EXTRACTION BENCHMARK ({len(pages)} fixtures x {args.iterations} iterations)")
+    print("="*70)
+    print(f"{'path':<12}{'ms/page':>10}  " + "  ".join(f"{field[:9]:>9}" for field in FIELDS))
+    for path_name, (seconds, records) in results.items():
+        fill_rates = [sum(1 for r in records if r[field]) / len(records) for field in FIELDS]
+        print(f"{path_name:<12}{seconds*1000:>10.3f}  " + "  ".join(f"{rate:>9.0%}" for rate in fill_rates))
+
+    speedup = results['regex'][0] / results['structured'][0]
+    print(f"\nStructured path is {speedup:.1f}x the speed of the regex path")
+
+    # Fields where the two paths disagree are worth a look
+    print("\nDisagreements (structured vs regex):")
+    for (name, _), s_rec, r_rec in zip(pages, results['structured'][1], results['regex'][1]):
+        for field in FIELDS:
+            if s_rec[field] != r_rec[field]:
+                print(f"  {name} {field}: {s_rec[field]!r} vs {r_rec[field]!r}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-record cost of text field extraction
+Compares the original per-field extractors (each rescans the text and
+tries its patterns in order) with the shared single-pass extract_fields().
+
+Corpus = body text of the fixture profiles + synthetic profile texts built
+from the sample CSV rows in the repo root.
+
+Usage:
+  python benchmarks/bench_field_extraction.py --iterations 20
+"""
+
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from field_extraction import extract_fields  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures', 'profiles')
+
+
+# --- Original extractors (as they were in both scraper scripts) -------------
+
+def legacy_extract_phone(text):
+    patterns = [
+        r'\((\d{3})\)\s*(\d{3})-(\d{4})\s+mobile',
+        r'(\d{3})-(\d{3})-(\d{4})\s+mobile',
+        r'\((\d{3})\)\s*(\d{3})-(\d{4})\s+office',
+        r'(\d{3})-(\d{3})-(\d{4})\s+office',
+        r'\((\d{3})\)\s*(\d{3})-(\d{4})',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            groups = match.groups()
+            if len(groups) == 3:
+                return f"({groups[0]}) {groups[1]}-{groups[2]}"
+    return ''
+
+
+def legacy_extract_address(text):
+    patterns = [
+        r'(\d+\s+[A-Za-z\s]+(?:Road|Street|Avenue|Drive|Boulevard|Lane|Way|Court|Circle|Parkway|Ave|St|Dr|Blvd|Ln|Rd|Ct|Cir|Pkwy)\s+[A-Za-z\s,]+[A-Z]{2}\s+\d{5})',
+        r'(\d+\s+[A-Za-z\s]+\s+[A-Za-z\s,]+[A-Z]{2}\s+\d{5})',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            addr = match.group(1).strip()
+            addr = re.sub(r'\s+', ' ', addr)
+            return addr
+    return ''
+
+
+def legacy_extract_brokerage(text):
+    lines = text.split('\n')
+    keywords = ['Realty', 'Real Estate', 'Broker', 'Group', 'Associates', 'Company', 'Properties']
+    for line in lines:
+        line = line.strip()
+        if any(kw in line for kw in keywords):
+            if 10 < len(line) < 100 and not line.startswith('©'):
+                excluded = ['find a', 'search for', 'contact', 'call', 'email', 'sign in',
+                            'register', 'save', 'filter', 'sort by', 'view', 'show']
+                if not any(phrase in line.lower() for phrase in excluded):
+                    return line
+    return ''
+
+
+def legacy_extract_license(text):
+    patterns = [
+        r'Agent license\s*#\s*(\d+)',
+        r'License\s*#\s*(\d+)',
+        r'#(\d{6,})',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return ''
+
+
+def legacy_extract_fields(text):
+    return {
+        'phone_number': legacy_extract_phone(text),
+        'address': legacy_extract_address(text),
+        'brokerage': legacy_extract_brokerage(text),
+        'agent_license': legacy_extract_license(text),
+    }
+
+
+# --- Corpus ------------------------------------------------------------------
+
+PAGE_CHROME_TOP = "Buy\nRent\nFind a Realtor®\nSign In\nSearch for homes near you"
+PAGE_CHROME_BOTTOM = ("Search for homes, view listings and sort by price.\n"
+                      "© 1995-2026 National Association of REALTORS® and Move, Inc. CalDRE #2121192")
+
+
+def synthetic_text(row, variant):
+    """Profile-like page text from a sample CSV row, varying phone style and field order"""
+    lines = [PAGE_CHROME_TOP, row['name']]
+    phone = row.get('phone_number') or ''
+    if phone:
+        if variant % 3 == 1:
+            digits = re.sub(r'\D', '', phone)
+            phone = f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+        lines.append(f"{phone}\n{['mobile', 'office', 'office'][variant % 3]}")
+    if variant % 2:
+        lines.append(f"Contact {row['name'].split()[0]}")
+    if row.get('address'):
+        lines.append(row['address'].replace(' in ', '\n'))
+    lines.append(f"{row['name'].split()[-1]} Realty Group")
+    if row.get('agent_license') and variant % 4:
+        lines.append(f"Agent license # {row['agent_license']}")
+    lines.append("About\nExperienced local agent helping buyers and sellers across the region.")
+    lines.append(PAGE_CHROME_BOTTOM)
+    return '\n'.join(lines)
+
+
+def build_corpus():
+    texts = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        texts.append((soup.body or soup).get_text(separator='\n', strip=True))
+
+    for path in sorted(glob.glob(os.path.join(ROOT, 'agents_*.csv'))):
+        with open(path, encoding='utf-8') as f:
+            for idx, row in enumerate(csv.DictReader(f)):
+                texts.append(synthetic_text(row, idx))
+    return texts
+
+
+def time_extractor(extractor, texts, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            extractor(text)
+    return (time.perf_counter() - started) / (iterations * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-record text extraction cost, before vs after")
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    texts = build_corpus()
+    mismatches = [(text, legacy_extract_fields(text), extract_fields(text))
+                  for text in texts if legacy_extract_fields(text) != extract_fields(text)]
+
+    before = time_extractor(legacy_extract_fields, texts, args.iterations)
+    after = time_extractor(extract_fields, texts, args.iterations)
+
+    print("\n" + "="*70)
+    print(f"FIELD EXTRACTION MICRO-BENCHMARK ({len(texts)} texts x {args.iterations} iterations)")
+    print("="*70)
+    print(f"Before (per-field rescans):   {before*1e6:8.1f} µs/record")
+    print(f"After  (shared single-pass):  {after*1e6:8.1f} µs/record")
+    print(f"Speedup: {before/after:.2f}x")
+    print(f"Output mismatches: {len(mismatches)}")
+    for text, old, new in mismatches[:5]:
+        print(f"  before={old}\n  after ={new}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
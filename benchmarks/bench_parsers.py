@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTML parser backends for the text extraction path
+For each installed backend (html.parser, lxml, selectolax) reports parse
+time per page and peak memory per page:
+  - py heap: tracemalloc peak (Python allocations only)
+  - RSS:     process high-water mark growth, measured in a fresh
+             subprocess per backend so C-level allocations count too
+
+The saved fixtures are tiny compared to live profile pages, so by default
+each one is padded with filler markup up to --page-kb.
+
+Usage:
+  python benchmarks/bench_parsers.py --iterations 50 --page-kb 400
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from html_parsers import PARSER_BACKENDS, BACKEND_AVAILABLE, get_parser  # noqa: E402
+from field_extraction import extract_fields  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures', 'profiles')
+
+FILLER_BLOCK = (
+    '<div class="listing-card"><a href="/realestateandhomes-detail/{n}">'
+    '<span class="price">${n},000</span><ul><li>3 bed</li><li>2 bath</li>'
+    '<li>1,850 sqft</li></ul><p>Charming home close to schools and parks.</p></a></div>\n'
+)
+
+
+def load_pages(directory, page_kb):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        if page_kb and len(html) < page_kb * 1024:
+            blocks = []
+            size, n = len(html), 0
+            while size < page_kb * 1024:
+                block = FILLER_BLOCK.format(n=100 + n)
+                blocks.append(block)
+                size += len(block)
+                n += 1
+            html = html.replace('</main>', '<section class="listings">' + ''.join(blocks) + '</section></main>')
+        pages.append(html)
+    return pages
+
+
+def max_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 if sys.platform == 'darwin' else usage  # macOS reports bytes
+
+
+def measure_backend(name, pages, iterations):
+    """Runs inside a fresh process for one backend"""
+    parser = get_parser(name)
+    parser.parse_profile(pages[0])  # warm-up (lazy imports, caches)
+    rss_before = max_rss_kb()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for html in pages:
+            extract_fields(parser.parse_profile(html)[0])
+    seconds_per_page = (time.perf_counter() - started) / (iterations * len(pages))
+    rss_growth = max_rss_kb() - rss_before
+
+    heap_peak = 0
+    for html in pages:
+        tracemalloc.start()
+        parser.parse_profile(html)
+        heap_peak = max(heap_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'backend': name,
+        'ms_per_page': seconds_per_page * 1000,
+        'py_heap_peak_kb': heap_peak / 1024,
+        'rss_growth_kb': rss_growth,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse time and memory per page for each HTML parser backend")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--page-kb', type=int, default=400, help="pad fixtures to this size (0 = as saved)")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--backend', help=argparse.SUPPRESS)  # child-process mode
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixtures, args.page_kb)
+    if not pages:
+        print(f"No fixtures found in {args.fixtures}")
+        return
+
+    if args.backend:
+        print(json.dumps(measure_backend(args.backend, pages, args.iterations)))
+        return
+
+    results = []
+    for name in PARSER_BACKENDS:
+        if not BACKEND_AVAILABLE[name]:
+            print(f"(skipping {name}: not installed)")
+            continue
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--backend', name,
+             '--iterations', str(args.iterations), '--page-kb', str(args.page_kb),
+             '--fixtures', args.fixtures],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    avg_kb = sum(len(html) for html in pages) / len(pages) / 1024
+    print("\n" + "="*70)
+    print(f"PARSER BENCHMARK ({len(pages)} pages, ~{avg_kb:.0f} KB each, {args.iterations} iterations)")
+    print("="*70)
+    print(f"{'backend':<14}{'ms/page':>10}{'py heap KB':>14}{'RSS growth KB':>16}")
+    for r in results:
+        print(f"{r['backend']:<14}{r['ms_per_page']:>10.2f}{r['py_heap_peak_kb']:>14.0f}{r['rss_growth_kb']:>16.0f}")
+    baseline = next((r for r in results if r['backend'] == 'html.parser'), None)
+    if baseline:
+        for r in results:
+            if r is not baseline:
+                print(f"{r['backend']} is {baseline['ms_per_page'] / r['ms_per_page']:.1f}x faster than html.parser")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for realtor.com
+Serves saved fixture pages, plus (with --city) a synthetic search flow, so
+the fetch backends and both scrapers can be run end to end without
+touching the live site.
+
+  /realestateagents                     -> search page (City, ST input)
+  /search?q=<City, ST>                  -> redirect to the city's results
+  /realestateagents/<city>_<st>[/pg-N]  -> results page: agent cards, pagination
+                                           links, and infinite scroll that appends
+                                           the next page (?fragment=1)
+  /realestateagents/<id>                -> fixtures/profiles/<id>.html, else a generated profile
+  /challenge/realestateagents/<id>      -> bot-check page (403), to exercise fallback
+
+Usage:
+  python benchmarks/fixture_server.py --port 8765
+  python benchmarks/fixture_server.py --city "London, KY" --city "Corbin, KY" --agents 120 --latency 0.05
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import hashlib
+import html
+import os
+import re
+import sys
+import threading
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_pages import city_slug  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+CHALLENGE_PAGE = """<!DOCTYPE html>
+<html><head><title>Pardon Our Interruption</title></head>
+<body><p>Please complete the CAPTCHA to continue.</p></body></html>
+"""
+
+PROFILE_ID_RE = re.compile(r'^5[0-9a-f]{23}$')
+PAGE_RE = re.compile(r'^(?P<slug>[a-z0-9-]+_[a-z]{2})(?:/pg-(?P<page>\d+))?$')
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>Find a Realtor | realtor.com</title></head>
+<body>
+  <form action="/search" method="get">
+    <input type="text" name="q" placeholder="City, Zip, Neighborhood" autocomplete="off">
+  </form>
+</body></html>
+"""
+
+RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>Real Estate Agents in {city}, {state} | realtor.com</title>
+<style>.agent-card {{ height: 140px; border-bottom: 1px solid #ddd; }}</style></head>
+<body>
+  <h1>Real Estate Agents in {city}, {state}</h1>
+  <div id="results">{cards}</div>
+  <nav class="pagination">{pagination}</nav>
+  <script>
+    let nextPage = {next_page};
+    let loading = false;
+    window.addEventListener('scroll', () => {{
+      if (loading || nextPage > {pages}) return;
+      if (window.innerHeight + window.scrollY < document.body.scrollHeight - 300) return;
+      loading = true;
+      fetch('/realestateagents/{slug}/pg-' + nextPage + '?fragment=1')
+        .then(response => response.text())
+        .then(cards => {{
+          document.getElementById('results').insertAdjacentHTML('beforeend', cards);
+          nextPage += 1;
+          loading = false;
+        }});
+    }});
+  </script>
+</body></html>
+"""
+
+CARD = """<div class="agent-card" data-testid="agent-card">
+  <a data-testid="agent-name" href="/realestateagents/{id}">{name}</a>
+  <div class="agent-brokerage">{brokerage}</div>
+  <div class="agent-phone">{phone}</div>
+</div>"""
+
+PROFILE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{name} - {city_upper}, {zip} Real Estate Agent | realtor.com®</title>
+  <script type="application/ld+json">{{"@context": "https://schema.org", "@type": "RealEstateAgent", "name": "{name}", "telephone": "+1-{phone_digits}", "address": {{"@type": "PostalAddress", "streetAddress": "{street}", "addressLocality": "{city_upper}", "addressRegion": "{state}", "postalCode": "{zip}"}}, "worksFor": {{"@type": "Organization", "name": "{brokerage}"}}}}</script>
+</head>
+<body>
+  <main>
+    <section class="agent-profile">
+      <h1>{name}</h1>
+      <div class="agent-phone"><a href="tel:{phone}">{phone}</a> <span>mobile</span></div>
+      <div class="agent-address">{street}</div>
+      <div class="agent-city">{city_upper}, {state} {zip}</div>
+      <div class="agent-brokerage">{brokerage}</div>
+      <div class="agent-license">Agent license # {license}</div>
+    </section>
+    <section class="agent-about">
+      <h2>About {name}</h2>
+      <p>Experienced local agent helping buyers and sellers across the region.</p>
+    </section>
+  </main>
+</body>
+</html>
+"""
+
+FIRST_NAMES = ['Ann', 'Bill', 'Carla', 'Dan', 'Erin', 'Frank', 'Gina', 'Hank', 'Iris', 'Jack', 'Kim', 'Luis']
+LAST_NAMES = ['Adams', 'Baker', 'Clark', 'Davis', 'Evans', 'Foster', 'Gumm', 'Hayes', 'Irwin', 'Jones']
+BROKERAGES = ['Bluegrass Realty', 'Summit Real Estate', 'Lakeside Properties', 'Main Street Group']
+
+
+class StandInSite:
+    """Synthetic agents for a set of cities, deterministic for a given configuration
+
+    Each city after the first shares `overlap` of its agents with the
+    previous one, like agents who show up in neighbouring cities' results.
+    """
+
+    def __init__(self, cities, agents_per_city=60, page_size=20, overlap=0.2):
+        self.page_size = page_size
+        self.cities = {}  # slug -> (city, state, [agent ids])
+        self.agents = {}  # id -> agent fields
+        previous = []
+        for city, state in cities:
+            shared = previous[:int(len(previous) * overlap)]
+            ids = shared + [self.new_agent(city, state, n) for n in range(agents_per_city - len(shared))]
+            self.cities[city_slug(city, state)] = (city, state, ids)
+            previous = ids
+
+    def new_agent(self, city, state, n):
+        agent_id = '5' + hashlib.sha1(f"{city}|{state}|{n}".encode()).hexdigest()[:23]
+        seed = int(agent_id[1:9], 16)
+        phone = f"(606) {200 + seed % 800:03d}-{seed % 10000:04d}"
+        self.agents[agent_id] = {
+            'id': agent_id,
+            'name': f"{FIRST_NAMES[seed % len(FIRST_NAMES)]} {LAST_NAMES[(seed // 7) % len(LAST_NAMES)]} {n}",
+            'phone': phone,
+            'phone_digits': phone.replace('(', '').replace(') ', '-'),
+            'street': f"{100 + seed % 9000} Main Street",
+            'city_upper': city.upper(),
+            'state': state,
+            'zip': f"{40000 + seed % 2000:05d}",
+            'brokerage': BROKERAGES[seed % len(BROKERAGES)],
+            'license': f"{200000 + seed % 100000}",
+        }
+        return agent_id
+
+    def expected_agents(self, cities=None):
+        """Distinct agent IDs across the given (or all) cities"""
+        slugs = [city_slug(city, state) for city, state in cities] if cities else list(self.cities)
+        return {agent_id for slug in slugs if slug in self.cities for agent_id in self.cities[slug][2]}
+
+    def page_count(self, slug):
+        return max(1, -(-len(self.cities[slug][2]) // self.page_size))
+
+    def cards(self, slug, page):
+        ids = self.cities[slug][2][(page - 1) * self.page_size:page * self.page_size]
+        return '\n'.join(CARD.format(**{key: html.escape(str(value)) for key, value in self.agents[agent_id].items()})
+                         for agent_id in ids)
+
+    def results_page(self, slug, page):
+        city, state, _ = self.cities[slug]
+        pages = self.page_count(slug)
+        links = [f'<a href="/realestateagents/{slug}/pg-{n}">{n}</a>' for n in range(1, pages + 1)]
+        if page < pages:
+            links.append(f'<a aria-label="Go to next page" href="/realestateagents/{slug}/pg-{page + 1}">Next</a>')
+        return RESULTS_PAGE.format(city=city, state=state, slug=slug, cards=self.cards(slug, page),
+                                   pagination=' '.join(links), next_page=page + 1, pages=pages)
+
+    def profile_page(self, agent_id):
+        return PROFILE_PAGE.format(**self.agents[agent_id])
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real site
+    fixtures_dir = FIXTURES_DIR
+    site = None     # StandInSite for the search flow (None = profile fixtures only)
+    latency = 0.0   # Seconds added to every response, to stand in for server time
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        query = parse_qs(url.query)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if path.startswith('/challenge/'):
+            self.send_page(403, CHALLENGE_PAGE)
+            return
+
+        if path == '/realestateagents':
+            self.send_page(200, SEARCH_PAGE)
+            return
+
+        if path == '/search' and self.site:
+            text = query.get('q', [''])[0]
+            city, _, state = text.rpartition(',')
+            slug = city_slug(city.strip(), state.strip()) if city else ''
+            if slug in self.site.cities:
+                self.send_redirect(f"/realestateagents/{slug}")
+                return
+
+        if path.startswith('/realestateagents/'):
+            rest = path[len('/realestateagents/'):]
+            if PROFILE_ID_RE.match(rest):
+                fixture = os.path.join(self.fixtures_dir, 'profiles', f"{rest}.html")
+                if os.path.exists(fixture):
+                    with open(fixture, encoding='utf-8') as f:
+                        self.send_page(200, f.read())
+                    return
+                if self.site and rest in self.site.agents:
+                    self.send_page(200, self.site.profile_page(rest))
+                    return
+
+            match = PAGE_RE.match(rest)
+            if match and self.site and match.group('slug') in self.site.cities:
+                slug, page = match.group('slug'), int(match.group('page') or 1)
+                if page <= self.site.page_count(slug):
+                    if query.get('fragment'):
+                        self.send_page(200, self.site.cards(slug, page))
+                    else:
+                        self.send_page(200, self.site.results_page(slug, page))
+                    return
+
+        self.send_page(404, "<html><body><h1>Not found</h1></body></html>")
+
+    def send_redirect(self, location):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def send_page(self, status, html):
+        body = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def start_server(port=0, fixtures_dir=FIXTURES_DIR, site=None, latency=0.0):
+    """Start the stand-in server on a background thread; returns (server, base_url)"""
+    handler = type('Handler', (FixtureHandler,), {'fixtures_dir': fixtures_dir, 'site': site, 'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fixture realtor.com pages locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--city', action='append', default=[], help='"City, ST" to serve a search flow for (repeatable)')
+    parser.add_argument('--agents', type=int, default=60, help='agents per city')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--overlap', type=float, default=0.2, help="share of each city's agents also in the previous city")
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    args = parser.parse_args()
+
+    cities = [tuple(part.strip() for part in text.rsplit(',', 1)) for text in args.city]
+    site = StandInSite(cities, args.agents, args.page_size, args.overlap) if cities else None
+    server, base_url = start_server(args.port, args.fixtures, site=site, latency=args.latency)
+    logger.info(f"Serving fixtures from {args.fixtures} at {base_url}")
+    if site:
+        for slug in site.cities:
+            logger.info(f"  {base_url}/realestateagents/{slug} ({site.page_count(slug)} pages)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Multi-Browser Worker Pool
+Splits the collected profile URLs into shards, one per worker process.
+Each worker runs its own undetected Chrome (built with the scraper's
+setup_driver) and streams records back over a queue, so the parent is
+the only process that ever writes the progress file.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+import logging
+
+from throttle import SiteBlocked
+
+logger = logging.getLogger(__name__)
+
+# Stagger Chrome launches - undetected_chromedriver patches its binary on
+# startup and parallel launches can trip over each other
+STARTUP_STAGGER = 2.0
+
+
+class SharedRateLimiter:
+    """Requests-per-second cap shared by every worker process"""
+
+    def __init__(self, ctx, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = ctx.Value('d', 0.0)
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.next_slot.get_lock():
+            now = time.time()
+            slot = max(now, self.next_slot.value)
+            self.next_slot.value = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def shard_urls(urls, workers):
+    """Round-robin split so every shard gets a similar mix of URLs"""
+    urls = list(urls)
+    return [urls[i::workers] for i in range(workers) if urls[i::workers]]
+
+
+def browser_worker(worker_id, scraper_class, shard, results, limiter):
+    """Worker process: own Chrome, own shard, records back to the parent
+
+    Chrome is recycled between profiles on the scraper's page / memory
+    limits; the per-generation driver stats go back with 'done'.
+    """
+    time.sleep(worker_id * STARTUP_STAGGER)
+    scraper = None
+    drivers = None
+    try:
+        scraper = scraper_class()
+        for url in shard:
+            limiter.wait()
+            try:
+                scraper.recycle_driver_if_due()
+                page_source = scraper.fetch_profile(url)  # Also paced by the worker's own adaptive throttle
+                record = scraper.parse_agent_page(page_source, url)
+                scraper.check_page(page_source, record)  # Challenge / empty pages raise instead of becoming records
+                results.put(('record', worker_id, record))
+            except SiteBlocked:
+                raise
+            except Exception as e:
+                results.put(('error', worker_id, (url, str(e))))
+    except Exception as e:
+        results.put(('error', worker_id, (None, f"worker failed: {e}")))
+    finally:
+        if scraper:
+            scraper.close()
+            drivers = scraper.drivers.summary()
+        results.put(('done', worker_id, drivers))
+
+
+def scrape_with_browser_pool(scraper_class, urls, on_record, workers=4, requests_per_second=None, on_error=None):
+    """Scrape urls with `workers` Chrome processes; on_record(record) and on_error(url, error) run in this process
+
+    Returns each worker's per-generation driver stats, keyed by worker id.
+    """
+    ctx = mp.get_context('spawn')
+    shards = shard_urls(urls, workers)
+    results = ctx.Queue(maxsize=1000)
+    limiter = SharedRateLimiter(ctx, requests_per_second)
+
+    logger.info(f"Starting {len(shards)} browser workers for {len(urls)} profiles...")
+    processes = [
+        ctx.Process(target=browser_worker, args=(worker_id, scraper_class, shard, results, limiter), daemon=True)
+        for worker_id, shard in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+
+    worker_drivers = {}
+    running = len(processes)
+    while running:
+        try:
+            kind, worker_id, payload = results.get(timeout=5)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                logger.error("All browser workers exited unexpectedly")
+                break
+            continue
+
+        if kind == 'record':
+            on_record(payload)
+        elif kind == 'error':
+            url, error = payload
+            logger.error(f"Worker {worker_id}: {url + ': ' if url else ''}{error}")
+            if url and on_error:
+                on_error(url, error)
+        elif kind == 'done':
+            running -= 1
+            worker_drivers[worker_id] = payload or []
+            logger.info(f"Worker {worker_id} finished after {len(worker_drivers[worker_id])} Chrome generation(s) "
+                        f"({running} still running)")
+
+    for process in processes:
+        process.join(timeout=10)
+    return worker_drivers
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Checkpoint Log
+Append-only JSONL log of extracted agent records. Each record is written
+as soon as it is extracted and flushed (with fsync) in small batches, so a
+crash loses at most one batch. Resume and the final CSV both stream the
+log instead of holding it in memory.
+"""
+
+import csv
+import json
+import os
+import logging
+
+from records import RECORD_FIELDS, RecordCounts
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointLog:
+    """Append-only JSONL writer, flushed every `flush_every` records"""
+
+    def __init__(self, path, flush_every=10):
+        self.path = path
+        self.flush_every = flush_every
+        self.pending = 0
+        repair_torn_tail(path)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def append(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def repair_torn_tail(path):
+    """Finish the log's last line so the next append starts on a fresh one
+
+    A last line without its newline is kept (newline added) if it is a
+    complete record - the crash came between the record and its newline -
+    and cut off if it is a partial write.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if not end:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b'\n':
+            return
+        # Walk back to the last newline; everything after it is the unfinished line
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        f.seek(position)
+        try:
+            complete = isinstance(json.loads(f.read().decode('utf-8')), dict)
+        except ValueError:  # Includes UnicodeDecodeError from a write cut mid-character
+            complete = False
+        if complete:
+            f.write(b'\n')
+            return
+        f.truncate(position)
+    logger.warning(f"Dropped a partial last record ({end - position} bytes) from {path}")
+
+
+def log_size(path):
+    """Current end of a log - pass as iter_records(start=...) to read only what is appended after"""
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def iter_records(path, start=0):
+    """Stream records from a checkpoint log (from byte offset `start`); a torn last line is skipped"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        f.seek(start)
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line {line_num} in {path}")
+
+
+def load_seen_urls(path):
+    """Profile URLs already in the log"""
+    return {record['profile_url'] for record in iter_records(path) if record.get('profile_url')}
+
+
+def import_csv(csv_path, log_path):
+    """One-off migration of an old progress CSV into a checkpoint log"""
+    count = 0
+    with open(csv_path, newline='', encoding='utf-8') as f, CheckpointLog(log_path, flush_every=500) as log:
+        for row in csv.DictReader(f):
+            log.append({field: row.get(field) or '' for field in RECORD_FIELDS})
+            count += 1
+    return count
+
+
+def export_csv(log_path, csv_path, drop_columns=()):
+    """Write the log out as a CSV in one streaming pass; returns summary counts
+
+    Later records for the same profile_url replace earlier ones (re-scrapes).
+    """
+    columns = [field for field in RECORD_FIELDS if field not in drop_columns]
+
+    # Only the byte offset of the newest record per URL is kept in memory
+    latest = {}
+    unkeyed = []
+    with open(log_path, 'rb') as f:
+        offset = 0
+        for line in f:
+            try:
+                url = json.loads(line).get('profile_url') if line.strip() else None
+            except (ValueError, AttributeError):
+                logger.warning(f"Skipping unreadable line at byte {offset} in {log_path}")
+            else:
+                if url:
+                    latest[url] = offset
+                elif line.strip():
+                    unkeyed.append(offset)
+            offset += len(line)  # Raw length, so offsets stay right after a bad line
+    keep = set(latest.values()) | set(unkeyed)
+
+    counts = RecordCounts()
+    with open(log_path, 'rb') as src, open(csv_path, 'w', newline='', encoding='utf-8') as dst:
+        writer = csv.DictWriter(dst, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        offset = 0
+        for line in src:
+            if offset in keep:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None  # Changed since the first pass (e.g. a torn tail still being written)
+                if record is not None:
+                    writer.writerow({column: record.get(column, '') for column in columns})
+                    counts.add(record)
+            offset += len(line)
+    return counts
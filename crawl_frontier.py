@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Crawl Frontier
+Persistent crawl state in SQLite: every discovered profile URL with its
+status (pending / in_flight / done / failed), attempt count, last error and
+timestamps, plus a record of which cities finished discovery. A restart
+can skip the pagination walk entirely, and failed profiles can be retried
+on their own instead of being dropped. When each URL was last seen in the
+search results and last scraped drives incremental recrawls.
+
+The agents table is a global identity index across cities, keyed by the
+24-hex profile ID: an agent that turns up in several cities' results is
+scraped once and its record linked to every other city.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+REMOVED = 'removed'  # No longer in the search results (reported once in a change diff)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    discovered_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_seen_at REAL,
+    scraped_at REAL,
+    PRIMARY KEY (city, state, url)
+);
+CREATE INDEX IF NOT EXISTS urls_status ON urls (city, state, status);
+CREATE TABLE IF NOT EXISTS discovery (
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    pages INTEGER,
+    url_count INTEGER,
+    started_at REAL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (city, state)
+);
+CREATE TABLE IF NOT EXISTS agents (
+    agent_id TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    scraped_at REAL
+);
+CREATE TABLE IF NOT EXISTS agent_cities (
+    agent_id TEXT NOT NULL,
+    city TEXT NOT NULL,
+    state TEXT NOT NULL,
+    linked_at REAL NOT NULL,
+    PRIMARY KEY (agent_id, city, state)
+);
+"""
+
+# Columns added after the first release of the schema: (table, column, type)
+ADDED_COLUMNS = [
+    ('urls', 'last_seen_at', 'REAL'),
+    ('urls', 'scraped_at', 'REAL'),
+    ('discovery', 'started_at', 'REAL'),
+]
+
+
+class CrawlFrontier:
+    """SQLite-backed frontier of profile URLs, per city
+
+    Safe to share between threads (pipeline stages): every statement runs
+    under one lock on the single connection.
+    """
+
+    def __init__(self, path='crawl_state.db'):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)  # Batch workers share the file
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        for table, column, column_type in ADDED_COLUMNS:
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        self.conn.commit()
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def write(self, sql, params=(), many=False):
+        """Run a statement (or executemany) in its own transaction; returns the row count"""
+        with self.lock, self.conn:
+            cursor = self.conn.executemany(sql, params) if many else self.conn.execute(sql, params)
+            return cursor.rowcount
+
+    def add_urls(self, city, state, urls):
+        """Record URLs seen in the search results: new ones as pending, known ones keep their state
+
+        A URL that had been marked removed and shows up again goes back to pending.
+        """
+        now = time.time()
+        self.write(
+            "INSERT INTO urls (city, state, url, status, discovered_at, updated_at, last_seen_at) "
+            "VALUES (?, ?, ?, 'pending', ?, ?, ?) "
+            "ON CONFLICT (city, state, url) DO UPDATE SET last_seen_at = excluded.last_seen_at, "
+            "status = CASE WHEN status = 'removed' THEN 'pending' ELSE status END",
+            [(city, state, url, now, now, now) for url in urls],
+            many=True,
+        )
+
+    def mark_discovery_complete(self, city, state, pages=None, started_at=None):
+        url_count = self.query(
+            "SELECT COUNT(*) FROM urls WHERE city = ? AND state = ? AND status != 'removed'",
+            (city, state))[0][0]
+        self.write(
+            "INSERT OR REPLACE INTO discovery (city, state, pages, url_count, started_at, completed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (city, state, pages, url_count, started_at, time.time()),
+        )
+
+    def discovery(self, city, state):
+        """The last finished pagination walk for a city (pages, url_count, started_at, completed_at), or None"""
+        rows = self.query(
+            "SELECT pages, url_count, started_at, completed_at FROM discovery WHERE city = ? AND state = ?",
+            (city, state))
+        if not rows:
+            return None
+        return dict(zip(('pages', 'url_count', 'started_at', 'completed_at'), rows[0]))
+
+    def forget_discovery(self, city, state):
+        """Force the next run to walk the search results again"""
+        self.write("DELETE FROM discovery WHERE city = ? AND state = ?", (city, state))
+
+    def urls(self, city, state, statuses=None):
+        """URLs for a city, optionally only those in the given statuses (removed ones only if asked)"""
+        query = "SELECT url FROM urls WHERE city = ? AND state = ?"
+        params = [city, state]
+        if statuses:
+            query += f" AND status IN ({', '.join('?' * len(statuses))})"
+            params.extend(statuses)
+        else:
+            query += " AND status != 'removed'"
+        return [row[0] for row in self.query(query, params)]
+
+    def set_status(self, city, state, url, status, error=None):
+        """Move a URL to a new status; finishing (done / failed) counts as an attempt"""
+        finished = 1 if status in (DONE, FAILED) else 0
+        if error is not None:
+            error = str(error)[:500]
+        now = time.time()
+        self.write(
+            "UPDATE urls SET status = ?, attempts = attempts + ?, "
+            "last_error = COALESCE(?, last_error), updated_at = ?, "
+            "scraped_at = CASE WHEN ? = 'done' THEN ? ELSE scraped_at END "
+            "WHERE city = ? AND state = ? AND url = ?",
+            (status, finished, error, now, status, now, city, state, url),
+        )
+
+    def reset_in_flight(self, city, state):
+        """URLs left in flight by a crash go back to pending"""
+        return self.write(
+            "UPDATE urls SET status = 'pending', updated_at = ? "
+            "WHERE city = ? AND state = ? AND status = 'in_flight'",
+            (time.time(), city, state),
+        )
+
+    def failed(self, city, state, max_attempts=None):
+        """(url, attempts, last_error) for failed URLs, optionally under an attempt cap"""
+        query = "SELECT url, attempts, last_error FROM urls WHERE city = ? AND state = ? AND status = 'failed'"
+        params = [city, state]
+        if max_attempts:
+            query += " AND attempts < ?"
+            params.append(max_attempts)
+        return self.query(query, params)
+
+    def stale_urls(self, city, state, max_age):
+        """Scraped URLs whose last scrape is older than max_age seconds"""
+        cutoff = time.time() - max_age
+        rows = self.query(
+            "SELECT url FROM urls WHERE city = ? AND state = ? AND status = 'done' "
+            "AND (scraped_at IS NULL OR scraped_at < ?)",
+            (city, state, cutoff))
+        return {row[0] for row in rows}
+
+    def unseen_urls(self, city, state, since):
+        """URLs not seen in the search results since the given time (and not already marked removed)"""
+        rows = self.query(
+            "SELECT url FROM urls WHERE city = ? AND state = ? AND status != 'removed' "
+            "AND (last_seen_at IS NULL OR last_seen_at < ?)",
+            (city, state, since))
+        return {row[0] for row in rows}
+
+    def mark_removed(self, city, state, urls):
+        now = time.time()
+        self.write(
+            "UPDATE urls SET status = 'removed', updated_at = ? WHERE city = ? AND state = ? AND url = ?",
+            [(now, city, state, url) for url in urls],
+            many=True,
+        )
+
+    def counts(self, city, state):
+        rows = self.query(
+            "SELECT status, COUNT(*) FROM urls WHERE city = ? AND state = ? GROUP BY status", (city, state))
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0, REMOVED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def remember_agent(self, agent_id, record, city, state):
+        """Index a freshly scraped agent record (replaces any older one) and link it to the city"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO agents (agent_id, record, city, state, scraped_at) VALUES (?, ?, ?, ?, ?)",
+                (agent_id, json.dumps(record, ensure_ascii=False), city, state, now))
+            self.conn.execute(
+                "INSERT OR IGNORE INTO agent_cities (agent_id, city, state, linked_at) VALUES (?, ?, ?, ?)",
+                (agent_id, city, state, now))
+
+    def backfill_agents(self, items, city, state, scraped_at=None):
+        """Index (agent_id, record) pairs from an existing progress log; returns how many
+
+        Later pairs for the same agent win, but never over an entry scraped after `scraped_at`.
+        """
+        now = time.time()
+        rows = [(agent_id, json.dumps(record, ensure_ascii=False), city, state, scraped_at) for agent_id, record in items]
+        self.write("INSERT INTO agents (agent_id, record, city, state, scraped_at) VALUES (?, ?, ?, ?, ?) "
+                   "ON CONFLICT (agent_id) DO UPDATE SET record = excluded.record, city = excluded.city, "
+                   "state = excluded.state, scraped_at = excluded.scraped_at "
+                   "WHERE agents.scraped_at IS NULL OR agents.scraped_at <= excluded.scraped_at",
+                   rows, many=True)
+        self.write("INSERT OR IGNORE INTO agent_cities (agent_id, city, state, linked_at) VALUES (?, ?, ?, ?)",
+                   [(row[0], city, state, now) for row in rows], many=True)
+        return len(rows)
+
+    def link_agent(self, agent_id, city, state):
+        self.write("INSERT OR IGNORE INTO agent_cities (agent_id, city, state, linked_at) VALUES (?, ?, ?, ?)",
+                   (agent_id, city, state, time.time()))
+
+    def known_agent(self, agent_id, max_age=None):
+        """(record, city, state) of the indexed agent, or None (also if older than max_age seconds)"""
+        query = "SELECT record, city, state FROM agents WHERE agent_id = ?"
+        params = [agent_id]
+        if max_age is not None:
+            query += " AND scraped_at >= ?"
+            params.append(time.time() - max_age)
+        rows = self.query(query, params)
+        if not rows:
+            return None
+        record, city, state = rows[0]
+        return json.loads(record), city, state
+
+    def agents_indexed(self, city, state):
+        """How many agents are linked to a city"""
+        return self.query("SELECT COUNT(*) FROM agent_cities WHERE city = ? AND state = ?", (city, state))[0][0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
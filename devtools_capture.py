@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - DevTools Network Capture
+Reads agent search results straight out of the JSON responses the page
+itself requests, via Chrome's performance log and Network.getResponseBody,
+instead of one WebDriver round-trip per result element. Each captured
+agent becomes a card: profile URL plus whatever fields the response had.
+"""
+
+import base64
+import json
+import re
+import logging
+
+from structured_extract import (embedded_json_blobs, format_phone, pick_phone, pick_address, pick_brokerage,
+                                pick_license)
+
+logger = logging.getLogger(__name__)
+
+AGENT_ID_RE = re.compile(r'^5[0-9a-f]{23}$')
+AGENT_ID_KEYS = ('id', 'advertiser_id', 'fulfillment_id', '_id', 'agent_id')
+PROFILE_BASE_URL = "https://www.realtor.com/realestateagents"
+
+# Only JSON responses whose URL looks like it could carry search results are read
+RESPONSE_URL_RE = re.compile(r'agent|graphql|search|api', re.IGNORECASE)
+
+CARD_FIELDS = ('name', 'phone_number', 'address', 'brokerage', 'agent_license')
+
+
+def enable_performance_logging(options):
+    """Turn on the Chrome performance log (network events) for a new driver"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def agent_id(node):
+    for key in AGENT_ID_KEYS:
+        value = node.get(key)
+        if isinstance(value, str) and AGENT_ID_RE.match(value):
+            return value
+    return None
+
+
+def agent_name(node):
+    name = node.get('full_name') or node.get('name') or ''
+    if not isinstance(name, str):
+        name = ''
+    if not name and (node.get('first_name') or node.get('last_name')):
+        name = f"{node.get('first_name') or ''} {node.get('last_name') or ''}"
+    return name.strip()
+
+
+def agent_cards(data, profile_base=PROFILE_BASE_URL):
+    """Every agent object in a JSON payload, as {profile_url: card}
+
+    Cards only hold the fields the payload had (name is always there).
+    """
+    cards = {}
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            found_id = agent_id(node)
+            name = agent_name(node) if found_id else ''
+            if found_id and name:
+                phone = pick_phone(node) or format_phone(node.get('phone_number') or '')
+                card = {
+                    'name': name,
+                    'phone_number': phone,
+                    'address': pick_address(node),
+                    'brokerage': pick_brokerage(node),
+                    'agent_license': pick_license(node),
+                }
+                url = f"{profile_base}/{found_id}"
+                cards[url] = {key: value for key, value in card.items() if value}
+                continue  # Nested objects belong to this agent (office, broker...)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return cards
+
+
+def cards_from_html(html, profile_base=PROFILE_BASE_URL):
+    """Agent cards from a page's embedded JSON (server-rendered first page of results)"""
+    cards = {}
+    for blob in embedded_json_blobs(html):
+        cards.update(agent_cards(blob, profile_base))
+    return cards
+
+
+def card_is_complete(card):
+    """True if the card has every field a profile visit would give us"""
+    return all(card.get(field) for field in CARD_FIELDS)
+
+
+class NetworkCapture:
+    """Pulls JSON response bodies for finished requests out of the performance log"""
+
+    def __init__(self, driver, url_pattern=RESPONSE_URL_RE):
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self.pending = {}  # requestId -> url, response seen but body not finished yet
+        self.responses_read = 0
+        self.log_entries = 0
+
+    def drain(self):
+        """JSON payloads of every matching response that finished since the last drain"""
+        finished = []
+        for entry in self.driver.get_log('performance'):
+            self.log_entries += 1
+            try:
+                message = json.loads(entry['message'])['message']
+            except (ValueError, KeyError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if 'json' in response.get('mimeType', '') and self.url_pattern.search(response.get('url', '')):
+                    self.pending[params['requestId']] = response['url']
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending:
+                finished.append(params['requestId'])
+            elif method == 'Network.loadingFailed':
+                self.pending.pop(params.get('requestId'), None)
+
+        payloads = []
+        for request_id in finished:
+            url = self.pending.pop(request_id)
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception as e:
+                # Bodies are evicted once the page navigates away
+                logger.debug(f"No body for {url}: {e}")
+                continue
+            text = body.get('body', '')
+            if body.get('base64Encoded'):
+                text = base64.b64decode(text).decode('utf-8', errors='replace')
+            try:
+                payloads.append(json.loads(text))
+                self.responses_read += 1
+            except ValueError:
+                continue
+        return payloads
+
+    def cards(self, profile_base=PROFILE_BASE_URL):
+        """Agent cards from every response captured since the last call"""
+        cards = {}
+        for payload in self.drain():
+            cards.update(agent_cards(payload, profile_base))
+        return cards
+
+    def discard(self):
+        """Empty the performance log so it doesn't grow while profiles are scraped"""
+        self.driver.get_log('performance')
+        self.pending.clear()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Batched DOM Harvesting
+Reads every agent link on the results page - href, name and the text of
+its card - in a single execute_script call, instead of find_elements plus
+one get_attribute round-trip per link. Agents are deduplicated on the
+24-hex profile ID, so re-reading the same cards at each scroll position
+costs nothing but that one call.
+
+Fields read from the card text are regex guesses: they are kept on the
+harvester for inspection, but only structured search JSON (see
+devtools_capture) is trusted to stand in for a profile visit.
+"""
+
+import logging
+
+from field_extraction import extract_fields
+
+logger = logging.getLogger(__name__)
+
+# One entry per profile ID not in arguments[0]: [id, href, name, card text].
+# Also returns the page height and the first agent link (for staleness
+# checks after paging). Known IDs are skipped so their text isn't resent.
+HARVEST_SCRIPT = r"""
+const idPattern = /\/realestateagents\/(5[0-9a-f]{23})(?![0-9a-f])/i;
+const seen = new Set(arguments[0] || []);
+const agents = [];
+let first = null;
+for (const link of document.querySelectorAll('a[href*="/realestateagents/5"]')) {
+    const match = idPattern.exec(link.href);
+    if (!match) continue;
+    first = first || link;
+    const id = match[1].toLowerCase();
+    if (seen.has(id)) continue;
+    seen.add(id);
+    const card = link.closest('[data-testid*="card"], [class*="card"], li, article') || link.parentElement;
+    const nameNode = card && card.querySelector('[data-testid="agent-name"]');
+    const name = (nameNode || link).innerText || '';
+    agents.push([id, link.href, name.trim(), card ? (card.innerText || '').slice(0, 2000) : '']);
+}
+return {agents: agents, height: document.body.scrollHeight, first: first};
+"""
+
+
+def card_from_text(name, text):
+    """Card fields from a search result's visible text (only the ones found)"""
+    card = dict(extract_fields(text), name=name.split('\n')[0].strip())
+    return {key: value for key, value in card.items() if value}
+
+
+class DomHarvester:
+    """Collects agent links and card fields from the current page, one script call per read"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.cards = {}  # profile ID -> card (profile_url plus any visible fields)
+        self.round_trips = 0
+        self.round_trips_at_reset = 0
+        self.links_read = 0
+        self.agents_found = 0
+        self.page_height = 0
+        self.first_link = None
+
+    def harvest(self):
+        """Read the page once; returns the profile IDs not seen before"""
+        result = self.driver.execute_script(HARVEST_SCRIPT, list(self.cards))
+        self.round_trips += 1
+        self.page_height = result.get('height') or 0
+        self.first_link = result.get('first')
+
+        new_ids = []
+        for profile_id, href, name, text in result.get('agents') or []:
+            self.links_read += 1
+            if profile_id in self.cards:
+                continue
+            self.cards[profile_id] = dict(card_from_text(name, text), profile_url=href)
+            new_ids.append(profile_id)
+        self.agents_found += len(new_ids)
+        return new_ids
+
+    def urls(self, ids=None):
+        """Profile URLs for the given IDs (default: every agent harvested)"""
+        ids = self.cards if ids is None else ids
+        return {self.cards[profile_id]['profile_url'] for profile_id in ids}
+
+    def cards_by_url(self):
+        return {card['profile_url']: card for card in self.cards.values()}
+
+    def reset(self):
+        """Forget harvested agents (keeps the counters)"""
+        self.cards = {}
+        self.first_link = None
+        self.round_trips_at_reset = self.round_trips
+
+    def calls_since_reset(self):
+        return self.round_trips - self.round_trips_at_reset
+
+    def log_summary(self):
+        if not self.round_trips:
+            return
+        logger.info(f"DOM harvest: {self.agents_found} agents from {self.round_trips} script call(s) "
+                    f"({self.links_read} cards read, no per-link round-trips)")
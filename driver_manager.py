@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Driver Lifecycle
+Owns the scraper's Chrome across a long run:
+  - persistent user-data-dir, so cookies, consent state and the HTTP cache
+    survive between runs and a relaunch starts warm
+  - recycling: a fresh browser after N page loads or once Chrome's memory
+    (browser plus renderer processes) passes a threshold, at points where
+    the scraper holds no page state - crawl position lives in the frontier
+    and progress log, not in the browser
+  - startup time, page count and memory recorded per driver generation
+
+Memory checks need psutil (pip install psutil); without it drivers are
+recycled on page count only.
+"""
+
+import os
+import time
+import logging
+
+import undetected_chromedriver as uc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+CHROME_VERSION = 134
+DEFAULT_PROFILE_DIR = 'chrome_profile'
+DEFAULT_MAX_PAGES = 500
+DEFAULT_MAX_RSS_MB = 2048
+RSS_CHECK_EVERY = 25  # Page loads between memory checks
+
+
+class DriverManager:
+    """Launches, measures and recycles one undetected Chrome
+
+    build_options() must return new ChromeOptions on every call (uc won't
+    reuse an options object). One profile directory can only be open in
+    one Chrome at a time, so parallel scrapers need their own (or None
+    for a throwaway profile, the old behaviour).
+    """
+
+    def __init__(self, build_options, profile_dir=DEFAULT_PROFILE_DIR, max_pages=DEFAULT_MAX_PAGES,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB, version_main=CHROME_VERSION, warm_url=None, metrics=None):
+        self.build_options = build_options
+        self.profile_dir = os.path.abspath(profile_dir) if profile_dir else None
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.version_main = version_main
+        self.warm_url = warm_url  # Visited once when the profile is new, to seed cookies and cache
+        self.metrics = metrics
+        self.driver = None
+        self.generations = []  # Stats per launched driver, newest last
+
+    @property
+    def current(self):
+        return self.generations[-1] if self.generations else None
+
+    def start(self):
+        """Launch a new driver generation and return it"""
+        fresh_profile = bool(self.profile_dir) and not os.path.isdir(self.profile_dir)
+        started = time.perf_counter()
+        self.driver = uc.Chrome(options=self.build_options(), user_data_dir=self.profile_dir,
+                                version_main=self.version_main)
+        startup = time.perf_counter() - started
+        if self.metrics:
+            self.metrics.observe('driver_start', startup)
+        self.generations.append({
+            'generation': len(self.generations) + 1,
+            'startup_seconds': round(startup, 2),
+            'profile': 'new' if fresh_profile else ('warm' if self.profile_dir else 'temporary'),
+            'pages': 0,
+            'rss_mb': None,
+            'peak_rss_mb': None,
+            'recycled_because': None,
+            'lifetime_seconds': None,
+            'started': time.time(),
+        })
+        if fresh_profile and self.warm_url:
+            try:
+                self.driver.get(self.warm_url)
+            except Exception as e:
+                logger.warning(f"Could not warm the new Chrome profile: {e}")
+        return self.driver
+
+    def page_loaded(self):
+        """Count a browser page load; memory is sampled every RSS_CHECK_EVERY loads"""
+        generation = self.current
+        generation['pages'] += 1
+        if self.max_rss_mb and generation['pages'] % RSS_CHECK_EVERY == 0:
+            self.sample_rss()
+
+    def sample_rss(self):
+        rss = self.rss_mb()
+        if rss is not None:
+            generation = self.current
+            generation['rss_mb'] = rss
+            generation['peak_rss_mb'] = max(generation['peak_rss_mb'] or 0, rss)
+        return rss
+
+    def rss_mb(self):
+        """Resident memory of the Chrome process tree in MB (None without psutil)"""
+        pid = getattr(self.driver, 'browser_pid', None)
+        if psutil is None or not pid:
+            return None
+        try:
+            browser = psutil.Process(pid)
+            processes = [browser] + browser.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue  # Renderer exited between listing and reading
+        return round(total / (1024 * 1024), 1)
+
+    def recycle_reason(self):
+        """Why the current driver should be replaced now, or None"""
+        generation = self.current
+        if generation is None:
+            return None
+        if self.max_pages and generation['pages'] >= self.max_pages:
+            return f"{generation['pages']} pages"
+        if self.max_rss_mb and (generation['rss_mb'] or 0) >= self.max_rss_mb:
+            return f"{generation['rss_mb']:.0f} MB RSS"
+        return None
+
+    def recycle(self, reason):
+        """Quit the current driver and start the next generation; returns the new driver"""
+        logger.info(f"Recycling Chrome (generation {self.current['generation']}, {reason})...")
+        self.current['recycled_because'] = reason
+        self.quit()
+        driver = self.start()
+        logger.info(f"Chrome generation {self.current['generation']} ready in {self.current['startup_seconds']}s")
+        return driver
+
+    def quit(self):
+        if self.driver is None:
+            return
+        generation = self.current
+        self.sample_rss()
+        generation['lifetime_seconds'] = round(time.time() - generation['started'], 1)
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Chrome did not quit cleanly: {e}")
+        self.driver = None
+
+    def summary(self):
+        return [{key: value for key, value in generation.items() if key != 'started'}
+                for generation in self.generations]
+
+    def log_summary(self):
+        if len(self.generations) < 2 and not (self.current and self.current['peak_rss_mb']):
+            return
+        for generation in self.summary():
+            memory = f", peak {generation['peak_rss_mb']} MB" if generation['peak_rss_mb'] else ""
+            logger.info(f"Chrome generation {generation['generation']}: started in {generation['startup_seconds']}s "
+                        f"({generation['profile']} profile), {generation['pages']} pages{memory}"
+                        + (f", recycled after {generation['recycled_because']}" if generation['recycled_because'] else ""))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Field Extraction
+Shared text extractors for phone, address, brokerage and license.
+
+Instead of re-scanning the whole text once per pattern, each field family
+is found from cheap precompiled anchor scans and only the spots they hit
+are examined:
+  - phone + license: one scan for '-' and '#'; every phone contains a dash,
+    every license pattern a '#'. Candidates are ranked the same way the old
+    ordered pattern lists were (mobile > office > any; agent license >
+    license > bare #nnnnnn), earliest match wins a tie.
+  - address: one scan for "ST 12345" state/zip anchors; the street pattern is
+    only tried from the street number in front of each anchor
+  - brokerage: keyword automaton (compiled alternation) over the whole text,
+    only the lines it hits are checked against the exclusions
+Results match the original per-field extractors.
+"""
+
+import re
+
+from html_parsers import get_parser
+from metrics import null_timer
+
+PHONE_LICENSE_ANCHOR_RE = re.compile(r'[-#]')
+DASH_PHONE_RE = re.compile(r'(\d{3})-(\d{3})-(\d{4})(?:\s+(mobile|office))?', re.IGNORECASE)
+PAREN_PHONE_RE = re.compile(r'\((\d{3})\)\s*(\d{3})-(\d{4})(?:\s+(mobile|office))?', re.IGNORECASE)
+LICENSE_NUMBER_RE = re.compile(r'#\s*(\d+)')
+LICENSE_LABEL_RE = re.compile(r'(Agent )?License\s*\Z', re.IGNORECASE)
+
+# Lower rank wins; ties go to the earliest match (same as trying patterns in order)
+PHONE_RANKS = {
+    ('paren', 'mobile'): 0,
+    ('dash', 'mobile'): 1,
+    ('paren', 'office'): 2,
+    ('dash', 'office'): 3,
+    ('paren', None): 4,
+}
+NO_RANK = 99
+LOOKBACK = 64  # Max chars between a phone's "(" / a license label and its anchor
+
+STATE_ZIP_RE = re.compile(r'[A-Z]{2}\s+\d{5}')
+ADDRESS_PATTERNS = [
+    re.compile(r'(\d+\s+[A-Za-z\s]+(?:Road|Street|Avenue|Drive|Boulevard|Lane|Way|Court|Circle|Parkway|Ave|St|Dr|Blvd|Ln|Rd|Ct|Cir|Pkwy)\s+[A-Za-z\s,]+[A-Z]{2}\s+\d{5})'),
+    re.compile(r'(\d+\s+[A-Za-z\s]+\s+[A-Za-z\s,]+[A-Z]{2}\s+\d{5})'),
+]
+# Matched against the REVERSED text: from a state/zip anchor back over the
+# letters/spaces/commas to the street number in front of them
+REVERSED_STREET_NUMBER_RE = re.compile(r'[A-Za-z\s,]*\d+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+BROKERAGE_KEYWORDS = ['Realty', 'Real Estate', 'Broker', 'Group', 'Associates', 'Company', 'Properties']
+BROKERAGE_EXCLUDED = ['find a', 'search for', 'contact', 'call', 'email', 'sign in',
+                      'register', 'save', 'filter', 'sort by', 'view', 'show']
+BROKERAGE_KEYWORD_RE = re.compile('|'.join(re.escape(kw) for kw in BROKERAGE_KEYWORDS))
+BROKERAGE_EXCLUDED_RE = re.compile('|'.join(re.escape(phrase) for phrase in BROKERAGE_EXCLUDED))
+
+FIELD_NAMES = ['phone_number', 'address', 'brokerage', 'agent_license']
+
+
+def phone_rank(style, kind):
+    return PHONE_RANKS.get((style, kind.lower() if kind else None), NO_RANK)
+
+
+def scan_phone_and_license(text):
+    """Single anchor scan for the best phone and license candidates"""
+    best_phone, best_phone_key = '', (NO_RANK, 0)
+    best_license, best_license_key = '', (NO_RANK, 0)
+
+    for anchor in PHONE_LICENSE_ANCHOR_RE.finditer(text):
+        pos = anchor.start()
+
+        if text[pos] == '-':
+            if best_phone_key[0] == 0:
+                continue
+            # Dash-style phone whose first dash is this one
+            match = DASH_PHONE_RE.match(text, pos - 3) if pos >= 3 else None
+            if match:
+                key = (phone_rank('dash', match.group(4)), match.start())
+                if key < best_phone_key:
+                    best_phone, best_phone_key = f"({match.group(1)}) {match.group(2)}-{match.group(3)}", key
+            # Paren-style phone whose only dash is this one
+            paren = text.rfind('(', max(0, pos - LOOKBACK), pos)
+            match = PAREN_PHONE_RE.match(text, paren) if paren != -1 else None
+            if match and match.end(2) == pos:
+                key = (phone_rank('paren', match.group(4)), match.start())
+                if key < best_phone_key:
+                    best_phone, best_phone_key = f"({match.group(1)}) {match.group(2)}-{match.group(3)}", key
+
+        else:
+            if best_license_key[0] == 0:
+                continue
+            match = LICENSE_NUMBER_RE.match(text, pos)
+            if not match:
+                continue
+            label = LICENSE_LABEL_RE.search(text, max(0, pos - LOOKBACK), pos)
+            if label:
+                key = (0 if label.group(1) else 1, label.start())
+            elif match.end() - match.start(1) >= 6 and match.start(1) == pos + 1:
+                key = (2, pos)
+            else:
+                continue
+            if key < best_license_key:
+                best_license, best_license_key = match.group(1), key
+
+        if best_phone_key[0] == 0 and best_license_key[0] == 0:
+            break
+
+    return best_phone, best_license
+
+
+def extract_phone(text):
+    """Extract phone number (mobile first, then office, then any)"""
+    return scan_phone_and_license(text)[0]
+
+
+def extract_license(text):
+    """Extract agent license number"""
+    return scan_phone_and_license(text)[1]
+
+
+def address_candidates(text):
+    """(start, end) spans that could hold an address: street number ... ST 12345"""
+    reversed_text = None
+    for anchor in STATE_ZIP_RE.finditer(text):
+        if reversed_text is None:
+            reversed_text = text[::-1]
+        match = REVERSED_STREET_NUMBER_RE.match(reversed_text, len(text) - anchor.start())
+        if match:
+            yield len(text) - match.end(), anchor.end()
+
+
+def extract_address(text):
+    """Extract office address"""
+    candidates = list(address_candidates(text))
+    for pattern in ADDRESS_PATTERNS:
+        for start, end in candidates:
+            match = pattern.match(text, start, end)
+            if match:
+                return WHITESPACE_RE.sub(' ', match.group(1).strip())
+    return ''
+
+
+def extract_brokerage(text):
+    """Extract brokerage name - first keyword line that isn't site chrome"""
+    checked_line_start = -1
+    for match in BROKERAGE_KEYWORD_RE.finditer(text):
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        if line_start == checked_line_start:
+            continue
+        checked_line_start = line_start
+        line_end = text.find('\n', match.end())
+        line = text[line_start:line_end if line_end != -1 else len(text)].strip()
+        if 10 < len(line) < 100 and not line.startswith('©'):
+            if not BROKERAGE_EXCLUDED_RE.search(line.lower()):
+                return line
+    return ''
+
+
+def extract_fields(text, metrics=None, fields=None):
+    """Text-derived fields (all of FIELD_NAMES, or just `fields`); each extractor timed as its own stage"""
+    timer = metrics.timer if metrics else null_timer
+    wanted = set(FIELD_NAMES if fields is None else fields)
+    result = {}
+    if wanted & {'phone_number', 'agent_license'}:
+        with timer('extract_phone_license'):
+            phone, license_num = scan_phone_and_license(text)
+        if 'phone_number' in wanted:
+            result['phone_number'] = phone
+        if 'agent_license' in wanted:
+            result['agent_license'] = license_num
+    if 'address' in wanted:
+        with timer('extract_address'):
+            result['address'] = extract_address(text)
+    if 'brokerage' in wanted:
+        with timer('extract_brokerage'):
+            result['brokerage'] = extract_brokerage(text)
+    return result
+
+
+def extract_fields_from_html(page_source, parser=None, metrics=None, fields=None):
+    """Flatten the page body to text and run the extractors (name from the h1)"""
+    timer = metrics.timer if metrics else null_timer
+    with timer('parse_html'):
+        text, agent_name = (parser or get_parser()).parse_profile(page_source)
+
+    result = extract_fields(text, metrics, fields)
+    result['name'] = agent_name
+    return result
+
+
+def fill_missing_fields(fields, page_source, parser=None, metrics=None):
+    """Complete a partial record (e.g. from embedded JSON): text extractors run only for the keys it lacks"""
+    missing = [key for key in ['name'] + FIELD_NAMES if not fields.get(key)]
+    if not missing:
+        return fields
+    if metrics:
+        metrics.count('text_fallbacks')
+    extracted = extract_fields_from_html(page_source, parser, metrics, missing)
+    return dict(fields, **{key: extracted.get(key, '') for key in missing})
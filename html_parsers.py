@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - HTML Parser Backends
+The text extractors only need two things from a profile page: the body
+text (one stripped string per line, scripts/styles left out) and the h1.
+Each backend provides exactly that:
+  - html.parser: BeautifulSoup with the stdlib parser (default, always available)
+  - lxml:        lxml.html (C, libxml2)
+  - selectolax:  selectolax (C, Lexbor engine; Modest on old versions) - usually fastest
+Missing optional libraries fall back to html.parser with a warning.
+"""
+
+from bs4 import BeautifulSoup
+import logging
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    try:
+        # selectolax < 1.0 only ships the Modest engine
+        from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+    except ImportError:
+        SelectolaxHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSER = 'html.parser'
+NON_TEXT_TAGS = ['script', 'style', 'template']
+
+
+class BeautifulSoupBackend:
+    """BeautifulSoup + stdlib html.parser"""
+    name = 'html.parser'
+
+    def parse_profile(self, page_source):
+        """(body text, h1 text) for a profile page"""
+        soup = BeautifulSoup(page_source, 'html.parser')
+        # Body only - text from <title> would otherwise be picked up as the brokerage
+        text = (soup.body or soup).get_text(separator='\n', strip=True)
+        name_elem = soup.find('h1')
+        heading = name_elem.get_text(' ', strip=True) if name_elem else ''
+        return text, heading
+
+
+class LxmlBackend:
+    """lxml.html"""
+    name = 'lxml'
+    TEXT_XPATH = './/text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]'
+
+    def parse_profile(self, page_source):
+        root = lxml.html.fromstring(page_source)
+        body = root.find('body')
+        if body is None:
+            body = root
+        lines = [chunk.strip() for chunk in body.xpath(self.TEXT_XPATH)]
+        text = '\n'.join(line for line in lines if line)
+
+        heading = ''
+        h1 = root.find('.//h1')
+        if h1 is not None:
+            heading = ' '.join(chunk.strip() for chunk in h1.itertext() if chunk.strip())
+        return text, heading
+
+
+class SelectolaxBackend:
+    """selectolax (Lexbor engine, Modest on selectolax < 1.0)"""
+    name = 'selectolax'
+
+    def parse_profile(self, page_source):
+        tree = SelectolaxHTMLParser(page_source)
+        tree.strip_tags(NON_TEXT_TAGS)
+        body = tree.body or tree.root
+        text = ''
+        if body is not None:
+            # Whitespace-only text nodes come back as empty lines - drop them
+            raw = body.text(separator='\n', strip=True)
+            text = '\n'.join(line for line in raw.split('\n') if line)
+
+        heading = ''
+        h1 = tree.css_first('h1')
+        if h1 is not None:
+            heading = h1.text(separator=' ', strip=True)
+        return text, heading
+
+
+PARSER_BACKENDS = {
+    'html.parser': BeautifulSoupBackend,
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+}
+
+BACKEND_AVAILABLE = {
+    'html.parser': True,
+    'lxml': lxml is not None,
+    'selectolax': SelectolaxHTMLParser is not None,
+}
+
+
+def get_parser(name=DEFAULT_PARSER):
+    """Parser backend by name; html.parser if the requested one isn't installed"""
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser '{name}' (choose from {', '.join(PARSER_BACKENDS)})")
+    if not BACKEND_AVAILABLE[name]:
+        logger.warning(f"Parser '{name}' is not installed - falling back to {DEFAULT_PARSER}")
+        name = DEFAULT_PARSER
+    return PARSER_BACKENDS[name]()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Fetch Backends
+Pluggable ways of getting profile page HTML:
+  - selenium: full driver.get (slow, always works)
+  - http: pooled keep-alive HTTP session, drops back to Selenium
+          when a response looks blocked or incomplete
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+import threading
+import time
+import logging
+
+from metrics import MetricsRegistry
+from page_checks import looks_blocked, looks_incomplete
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+FETCH_BACKENDS = ('selenium', 'http')
+
+
+class SeleniumFetcher:
+    """Loads pages with the scraper's own Chrome driver
+
+    With a PageWaiter it blocks until the profile is ready instead of
+    sleeping a fixed settle_time. With a ResourceBlocker each loaded page
+    is weighed (requests, bytes). The lock is held for the whole load, so
+    threads sharing the driver (pipeline stages) take turns with it.
+    Navigation, the wait and the page_source transfer are timed separately.
+    on_load() is called after every page load (the driver manager counts them).
+    """
+    name = 'selenium'
+
+    def __init__(self, driver, settle_time=0.8, waiter=None, blocker=None, lock=None, metrics=None, on_load=None):
+        self.driver = driver
+        self.on_load = on_load
+        self.settle_time = settle_time
+        self.waiter = waiter
+        self.blocker = blocker
+        self.lock = lock or threading.RLock()
+        self.metrics = metrics or MetricsRegistry()
+        self.pages_fetched = 0
+
+    def fetch(self, url):
+        with self.lock:
+            with self.metrics.timer('navigate'):
+                self.driver.get(url)
+            with self.metrics.timer('profile_wait'):
+                if self.waiter:
+                    self.waiter.wait_for_profile()
+                else:
+                    time.sleep(self.settle_time)
+            if self.blocker:
+                self.blocker.record_page()
+            self.pages_fetched += 1
+            self.metrics.count('browser_pages')
+            if self.on_load:
+                self.on_load()
+            with self.metrics.timer('page_source'):
+                return self.driver.page_source
+
+    def close(self):
+        pass
+
+
+class HttpFetcher:
+    """Loads pages over a pooled keep-alive HTTP session
+
+    Responses that look blocked or incomplete are handed to the
+    fallback fetcher (normally Selenium) instead. HTTP blocks are only
+    counted here - the page the caller finally gets is what it classifies
+    for its throttle. After `demote_after` blocks in a row the HTTP
+    session is dropped and every fetch goes straight to the fallback.
+    """
+    name = 'http'
+
+    def __init__(self, fallback=None, pool_size=10, timeout=15, headers=None, metrics=None, demote_after=5):
+        self.fallback = fallback
+        self.metrics = metrics or MetricsRegistry()
+        self.demote_after = demote_after
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pages_fetched = 0
+        self.fallbacks = 0
+        self.blocked = 0
+        self.block_streak = 0
+        self.demoted = False
+
+    def fetch(self, url):
+        if self.demoted:
+            return self.fallback.fetch(url)
+        try:
+            with self.metrics.timer('http_get'):
+                response = self.session.get(url, timeout=self.timeout)
+                html = response.text
+            if looks_blocked(response.status_code, html):
+                self.blocked += 1
+                self.block_streak += 1
+                self.metrics.count('http_blocked')
+                logger.warning(f"  HTTP response looks blocked ({response.status_code}): {url}")
+                if self.fallback is not None and self.block_streak >= self.demote_after:
+                    self.demoted = True
+                    logger.warning(f"HTTP fetches blocked {self.block_streak} times in a row - "
+                                   f"using {self.fallback.name} for the rest of the run")
+            elif response.status_code != 200 or looks_incomplete(html):
+                logger.warning(f"  HTTP response looks incomplete ({response.status_code}): {url}")
+            else:
+                self.block_streak = 0
+                self.pages_fetched += 1
+                self.metrics.count('http_pages')
+                return html
+        except requests.RequestException as e:
+            logger.warning(f"  HTTP fetch failed: {e}")
+
+        if self.fallback is None:
+            raise RuntimeError(f"HTTP fetch failed and no fallback configured: {url}")
+
+        self.fallbacks += 1
+        self.metrics.count('http_fallbacks')
+        return self.fallback.fetch(url)
+
+    def close(self):
+        self.session.close()
+        if self.fallbacks:
+            logger.info(f"HTTP fetcher: {self.pages_fetched} pages over HTTP, {self.blocked} blocked, "
+                        f"{self.fallbacks} fell back to {self.fallback.name}"
+                        + (" (HTTP disabled after repeated blocks)" if self.demoted else ""))
+
+
+def create_fetcher(backend, driver, settle_time=0.8, waiter=None, blocker=None, lock=None, metrics=None,
+                   on_load=None):
+    """Build the fetch backend by name"""
+    if backend not in FETCH_BACKENDS:
+        raise ValueError(f"Unknown fetch backend '{backend}' (choose from {', '.join(FETCH_BACKENDS)})")
+
+    selenium_fetcher = SeleniumFetcher(driver, settle_time=settle_time, waiter=waiter, blocker=blocker, lock=lock,
+                                       metrics=metrics, on_load=on_load)
+    if backend == 'http':
+        return HttpFetcher(fallback=selenium_fetcher, metrics=metrics)
+    return selenium_fetcher
+
+
+def rebind_driver(fetcher, driver):
+    """Point every driver-backed fetcher in a chain (cache -> HTTP -> Selenium) at a new driver"""
+    while fetcher is not None:
+        if hasattr(fetcher, 'driver'):
+            fetcher.driver = driver
+        fetcher = getattr(fetcher, 'inner', None) or getattr(fetcher, 'fallback', None)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Metrics
+Lightweight latency histograms and counters for seeing where a run actually
+spends its time, exported as a JSON run report or Prometheus text
+"""
+
+import bisect
+import contextlib
+import json
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def format_ms(seconds):
+    """Milliseconds, with decimals for sub-10ms values (parse / extract stages)"""
+    return f"{seconds*1000:.0f}ms" if seconds >= 0.01 else f"{seconds*1000:.2f}ms"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (seconds), Prometheus-style cumulative buckets"""
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot = +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        """Estimate the p-th percentile (0-100) by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = self.count * p / 100.0
+        seen = 0
+        lower = 0.0
+        for idx, bucket_count in enumerate(self.counts):
+            upper = self.buckets[idx] if idx < len(self.buckets) else self.max
+            if bucket_count and seen + bucket_count >= rank:
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            seen += bucket_count
+            lower = upper
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': self.max,
+        }
+
+    def format_summary(self):
+        s = self.summary()
+        return (f"n={s['count']} mean={format_ms(s['mean'])} p50={format_ms(s['p50'])} "
+                f"p95={format_ms(s['p95'])} max={format_ms(s['max'])}")
+
+
+# Covers both in-process stages (parse, extract: well under a millisecond to
+# a few ms) and network stages (navigation, waits: up to tens of seconds)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+NULL_TIMER = contextlib.nullcontext()
+
+
+def null_timer(stage):
+    """Stand-in for MetricsRegistry.timer when nothing is being measured"""
+    return NULL_TIMER
+
+
+class MetricsRegistry:
+    """Per-stage latency histograms and counters for one run
+
+    Safe to update from several threads (pipeline stages, tab callbacks).
+    Exported as a JSON run report and, optionally, as Prometheus text on
+    a local /metrics endpoint.
+    """
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}  # stage -> LatencyHistogram
+        self.counters = {}  # name -> count
+        self.cities = {}  # "City, ST" -> record counts and field fill rates
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        self.server = None
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        """with metrics.timer('parse'): ... - observed even if the block raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_counts(self, city, state, counts):
+        """Field fill rates for a finished city, from its RecordCounts"""
+        total = counts.total
+        self.cities[f"{city}, {state}"] = {
+            'agents': total,
+            'fill_rates': {field: round(filled / total, 4) if total else 0.0
+                           for field, filled in counts.fields.items()},
+        }
+
+    def agents_per_minute(self):
+        elapsed = time.time() - self.started_at
+        return self.counters.get('agents_scraped', 0) / (elapsed / 60) if elapsed > 0 else 0.0
+
+    def report(self, **extra):
+        """Machine-readable run summary (seconds throughout)"""
+        with self.lock:
+            stages = {stage: dict(histogram.summary(), total=histogram.total)
+                      for stage, histogram in sorted(self.histograms.items())}
+            counters = dict(sorted(self.counters.items()))
+        return dict({
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            'elapsed_seconds': round(time.time() - self.started_at, 3),
+            'agents_per_minute': round(self.agents_per_minute(), 2),
+            'counters': counters,
+            'stages': stages,
+            'cities': self.cities,
+        }, **extra)
+
+    def write_report(self, path, **extra):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(**extra), f, indent=2)
+        logger.info(f"Run report written to {path}")
+
+    def prometheus_text(self, prefix='realtor_scraper'):
+        """Prometheus text exposition format (counters, stage histograms, throughput gauge)"""
+        lines = []
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+            lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        lines.append(f"# TYPE {prefix}_agents_per_minute gauge")
+        lines.append(f"{prefix}_agents_per_minute {self.agents_per_minute():.3f}")
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        """Expose prometheus_text() at http://host:port/metrics from a daemon thread"""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"Prometheus metrics on http://{host}:{self.server.server_address[1]}/metrics")
+        return self.server
+
+    def log_summary(self, min_count=1):
+        for stage, histogram in sorted(self.histograms.items()):
+            if histogram.count >= min_count:
+                logger.info(f"  {stage:<22} {histogram.format_summary()}")
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
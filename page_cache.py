@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Page Cache
+On-disk cache of fetched pages keyed by URL (sha256 of the URL, gzip
+compressed). Entries expire after a TTL, and the directory is kept under
+a size cap by evicting the least recently used pages. Re-runs of a city,
+profiles shared between neighbouring cities and extractor changes are
+served from disk instead of the site.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import time
+import logging
+
+from page_checks import looks_blocked, looks_incomplete
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = '.page_cache'
+DEFAULT_TTL = 7 * 24 * 3600  # A week
+SEARCH_PAGE_TTL = 3600  # Result listings change; only bridges a restarted discovery walk
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class PageCache:
+    """URL -> HTML cache on disk with TTL expiry and size-bounded LRU eviction
+
+    The file mtime is when the page was fetched (TTL); the atime is set
+    explicitly on every hit, so eviction doesn't depend on mount options.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self.entries())
+
+    def path_for(self, url):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + '.html.gz')
+
+    def entries(self):
+        """(path, size, last_used) for every cached page"""
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.html.gz'):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_atime
+
+    def get(self, url, max_age=None):
+        """Cached HTML for url, or None if missing or older than the TTL (or max_age, if shorter)"""
+        path = self.path_for(url)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        ttl = self.ttl if max_age is None else min(max_age, self.ttl or max_age)
+        if ttl is not None and now - stat.st_mtime > ttl:
+            self.expired += 1
+            self.misses += 1
+            self.remove(path, stat.st_size)
+            return None
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                html = f.read()
+        except (OSError, EOFError):
+            # Torn write from a crash - treat as a miss
+            self.misses += 1
+            self.remove(path, stat.st_size)
+            return None
+
+        os.utime(path, (now, stat.st_mtime))  # Mark as recently used, keep the fetch time
+        self.hits += 1
+        return html
+
+    def put(self, url, html):
+        path = self.path_for(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+
+        # Write to a temp file and rename so readers never see a partial page
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=5) as f:
+                f.write(html.encode('utf-8'))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.total_bytes += os.path.getsize(path) - old_size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def discard(self, url):
+        """Drop url's page, e.g. once it turned out to hold nothing usable"""
+        path = self.path_for(url)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        self.remove(path, size)
+
+    def remove(self, path, size):
+        try:
+            os.remove(path)
+            self.total_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Drop least recently used pages until the cache is back under 90% of the cap"""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for _, size, _ in entries)  # Other processes may share the directory
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if self.total_bytes <= target:
+                break
+            self.remove(path, size)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size_mb': self.total_bytes / (1024 * 1024),
+        }
+
+    def log_summary(self):
+        stats = self.stats()
+        logger.info(f"Page cache: {stats['hits']} hits, {stats['misses']} misses "
+                    f"({stats['hit_rate']:.0%} hit rate), {stats['expired']} expired, "
+                    f"{stats['evictions']} evicted, {stats['size_mb']:.1f} MB on disk")
+
+
+class CachingFetcher:
+    """Wraps a fetch backend so cached pages never reach the network
+
+    Block pages and truncated pages are passed through but not stored.
+    Pages that parse to an empty record can't be told apart here, so the
+    caller discards them from the cache once it has classified them.
+    """
+
+    def __init__(self, inner, cache):
+        self.inner = inner
+        self.cache = cache
+        self.name = inner.name
+
+    def fetch(self, url):
+        html = self.cache.get(url)
+        if html is not None:
+            return html
+        html = self.inner.fetch(url)
+        if not looks_blocked(200, html) and not looks_incomplete(html):
+            self.cache.put(url, html)
+        return html
+
+    def close(self):
+        self.inner.close()
+        self.cache.log_summary()
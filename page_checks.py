@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Page Checks
+Tells usable profile responses from block pages, truncated pages and
+pages with nothing to extract. Shared by the fetch backends, the page
+cache and the adaptive throttle.
+"""
+
+# Text that only shows up on bot-check / block pages
+BLOCK_MARKERS = [
+    'captcha',
+    'access denied',
+    'are you a robot',
+    'pardon our interruption',
+    'request unsuccessful',
+    'unusual traffic',
+]
+
+OK = 'ok'
+EMPTY = 'empty'  # Page loaded but nothing could be extracted
+CHALLENGE = 'challenge'  # CAPTCHA / block page, or 403 / 429 / 503
+ERROR = 'error'  # Timeout, connection error, other bad status
+OUTCOMES = (OK, EMPTY, CHALLENGE, ERROR)
+
+EXTRACTED_FIELDS = ('name', 'phone_number', 'address', 'brokerage', 'agent_license')
+
+
+def looks_blocked(status_code, html):
+    """True if the response is a block / bot-check page"""
+    if status_code in (403, 429, 503):
+        return True
+    head = html[:20000].lower()
+    return any(marker in head for marker in BLOCK_MARKERS)
+
+
+def looks_incomplete(html):
+    """True if the HTML is missing the parts the extractors need"""
+    if len(html) < 500:
+        return True
+    lowered = html.lower()
+    return '<h1' not in lowered or '</html>' not in lowered[-2000:]
+
+
+def classify_page(html, status=200, record=None):
+    """Outcome for one profile response; pass the parsed record to catch empty pages"""
+    if status is None:
+        return ERROR
+    if looks_blocked(status, html or ''):
+        return CHALLENGE
+    if status != 200:
+        return ERROR
+    if not html or (record is not None and not any(record.get(field) for field in EXTRACTED_FIELDS)):
+        return EMPTY
+    return OK
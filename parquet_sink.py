@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Parquet Output
+Writes agents to a columnar dataset partitioned by state and city
+(<root>/state=WA/city=Seattle/part-*.parquet, hive layout), one row group
+at a time as records arrive, compressed (zstd by default) with typed
+columns. Existing per-city CSV outputs can be merged into the same
+dataset, so analytics reads one dataset instead of thousands of CSVs.
+
+Needs pyarrow (pip install pyarrow); everything else works without it.
+
+Usage:
+  python parquet_sink.py merge agents_dataset agents_*_FINAL.csv agents_*_optimized.csv
+
+Reading it back:
+  pyarrow.dataset.dataset('agents_dataset', partitioning='hive')
+"""
+
+import argparse
+import csv
+import glob
+import itertools
+import os
+import re
+import time
+import logging
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from records import RECORD_FIELDS, profile_id
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROW_GROUP_SIZE = 5000
+DEFAULT_COMPRESSION = 'zstd'
+PART_SEQUENCE = itertools.count()  # Keeps part names unique within a process
+
+# agents_<City>_<ST>_<kind>.csv, as written by both scrapers
+OUTPUT_CSV_RE = re.compile(r'^agents_(?P<city>.+)_(?P<state>[A-Za-z]{2})_(?:FINAL|optimized|progress)\.csv$')
+
+COLUMNS = ['agent_id'] + RECORD_FIELDS + ['scraped_at']
+SCHEMA = pa.schema(
+    [('agent_id', pa.string())] + [(field, pa.string()) for field in RECORD_FIELDS]
+    + [('scraped_at', pa.timestamp('s', tz='UTC'))]
+) if pa else None
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+
+
+def partition_dir(root, city, state):
+    """<root>/state=ST/city=<City> (values URI-encoded, which pyarrow decodes)"""
+    return os.path.join(root, f"state={quote(state.upper(), safe='')}", f"city={quote(city, safe='')}")
+
+
+class ParquetSink:
+    """Appends one city's records to a new part file in its partition
+
+    Rows are buffered per column and written as a row group every
+    `row_group_size` records. The part file gets its final name on close;
+    until then it ends in .inprogress, so a crash never leaves a file
+    without a footer where readers would pick it up.
+    """
+
+    def __init__(self, root, city, state, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression=DEFAULT_COMPRESSION):
+        require_pyarrow()
+        self.directory = partition_dir(root, city, state)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(PART_SEQUENCE)}.parquet")
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.columns = {column: [] for column in COLUMNS}
+        self.buffered = 0
+        self.rows = 0
+        self.row_groups = 0
+        self.writer = None
+
+    def append(self, record, scraped_at=None):
+        url = record.get('profile_url') or None
+        self.columns['agent_id'].append(profile_id(url))
+        for field in RECORD_FIELDS:
+            self.columns[field].append(record.get(field) or None)
+        self.columns['scraped_at'].append(scraped_at or datetime.now(timezone.utc))
+        self.buffered += 1
+        if self.buffered >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as one row group"""
+        if not self.buffered:
+            return
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path + '.inprogress', SCHEMA, compression=self.compression)
+        self.writer.write_table(pa.Table.from_pydict(self.columns, schema=SCHEMA), row_group_size=self.buffered)
+        self.rows += self.buffered
+        self.row_groups += 1
+        self.columns = {column: [] for column in COLUMNS}
+        self.buffered = 0
+
+    def close(self):
+        """Flush and publish the part file; returns its path (None if nothing was written)"""
+        self.flush()
+        if self.writer is None:
+            return None
+        self.writer.close()
+        self.writer = None
+        os.replace(self.path + '.inprogress', self.path)
+        logger.info(f"Parquet: {self.rows} rows in {self.row_groups} row group(s) -> {self.path}")
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def city_state_from_filename(path):
+    """('London', 'KY') from agents_London_KY_FINAL.csv, or None"""
+    match = OUTPUT_CSV_RE.match(os.path.basename(path))
+    if not match:
+        return None
+    return match.group('city').replace('_', ' '), match.group('state').upper()
+
+
+def merge_csv(csv_path, root, city=None, state=None, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Stream an existing per-city CSV into the dataset; returns the rows written
+
+    City and state come from the file name unless given. scraped_at is the
+    file's modification time.
+    """
+    if city is None or state is None:
+        parsed = city_state_from_filename(csv_path)
+        if parsed is None:
+            raise ValueError(f"Can't tell city/state from {csv_path} - pass them explicitly")
+        city, state = parsed
+    scraped_at = datetime.fromtimestamp(os.path.getmtime(csv_path), timezone.utc)
+    with open(csv_path, newline='', encoding='utf-8') as f, \
+            ParquetSink(root, city, state, row_group_size=row_group_size) as sink:
+        for row in csv.DictReader(f):
+            sink.append(row, scraped_at=scraped_at)
+    return sink.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge per-city agent CSVs into a partitioned Parquet dataset")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    merge = subparsers.add_parser('merge', help='add CSV outputs to the dataset')
+    merge.add_argument('root', help='dataset directory')
+    merge.add_argument('csv_files', nargs='+', help='agents_<City>_<ST>_*.csv files (globs allowed)')
+    merge.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    paths = [path for pattern in args.csv_files for path in sorted(glob.glob(pattern)) or [pattern]]
+    total = 0
+    for path in paths:
+        try:
+            rows = merge_csv(path, args.root, row_group_size=args.row_group_size)
+        except (OSError, ValueError) as e:
+            logger.error(f"Skipped {path}: {e}")
+            continue
+        total += rows
+        logger.info(f"Merged {rows} rows from {path}")
+    print(f"Merged {total} rows from {len(paths)} file(s) into {args.root}")
+
+
+if __name__ == "__main__":
+    main()
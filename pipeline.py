@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Streaming Pipeline
+search -> URL stream -> fetch -> parse -> sink, each stage on its own
+thread(s) with a bounded queue in between. Profiles start being fetched
+as soon as discovery emits the first URLs, and a full queue blocks the
+stage feeding it (backpressure), so no stage runs far ahead of the next.
+"""
+
+import queue
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed down the queues
+
+
+class Pipeline:
+    """Run discover(emit) -> fetch(url) -> parse(url, html) -> sink(record)
+
+    discover calls emit(url) for each profile URL it finds; emit blocks
+    while the URL buffer is full. fetch runs on `fetch_workers` threads,
+    parse on one thread, sink on the calling thread. An exception in
+    fetch or parse goes to on_error(url, error) and the URL is dropped,
+    except the types in `stop_on`: the first of those stops the run -
+    discovery ends, queued URLs are left unfetched (no on_error), pages
+    already fetched are still parsed - and run() re-raises it.
+    """
+
+    def __init__(self, discover, fetch, parse, sink, on_error=None, fetch_workers=1, buffer_size=50, stop_on=()):
+        self.discover = discover
+        self.fetch = fetch
+        self.parse = parse
+        self.sink = sink
+        self.on_error = on_error
+        self.stop_on = tuple(stop_on)
+        self.stop_error = None
+        self.fetch_workers = max(1, fetch_workers)
+        self.urls = queue.Queue(maxsize=buffer_size)
+        self.pages = queue.Queue(maxsize=max(2, self.fetch_workers * 2))
+        self.records = queue.Queue(maxsize=buffer_size)
+        self.stats = {
+            'urls': 0, 'fetched': 0, 'parsed': 0, 'records': 0, 'errors': 0,
+            'first_url_seconds': None, 'first_record_seconds': None,
+            'discovery_seconds': None, 'total_seconds': None,
+            'discovery_error': None, 'stopped': None,
+        }
+        self.lock = threading.Lock()
+        self.started = None
+
+    def elapsed(self):
+        return round(time.time() - self.started, 2)
+
+    def emit(self, url):
+        if self.stop_error is not None:
+            raise self.stop_error
+        with self.lock:
+            self.stats['urls'] += 1
+            if self.stats['first_url_seconds'] is None:
+                self.stats['first_url_seconds'] = self.elapsed()
+        self.urls.put(url)
+
+    def fail(self, url, error):
+        with self.lock:
+            self.stats['errors'] += 1
+        logger.error(f"Error scraping agent {url}: {error}")
+        if self.on_error:
+            self.on_error(url, error)
+
+    def stop(self, error):
+        with self.lock:
+            if self.stop_error is not None:
+                return
+            self.stop_error = error
+            self.stats['stopped'] = str(error)
+        logger.error(f"Pipeline stopping: {error}")
+
+    def run_discovery(self):
+        try:
+            self.discover(self.emit)
+        except self.stop_on as e:
+            self.stop(e)  # Also how emit() ends discovery once a fetch has stopped the run
+        except Exception as e:
+            self.stats['discovery_error'] = str(e)
+            logger.error(f"Discovery stopped: {e}")
+        finally:
+            self.stats['discovery_seconds'] = self.elapsed()
+            for _ in range(self.fetch_workers):
+                self.urls.put(_DONE)
+
+    def run_fetch(self, remaining):
+        while True:
+            url = self.urls.get()
+            if url is _DONE:
+                break
+            if self.stop_error is not None:
+                continue  # Drain the queue so discovery isn't left blocked on a full buffer
+            try:
+                html = self.fetch(url)
+            except self.stop_on as e:
+                self.stop(e)
+                continue
+            except Exception as e:
+                self.fail(url, e)
+                continue
+            with self.lock:
+                self.stats['fetched'] += 1
+            self.pages.put((url, html))
+        # The last fetch worker to finish closes the stream for the parser
+        with self.lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self.pages.put(_DONE)
+
+    def run_parse(self):
+        while True:
+            item = self.pages.get()
+            if item is _DONE:
+                break
+            url, html = item
+            try:
+                record = self.parse(url, html)
+            except self.stop_on as e:
+                self.stop(e)
+                continue
+            except Exception as e:
+                self.fail(url, e)
+                continue
+            self.stats['parsed'] += 1
+            self.records.put(record)
+        self.records.put(_DONE)
+
+    def run(self):
+        """Run every stage to completion; returns the stats"""
+        self.started = time.time()
+        remaining = [self.fetch_workers]
+        threads = [threading.Thread(target=self.run_discovery, name='discover', daemon=True),
+                   threading.Thread(target=self.run_parse, name='parse', daemon=True)]
+        threads += [threading.Thread(target=self.run_fetch, args=(remaining,), name=f'fetch-{i}', daemon=True)
+                    for i in range(self.fetch_workers)]
+        for thread in threads:
+            thread.start()
+
+        # Sink on this thread: the caller's writers never see another thread
+        while True:
+            record = self.records.get()
+            if record is _DONE:
+                break
+            self.sink(record)
+            self.stats['records'] += 1
+            if self.stats['first_record_seconds'] is None:
+                self.stats['first_record_seconds'] = self.elapsed()
+
+        for thread in threads:
+            thread.join()
+        self.stats['total_seconds'] = self.elapsed()
+        if self.stop_error is not None:
+            raise self.stop_error
+        return self.stats
+
+    def log_summary(self):
+        stats = self.stats
+        logger.info(f"Pipeline: {stats['urls']} URLs, {stats['records']} records, {stats['errors']} errors; "
+                    f"first record after {stats['first_record_seconds']}s, discovery done at "
+                    f"{stats['discovery_seconds']}s, total {stats['total_seconds']}s")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Compact Records
+A slotted agent record, running summary counters and a streaming CSV sink,
+so a run never has to keep every scraped agent in memory to write its
+output or print its summary.
+"""
+
+import csv
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+RECORD_FIELDS = ['name', 'phone_number', 'address', 'brokerage', 'agent_license', 'profile_url']
+COUNTED_FIELDS = ['phone_number', 'address', 'brokerage', 'agent_license']
+
+# The 24-hex profile ID in /realestateagents/<id> - the same agent in every city's results
+PROFILE_ID_RE = re.compile(r'/realestateagents/(5[0-9a-f]{23})(?![0-9a-f])', re.IGNORECASE)
+
+
+def profile_id(profile_url):
+    """Profile ID from a profile URL (lowercase), or None"""
+    match = PROFILE_ID_RE.search(profile_url or '')
+    return match.group(1).lower() if match else None
+
+
+class AgentRecord:
+    """One agent, without a per-instance __dict__
+
+    Reads like the dict records it replaces (record['name'], record.get(),
+    dict(record)), so it can be handed to code that expects those.
+    """
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, name='', phone_number='', address='', brokerage='', agent_license='', profile_url=''):
+        self.name = name
+        self.phone_number = phone_number
+        self.address = address
+        self.brokerage = brokerage
+        self.agent_license = agent_license
+        self.profile_url = profile_url
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(**{field: record.get(field) or '' for field in RECORD_FIELDS})
+
+    def keys(self):
+        return RECORD_FIELDS
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in RECORD_FIELDS}
+
+    def __repr__(self):
+        return f"AgentRecord({self.as_dict()!r})"
+
+
+class RecordCounts:
+    """Running totals for the end-of-run summary, plus the first few records for a preview"""
+
+    def __init__(self, preview_size=5):
+        self.total = 0
+        self.fields = dict.fromkeys(COUNTED_FIELDS, 0)
+        self.preview_size = preview_size
+        self.preview = []
+
+    def add(self, record):
+        self.total += 1
+        for field in COUNTED_FIELDS:
+            if record.get(field):
+                self.fields[field] += 1
+        if len(self.preview) < self.preview_size:
+            self.preview.append(AgentRecord.from_dict(record))
+
+    def as_dict(self):
+        return dict(self.fields, total=self.total)
+
+    def __len__(self):
+        return self.total
+
+
+class CsvSink:
+    """Writes records to a CSV as they arrive, flushed every `flush_every` rows"""
+
+    def __init__(self, path, columns, flush_every=50):
+        self.path = path
+        self.columns = columns
+        self.flush_every = flush_every
+        self.counts = RecordCounts()
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def append(self, record):
+        self.writer.writerow({column: record.get(column) or '' for column in self.columns})
+        self.counts.add(record)
+        if self.counts.total % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def discard_if_empty(self):
+        """Close and delete the file if nothing was written; returns True if it was deleted"""
+        self.close()
+        if self.counts.total:
+            return False
+        os.remove(self.path)
+        return True
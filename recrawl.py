@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Incremental Recrawl Diffs
+Compares the records from a refresh run with the previous version of each
+agent in the progress log and writes only what moved: added, removed and
+changed agents, with the fields that changed.
+"""
+
+import csv
+
+from checkpoint import iter_records
+from records import RECORD_FIELDS, AgentRecord
+
+COMPARED_FIELDS = [field for field in RECORD_FIELDS if field != 'profile_url']
+CHANGE_COLUMNS = ['change', 'changed_fields'] + RECORD_FIELDS
+
+
+def latest_records(log_path, urls):
+    """Newest record in the log for each of the given profile URLs (as compact AgentRecords)"""
+    urls = set(urls)
+    latest = {}
+    if not urls:
+        return latest
+    for record in iter_records(log_path):
+        if record.get('profile_url') in urls:
+            latest[record['profile_url']] = AgentRecord.from_dict(record)
+    return latest
+
+
+def diff_records(previous, current, removed=()):
+    """Change rows for a refresh run, generated one at a time
+
+    previous: {profile_url: record} as it was before the run
+    current:  records scraped in the run (any iterable, e.g. streamed from the log)
+    removed:  records for agents no longer in the search results
+    """
+    for record in current:
+        old = previous.get(record['profile_url'])
+        if old is None:
+            yield dict(record, change='added', changed_fields='')
+            continue
+        changed_fields = [field for field in COMPARED_FIELDS if (old.get(field) or '') != (record.get(field) or '')]
+        if changed_fields:
+            yield dict(record, change='changed', changed_fields=';'.join(changed_fields))
+    for record in removed:
+        yield dict(record, change='removed', changed_fields='')
+
+
+def write_changes_csv(csv_path, changes):
+    """Write change rows; returns counts per change type"""
+    counts = {'added': 0, 'changed': 0, 'removed': 0}
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CHANGE_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for change in changes:
+            writer.writerow({column: change.get(column, '') for column in CHANGE_COLUMNS})
+            counts[change['change']] += 1
+    return counts
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Network Resource Blocking
+Blocks third-party and non-essential requests at the network layer with
+CDP Network.setBlockedURLs, and measures what each page still loads
+(requests, bytes) against a calibration baseline taken with blocking off,
+so the saving is measured rather than guessed.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# URL patterns (Network.setBlockedURLs wildcards) per preset
+ADS_AND_ANALYTICS = [
+    '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.*',
+    '*google-analytics.com*', '*googletagmanager.com*', '*googletagservices.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*analytics.tiktok.com*', '*bat.bing.com*',
+    '*hotjar.com*', '*segment.io*', '*segment.com*', '*newrelic.com*', '*nr-data.net*',
+    '*optimizely.com*', '*quantserve.com*', '*scorecardresearch.com*', '*criteo.*',
+    '*taboola.com*', '*outbrain.com*', '*amazon-adsystem.com*', '*adsrvr.org*',
+    '*demdex.net*', '*omtrdc.net*', '*everesttech.net*', '*branch.io*', '*mpulse*', '*akstat.io*',
+]
+FONTS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com*', '*fonts.gstatic.com*', '*use.typekit.net*']
+MEDIA = ['*.mp4', '*.webm', '*.m3u8', '*youtube.com/embed*', '*ytimg.com*', '*vimeo.com*']
+MAPS = ['*maps.googleapis.com*', '*maps.gstatic.com*', '*api.mapbox.com*', '*tiles.mapbox.com*']
+IMAGES = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.avif', '*.ico']
+STYLESHEETS = ['*.css']
+
+BLOCK_PRESETS = {
+    'none': [],
+    'minimal': ADS_AND_ANALYTICS,
+    'aggressive': ADS_AND_ANALYTICS + FONTS + MEDIA + MAPS + IMAGES + STYLESHEETS,
+}
+
+# Resource Timing sizes: transferSize is 0 for cache hits and for cross-origin
+# resources without Timing-Allow-Origin, so encodedBodySize is the fallback
+PAGE_WEIGHT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || nav.encodedBodySize || 0) : 0;
+for (const entry of resources) bytes += entry.transferSize || entry.encodedBodySize || 0;
+return [resources.length + 1, bytes];
+"""
+
+# The default Resource Timing buffer holds 250 entries; heavy pages overflow it
+TIMING_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(5000);"
+
+
+class ResourceBlocker:
+    """Applies a blocklist preset to a driver and tracks page weight against a baseline
+
+    The first `calibration_pages` pages load unblocked to measure the baseline;
+    blocking is switched on after that.
+    """
+
+    def __init__(self, driver, preset='minimal', calibration_pages=3, extra_patterns=None):
+        if preset not in BLOCK_PRESETS:
+            raise ValueError(f"Unknown block preset '{preset}' (choose from {', '.join(BLOCK_PRESETS)})")
+        self.driver = driver
+        self.preset = preset
+        self.patterns = BLOCK_PRESETS[preset] + list(extra_patterns or [])
+        self.calibration_pages = calibration_pages if self.patterns else 0
+        self.baseline = []  # (requests, bytes) per unblocked page
+        self.blocked = []   # (requests, bytes) per blocked page
+        self.active = False  # Calibration is over; tabs get the blocklist
+        self.tabs = {}  # Window handle -> whether that tab has the blocklist
+
+    def start(self):
+        """Enable the Network domain on the current tab; blocking starts after calibration"""
+        self.apply_to_current_tab()
+        if self.patterns:
+            logger.info(f"Resource blocking: '{self.preset}' preset, {len(self.patterns)} patterns"
+                        + (f" (after {self.calibration_pages} baseline page(s))" if self.calibration_pages else ""))
+
+    def apply_to_current_tab(self):
+        """Blocking is per tab - call before loading a page in a tab; a no-op once the tab is up to date"""
+        handle = self.driver.current_window_handle
+        self.active = len(self.baseline) >= self.calibration_pages
+        if self.tabs.get(handle) == self.active:
+            return
+        if handle not in self.tabs:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': TIMING_BUFFER_SCRIPT})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns if self.active else []})
+        self.tabs[handle] = self.active
+
+    def record_page(self):
+        """Measure the page that just loaded in the current tab; ends calibration once enough baseline pages are in"""
+        try:
+            requests, size = self.driver.execute_script(PAGE_WEIGHT_SCRIPT)
+            handle = self.driver.current_window_handle
+        except Exception as e:
+            logger.debug(f"Could not measure page weight: {e}")
+            return
+        if self.tabs.get(handle, self.active) or not self.patterns:
+            self.blocked.append((requests, size))
+            return
+        self.baseline.append((requests, size))
+        if len(self.baseline) >= self.calibration_pages:
+            self.apply_to_current_tab()
+
+    def summary(self):
+        def average(pages, index):
+            return sum(page[index] for page in pages) / len(pages) if pages else 0.0
+
+        stats = {
+            'preset': self.preset,
+            'baseline_pages': len(self.baseline),
+            'blocked_pages': len(self.blocked),
+            'requests_per_page': average(self.blocked, 0),
+            'kb_per_page': average(self.blocked, 1) / 1024,
+            'baseline_requests_per_page': average(self.baseline, 0),
+            'baseline_kb_per_page': average(self.baseline, 1) / 1024,
+        }
+        stats['requests_saved_per_page'] = (stats['baseline_requests_per_page'] - stats['requests_per_page']
+                                            if self.baseline else 0.0)
+        stats['kb_saved_per_page'] = stats['baseline_kb_per_page'] - stats['kb_per_page'] if self.baseline else 0.0
+        return stats
+
+    def log_summary(self):
+        stats = self.summary()
+        if not stats['blocked_pages']:
+            return
+        message = (f"Resource blocking ('{stats['preset']}'): {stats['requests_per_page']:.0f} requests, "
+                   f"{stats['kb_per_page']:.0f} KB per page over {stats['blocked_pages']} pages")
+        if stats['baseline_pages']:
+            message += (f" - saved {stats['requests_saved_per_page']:.0f} requests and "
+                        f"{stats['kb_saved_per_page']:.0f} KB per page vs {stats['baseline_pages']} unblocked page(s)")
+        logger.info(message)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Direct Search Page Discovery
+Builds the result-page URLs directly (/realestateagents/<city>_<state>/pg-N)
+instead of clicking "Next" through them. Page 1 gives the total page count;
+the rest are fetched in concurrent batches, stopping early once a page
+turns up no profile URLs that weren't already found.
+"""
+
+import re
+import logging
+from urllib.parse import urljoin
+
+logger = logging.getLogger(__name__)
+
+SITE_URL = "https://www.realtor.com"  # Scrapers take base_url to point at a stand-in (benchmarks/fixture_server.py)
+SEARCH_BASE_URL = f"{SITE_URL}/realestateagents"
+MAX_PAGES = 50  # realtor.com caps at ~42 pages
+
+PROFILE_HREF_RE = re.compile(r'href="([^"]*/realestateagents/5[0-9a-f]{23})(?=["/?#])', re.IGNORECASE)
+PAGE_NUMBER_RE = re.compile(r'href="[^"]*/pg-(\d+)')
+
+
+def city_slug(city, state):
+    """'New York', 'NY' -> 'new-york_ny'"""
+    return f"{'-'.join(city.lower().split())}_{state.lower()}"
+
+
+def search_page_url(city, state, page, base_url=SEARCH_BASE_URL):
+    url = f"{base_url}/{city_slug(city, state)}"
+    return url if page == 1 else f"{url}/pg-{page}"
+
+
+def profile_urls(html, page_url):
+    """Absolute agent profile URLs linked from a results page"""
+    return {urljoin(page_url, match.group(1)) for match in PROFILE_HREF_RE.finditer(html)}
+
+
+def page_count(html):
+    """Highest page number linked from the pagination bar (1 if there is none)"""
+    numbers = [int(n) for n in PAGE_NUMBER_RE.findall(html)]
+    return max(numbers, default=1)
+
+
+def discover_profile_urls(city, state, fetch_pages, batch_size=8, max_pages=MAX_PAGES,
+                          base_url=SEARCH_BASE_URL, on_page=None):
+    """Collect profile URLs from every results page of a city
+
+    fetch_pages(urls) -> {url: html} fetches a batch (concurrently); missing
+    or None entries count as failed pages. on_page(page_num, new_urls) runs
+    as each page is processed, in page order.
+
+    Returns (urls, pages_read), or (None, 0) when page 1 has no profile
+    links at all (a layout the direct walk doesn't understand).
+    """
+    first_url = search_page_url(city, state, 1, base_url)
+    first_html = fetch_pages([first_url]).get(first_url)
+    if not first_html:
+        return None, 0
+    all_urls = profile_urls(first_html, first_url)
+    if not all_urls:
+        return None, 0
+    if on_page:
+        on_page(1, all_urls)
+
+    total_pages = min(page_count(first_html), max_pages)
+    logger.info(f"Page 1: {len(all_urls)} URLs, {total_pages} page(s) in total")
+
+    pages_read = 1
+    page_num = 2
+    while page_num <= total_pages:
+        batch = list(range(page_num, min(page_num + batch_size, total_pages + 1)))
+        urls = {n: search_page_url(city, state, n, base_url) for n in batch}
+        pages = fetch_pages(list(urls.values()))
+
+        # Pages are processed in order, so the early stop doesn't depend on fetch order
+        for n in batch:
+            html = pages.get(urls[n])
+            if not html:
+                logger.warning(f"Page {n} could not be fetched")
+                continue
+            new_urls = profile_urls(html, urls[n]) - all_urls
+            pages_read += 1
+            logger.info(f"✓ Collected {len(new_urls)} new URLs from page {n} (Total: {len(all_urls) + len(new_urls)})")
+            if not new_urls:
+                logger.info(f"Page {n} had no new profiles - stopping")
+                return all_urls, pages_read
+            all_urls |= new_urls
+            if on_page:
+                on_page(n, new_urls)
+        page_num = batch[-1] + 1
+
+    return all_urls, pages_read
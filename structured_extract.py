@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Structured Extraction
+Reads agent fields straight out of the page's embedded JSON state
+(Next.js __NEXT_DATA__ blob, JSON-LD) without flattening the DOM to text.
+Returns only the fields it found; callers fall back to the text/regex
+extractors for anything missing.
+"""
+
+import json
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+JSON_LD_RE = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+
+# Keys that mark a JSON object as "the agent" rather than some other named thing
+AGENT_MARKER_KEYS = ('phones', 'phone', 'telephone', 'office', 'broker', 'brokerage',
+                     'agent_license', 'licenses', 'license', 'worksFor')
+JSON_LD_AGENT_TYPES = ('RealEstateAgent', 'Person', 'LocalBusiness')
+PHONE_TYPE_PRIORITY = ('mobile', 'office')
+
+
+def embedded_json_blobs(html):
+    """Yield every parseable __NEXT_DATA__ / JSON-LD blob on the page"""
+    for pattern in (NEXT_DATA_RE, JSON_LD_RE):
+        for match in pattern.finditer(html):
+            try:
+                yield json.loads(match.group(1))
+            except ValueError:
+                continue
+
+
+def find_agent_object(data):
+    """Depth-first search for the first object that looks like an agent record"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node_type = node.get('@type')
+            if node_type in JSON_LD_AGENT_TYPES and node.get('name'):
+                return node
+            has_name = node.get('full_name') or isinstance(node.get('name'), str)
+            if has_name and any(key in node for key in AGENT_MARKER_KEYS):
+                return node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def format_phone(raw):
+    """Normalise to the (xxx) xxx-xxxx format the text extractor produces"""
+    digits = re.sub(r'\D', '', str(raw))
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    if len(digits) != 10:
+        return ''
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def pick_phone(agent):
+    phones = agent.get('phones')
+    if isinstance(phones, list) and phones:
+        def rank(phone):
+            phone_type = str(phone.get('type', '')).lower() if isinstance(phone, dict) else ''
+            return PHONE_TYPE_PRIORITY.index(phone_type) if phone_type in PHONE_TYPE_PRIORITY else len(PHONE_TYPE_PRIORITY)
+        for phone in sorted(phones, key=rank):
+            number = phone.get('number') if isinstance(phone, dict) else phone
+            formatted = format_phone(number or '')
+            if formatted:
+                return formatted
+    for key in ('telephone', 'phone'):
+        if agent.get(key):
+            return format_phone(agent[key])
+    return ''
+
+
+def format_address(address):
+    if isinstance(address, str):
+        return re.sub(r'\s+', ' ', address).strip()
+    if not isinstance(address, dict):
+        return ''
+    street = address.get('line') or address.get('streetAddress') or address.get('street') or ''
+    city = address.get('city') or address.get('addressLocality') or ''
+    state = address.get('state_code') or address.get('addressRegion') or address.get('state') or ''
+    postal = address.get('postal_code') or address.get('postalCode') or address.get('zip') or ''
+    locality = f"{city}, {state}".strip(', ')
+    return ' '.join(part for part in (street, locality, postal) if part).strip()
+
+
+def pick_address(agent):
+    if agent.get('address'):
+        return format_address(agent['address'])
+    office = agent.get('office')
+    if isinstance(office, dict) and office.get('address'):
+        return format_address(office['address'])
+    return ''
+
+
+def pick_brokerage(agent):
+    for key in ('broker', 'brokerage', 'worksFor', 'parentOrganization', 'office'):
+        value = agent.get(key)
+        if isinstance(value, dict) and value.get('name'):
+            return str(value['name']).strip()
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ''
+
+
+def pick_license(agent):
+    for key in ('agent_license', 'licenses', 'license'):
+        value = agent.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('license_number') or value.get('number')
+        if value:
+            return str(value).strip()
+    return ''
+
+
+def extract_structured_fields(html):
+    """Agent fields from embedded JSON; only non-empty fields are returned"""
+    for blob in embedded_json_blobs(html):
+        agent = find_agent_object(blob)
+        if agent is None:
+            continue
+
+        name = agent.get('full_name') or agent.get('name') or ''
+        if not isinstance(name, str):
+            name = ''
+        if not name and (agent.get('first_name') or agent.get('last_name')):
+            name = f"{agent.get('first_name', '')} {agent.get('last_name', '')}"
+
+        fields = {
+            'name': name.strip(),
+            'phone_number': pick_phone(agent),
+            'address': pick_address(agent),
+            'brokerage': pick_brokerage(agent),
+            'agent_license': pick_license(agent),
+        }
+        return {key: value for key, value in fields.items() if value}
+    return {}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Multi-Tab Concurrency
+Overlaps profile loads across K tabs of ONE Chrome instance. Each tab is
+handed a URL, and the pool polls the tabs, extracting from whichever
+finishes loading first and giving it the next URL.
+
+Needs a driver created with page_load_strategy 'none', otherwise
+chromedriver blocks on every navigation and the tabs load one by one.
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One round-trip per poll: has the new document replaced the old one, and is it loaded?
+TAB_STATE_SCRIPT = "return [performance.timeOrigin, document.readyState, !!document.querySelector('h1')];"
+
+
+class TabPool:
+    """K tabs in one driver, each loading a different profile"""
+
+    def __init__(self, driver, tabs=4, page_timeout=20, poll_interval=0.1, before_load=None, after_load=None):
+        self.driver = driver
+        self.tabs = tabs
+        self.page_timeout = page_timeout
+        self.poll_interval = poll_interval
+        self.before_load = before_load  # Runs before each navigation with the tab current (blocking, pacing)
+        self.after_load = after_load  # Per-page measurement (e.g. page weight), run with the finished tab current
+        self.handles = []
+
+    def open_tabs(self):
+        self.handles = [self.driver.current_window_handle]
+        while len(self.handles) < self.tabs:
+            self.driver.switch_to.new_window('tab')
+            self.handles.append(self.driver.current_window_handle)
+        logger.info(f"Opened {len(self.handles)} tabs")
+
+    def close_tabs(self):
+        """Close the extra tabs and return to the original one"""
+        for handle in self.handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        if self.handles:
+            self.driver.switch_to.window(self.handles[0])
+        self.handles = []
+
+    def start_load(self, handle, url):
+        """Kick off navigation without waiting; returns the old document's time origin"""
+        self.driver.switch_to.window(handle)
+        if self.before_load:
+            self.before_load()
+        old_origin = self.driver.execute_script("return performance.timeOrigin;")
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        return old_origin
+
+    def scrape(self, urls, on_page, on_error=None):
+        """Load urls across the tabs; on_page(url, html) runs as each tab finishes
+
+        An exception from before_load (e.g. SiteBlocked from the throttle)
+        ends the run; the extra tabs are closed on the way out.
+        """
+        pending = list(urls)
+        pending.reverse()  # pop() from the end keeps the original order
+        in_flight = {}  # handle -> (url, old_origin, started_at)
+
+        self.open_tabs()
+        try:
+            while pending or in_flight:
+                # Give every idle tab a URL
+                for handle in self.handles:
+                    if handle not in in_flight and pending:
+                        url = pending.pop()
+                        in_flight[handle] = (url, self.start_load(handle, url), time.time())
+
+                # Poll the busy tabs, extract from the finished ones
+                finished_any = False
+                for handle, (url, old_origin, started_at) in list(in_flight.items()):
+                    self.driver.switch_to.window(handle)
+                    try:
+                        origin, ready_state, has_h1 = self.driver.execute_script(TAB_STATE_SCRIPT)
+                    except Exception:
+                        origin, ready_state, has_h1 = old_origin, 'loading', False
+
+                    navigated = origin != old_origin
+                    if navigated and (ready_state == 'complete' or (ready_state == 'interactive' and has_h1)):
+                        del in_flight[handle]
+                        finished_any = True
+                        if self.after_load:
+                            self.after_load()
+                        on_page(url, self.driver.page_source)
+                    elif time.time() - started_at > self.page_timeout:
+                        del in_flight[handle]
+                        logger.warning(f"  Tab timed out after {self.page_timeout}s: {url}")
+                        if on_error:
+                            on_error(url, 'timeout')
+
+                if not finished_any:
+                    time.sleep(self.poll_interval)
+        finally:
+            self.close_tabs()
@@ -0,0 +1,89 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointLog, export_csv, iter_records  # noqa: E402
+
+
+def agent(n):
+    return {'name': f"Agent {n}", 'phone_number': f"(206) 555-000{n}", 'address': '', 'brokerage': '',
+            'agent_license': '', 'profile_url': f"https://www.realtor.com/realestateagents/{n}"}
+
+
+class TornLineTest(unittest.TestCase):
+    """A crash mid-write leaves a partial last line; resume and export must survive it"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'agents_progress.jsonl')
+        self.csv_path = os.path.join(self.directory.name, 'agents_FINAL.csv')
+        with CheckpointLog(self.log_path) as log:
+            log.append(agent(1))
+            log.append(agent(2))
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write('{"name": "Agent 3", "phone_nu')  # Torn write
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resume_after_torn_line_keeps_next_record(self):
+        with CheckpointLog(self.log_path) as log:
+            log.append(agent(4))
+        names = [record['name'] for record in iter_records(self.log_path)]
+        self.assertEqual(names, ['Agent 1', 'Agent 2', 'Agent 4'])
+
+    def test_export_skips_torn_line(self):
+        counts = export_csv(self.log_path, self.csv_path)
+        with open(self.csv_path, newline='', encoding='utf-8') as f:
+            names = [row['name'] for row in csv.DictReader(f)]
+        self.assertEqual(names, ['Agent 1', 'Agent 2'])
+        self.assertEqual(counts.total, 2)
+
+    def test_export_after_resume_keeps_offsets_right(self):
+        with CheckpointLog(self.log_path) as log:
+            log.append(dict(agent(1), phone_number='(206) 555-9999'))  # Re-scrape replaces the first record
+        export_csv(self.log_path, self.csv_path)
+        with open(self.csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['name'] for row in rows], ['Agent 2', 'Agent 1'])
+        self.assertEqual(rows[1]['phone_number'], '(206) 555-9999')
+
+
+class MissingNewlineTest(unittest.TestCase):
+    """A crash between a complete record and its newline must not lose the record"""
+
+    def test_complete_last_record_is_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, 'log.jsonl')
+            with CheckpointLog(log_path) as log:
+                log.append(agent(1))
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(agent(2)))  # No trailing newline
+            with CheckpointLog(log_path) as log:
+                log.append(agent(3))
+            names = [record['name'] for record in iter_records(log_path)]
+            self.assertEqual(names, ['Agent 1', 'Agent 2', 'Agent 3'])
+
+
+class CorruptMiddleLineTest(unittest.TestCase):
+    def test_bad_line_mid_log_does_not_shift_offsets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, 'log.jsonl')
+            csv_path = os.path.join(directory, 'out.csv')
+            with CheckpointLog(log_path) as log:
+                log.append(agent(1))
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write('not json at all\n')
+            with CheckpointLog(log_path) as log:
+                log.append(agent(2))
+            counts = export_csv(log_path, csv_path)
+            self.assertEqual(counts.total, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl_frontier import DONE, FAILED, IN_FLIGHT, PENDING, REMOVED, CrawlFrontier  # noqa: E402
+
+CITY, STATE = 'London', 'KY'
+
+
+def profile(n):
+    return f"https://www.realtor.com/realestateagents/5{n:023x}"
+
+
+class FrontierTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'crawl_state.db')
+        self.frontier = CrawlFrontier(self.path)
+
+    def tearDown(self):
+        self.frontier.close()
+        self.directory.cleanup()
+
+
+class StatusTransitionTest(FrontierTest):
+    """URLs move pending -> in_flight -> done / failed, and survive a restart"""
+
+    def test_new_urls_start_pending(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1), profile(2)])
+        self.assertEqual(sorted(self.frontier.urls(CITY, STATE, [PENDING])), [profile(1), profile(2)])
+        self.assertEqual(self.frontier.counts(CITY, STATE)[PENDING], 2)
+
+    def test_rediscovery_keeps_status(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1)])
+        self.frontier.set_status(CITY, STATE, profile(1), DONE)
+        self.frontier.add_urls(CITY, STATE, [profile(1)])
+        self.assertEqual(self.frontier.urls(CITY, STATE, [DONE]), [profile(1)])
+
+    def test_finishing_counts_an_attempt(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1)])
+        self.frontier.set_status(CITY, STATE, profile(1), IN_FLIGHT)
+        self.frontier.set_status(CITY, STATE, profile(1), FAILED, error='timeout')
+        self.frontier.set_status(CITY, STATE, profile(1), IN_FLIGHT)
+        self.frontier.set_status(CITY, STATE, profile(1), FAILED)
+        self.assertEqual(self.frontier.failed(CITY, STATE), [(profile(1), 2, 'timeout')])  # Error kept
+        self.assertEqual(self.frontier.failed(CITY, STATE, max_attempts=2), [])
+
+    def test_in_flight_goes_back_to_pending_after_a_crash(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1), profile(2)])
+        self.frontier.set_status(CITY, STATE, profile(1), IN_FLIGHT)
+        self.frontier.set_status(CITY, STATE, profile(2), DONE)
+        self.frontier.close()
+
+        self.frontier = CrawlFrontier(self.path)
+        self.assertEqual(self.frontier.reset_in_flight(CITY, STATE), 1)
+        counts = self.frontier.counts(CITY, STATE)
+        self.assertEqual((counts[PENDING], counts[IN_FLIGHT], counts[DONE]), (1, 0, 1))
+
+    def test_cities_are_kept_apart(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1)])
+        self.frontier.add_urls('Corbin', STATE, [profile(2)])
+        self.assertEqual(self.frontier.urls(CITY, STATE), [profile(1)])
+
+
+class RemovedTest(FrontierTest):
+
+    def test_unseen_urls_are_marked_removed_and_come_back(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1), profile(2)])
+        since = time.time() + 1
+        self.assertEqual(self.frontier.unseen_urls(CITY, STATE, since), {profile(1), profile(2)})
+
+        self.frontier.mark_removed(CITY, STATE, [profile(2)])
+        self.assertEqual(self.frontier.urls(CITY, STATE), [profile(1)])
+        self.assertEqual(self.frontier.urls(CITY, STATE, [REMOVED]), [profile(2)])
+        self.assertEqual(self.frontier.unseen_urls(CITY, STATE, since), {profile(1)})
+
+        self.frontier.add_urls(CITY, STATE, [profile(2)])  # Back in the results
+        self.assertEqual(sorted(self.frontier.urls(CITY, STATE, [PENDING])), [profile(1), profile(2)])
+
+    def test_stale_urls_are_done_and_old(self):
+        self.frontier.add_urls(CITY, STATE, [profile(1), profile(2)])
+        self.frontier.set_status(CITY, STATE, profile(1), DONE)
+        self.assertEqual(self.frontier.stale_urls(CITY, STATE, max_age=3600), set())
+        self.assertEqual(self.frontier.stale_urls(CITY, STATE, max_age=-1), {profile(1)})
+
+
+class DiscoveryTest(FrontierTest):
+
+    def test_discovery_is_recorded_and_forgotten(self):
+        self.assertIsNone(self.frontier.discovery(CITY, STATE))
+        self.frontier.add_urls(CITY, STATE, [profile(1), profile(2), profile(3)])
+        self.frontier.mark_removed(CITY, STATE, [profile(3)])
+        self.frontier.mark_discovery_complete(CITY, STATE, pages=2, started_at=123.0)
+
+        discovery = self.frontier.discovery(CITY, STATE)
+        self.assertEqual((discovery['pages'], discovery['url_count'], discovery['started_at']), (2, 2, 123.0))
+
+        self.frontier.forget_discovery(CITY, STATE)
+        self.assertIsNone(self.frontier.discovery(CITY, STATE))
+
+
+class AgentIndexTest(FrontierTest):
+
+    def test_known_agent_is_linked_to_each_city(self):
+        record = {'name': 'Agent 1', 'profile_url': profile(1)}
+        self.frontier.remember_agent('a1', record, CITY, STATE)
+        self.frontier.link_agent('a1', 'Corbin', STATE)
+        self.assertEqual(self.frontier.known_agent('a1'), (record, CITY, STATE))
+        self.assertEqual(self.frontier.agents_indexed('Corbin', STATE), 1)
+        self.assertIsNone(self.frontier.known_agent('a2'))
+
+    def test_known_agent_respects_max_age(self):
+        self.frontier.backfill_agents([('a1', {'name': 'Agent 1'})], CITY, STATE, scraped_at=time.time() - 7200)
+        self.assertIsNone(self.frontier.known_agent('a1', max_age=3600))
+        self.assertIsNotNone(self.frontier.known_agent('a1', max_age=86400))
+
+    def test_backfill_does_not_overwrite_a_newer_scrape(self):
+        self.frontier.remember_agent('a1', {'name': 'Fresh'}, CITY, STATE)
+        self.frontier.backfill_agents([('a1', {'name': 'Old'})], CITY, STATE, scraped_at=time.time() - 60)
+        self.assertEqual(self.frontier.known_agent('a1')[0], {'name': 'Fresh'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_cache import CachingFetcher, PageCache  # noqa: E402
+
+
+def page(n, size=4000):
+    """A complete-looking page that doesn't compress away (so sizes on disk are comparable)"""
+    body = os.urandom(size).hex()
+    return f"<html><body><h1>Agent {n}</h1><p>{body}</p></body></html>"
+
+
+def url(n):
+    return f"https://www.realtor.com/realestateagents/{n}"
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = PageCache(self.directory.name, ttl=3600)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def age(self, n, seconds):
+        """Backdate url(n)'s fetch time (mtime) and last use (atime)"""
+        path = self.cache.path_for(url(n))
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+
+class ExpiryTest(CacheTest):
+
+    def test_fresh_page_is_a_hit(self):
+        html = page(1)
+        self.cache.put(url(1), html)
+        self.assertEqual(self.cache.get(url(1)), html)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_page_older_than_ttl_expires_and_is_removed(self):
+        self.cache.put(url(1), page(1))
+        self.age(1, 7200)
+        self.assertIsNone(self.cache.get(url(1)))
+        self.assertEqual((self.cache.expired, self.cache.misses), (1, 1))
+        self.assertFalse(os.path.exists(self.cache.path_for(url(1))))
+        self.assertEqual(self.cache.total_bytes, 0)
+
+    def test_max_age_shortens_the_ttl(self):
+        self.cache.put(url(1), page(1))
+        self.age(1, 600)
+        self.assertIsNone(self.cache.get(url(1), max_age=300))
+
+    def test_max_age_cannot_extend_the_ttl(self):
+        self.cache.put(url(1), page(1))
+        self.age(1, 7200)
+        self.assertIsNone(self.cache.get(url(1), max_age=86400))
+
+    def test_torn_entry_is_a_miss(self):
+        self.cache.put(url(1), page(1))
+        with open(self.cache.path_for(url(1)), 'r+b') as f:
+            f.truncate(20)
+        self.assertIsNone(self.cache.get(url(1)))
+        self.assertFalse(os.path.exists(self.cache.path_for(url(1))))
+
+    def test_discard_drops_the_page(self):
+        self.cache.put(url(1), page(1))
+        self.cache.discard(url(1))
+        self.cache.discard(url(2))  # Not cached - nothing to do
+        self.assertIsNone(self.cache.get(url(1)))
+        self.assertEqual(self.cache.total_bytes, 0)
+
+
+class EvictionTest(CacheTest):
+
+    def test_least_recently_used_pages_are_evicted_first(self):
+        for n in range(1, 4):
+            self.cache.put(url(n), page(n))
+        self.age(1, 300)
+        self.age(2, 200)
+        self.age(3, 100)
+        self.assertIsNotNone(self.cache.get(url(1)))  # Oldest fetch, but used just now
+
+        self.cache.max_bytes = self.cache.total_bytes + 1000
+        self.cache.put(url(4), page(4))
+
+        kept = {n for n in range(1, 5) if os.path.exists(self.cache.path_for(url(n)))}
+        self.assertEqual(kept, {1, 4})
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertLessEqual(self.cache.total_bytes, self.cache.max_bytes * 0.9)
+
+    def test_size_is_recounted_on_open(self):
+        for n in range(1, 3):
+            self.cache.put(url(n), page(n))
+        reopened = PageCache(self.directory.name)
+        self.assertEqual(reopened.total_bytes, self.cache.total_bytes)
+
+
+class FakeFetcher:
+    name = 'fake'
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = 0
+
+    def fetch(self, url):
+        self.calls += 1
+        return self.pages[url]
+
+
+class CachingFetcherTest(CacheTest):
+
+    def test_second_fetch_is_served_from_disk(self):
+        inner = FakeFetcher({url(1): page(1)})
+        fetcher = CachingFetcher(inner, self.cache)
+        self.assertEqual(fetcher.fetch(url(1)), fetcher.fetch(url(1)))
+        self.assertEqual(inner.calls, 1)
+
+    def test_block_and_truncated_pages_are_not_stored(self):
+        blocked = "<html><body><h1>Pardon Our Interruption</h1>" + 'x' * 600 + "</body></html>"
+        inner = FakeFetcher({url(1): blocked, url(2): "<html><h1>Agent"})
+        fetcher = CachingFetcher(inner, self.cache)
+        for n in (1, 2, 1, 2):
+            fetcher.fetch(url(n))
+        self.assertEqual(inner.calls, 4)
+        self.assertEqual(self.cache.total_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
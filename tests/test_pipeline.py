@@ -0,0 +1,166 @@
+import itertools
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import Pipeline  # noqa: E402
+from throttle import SiteBlocked  # noqa: E402
+
+
+def url(n):
+    return f"https://www.realtor.com/realestateagents/{n}"
+
+
+def discover_urls(urls):
+    def discover(emit):
+        for u in urls:
+            emit(u)
+    return discover
+
+
+class PipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.records = []
+        self.errors = []
+
+    def make(self, discover, fetch=lambda u: f"<html>{u}</html>", parse=lambda u, html: {'profile_url': u}, **kwargs):
+        kwargs.setdefault('fetch_workers', 3)
+        return Pipeline(discover, fetch, parse, self.records.append,
+                        on_error=lambda u, e: self.errors.append((u, str(e))), **kwargs)
+
+    def run_with_timeout(self, pipeline, timeout=10):
+        """pipeline.run() on a thread, so a shutdown bug fails the test instead of hanging it"""
+        outcome = {}
+
+        def target():
+            try:
+                outcome['stats'] = pipeline.run()
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        self.assertFalse(thread.is_alive(), "Pipeline did not shut down")
+        return outcome
+
+    def urls_sunk(self):
+        return {record['profile_url'] for record in self.records}
+
+
+class FlowTest(PipelineTest):
+
+    def test_every_url_reaches_the_sink(self):
+        urls = [url(n) for n in range(100)]
+        outcome = self.run_with_timeout(self.make(discover_urls(urls), buffer_size=5))
+        stats = outcome['stats']
+        self.assertEqual(self.urls_sunk(), set(urls))
+        self.assertEqual((stats['urls'], stats['fetched'], stats['parsed'], stats['records']), (100, 100, 100, 100))
+        self.assertEqual(stats['errors'], 0)
+        self.assertIsNone(stats['stopped'])
+
+    def test_sink_runs_on_the_calling_thread(self):
+        threads = set()
+        pipeline = self.make(discover_urls([url(n) for n in range(10)]))
+        pipeline.sink = lambda record: threads.add(threading.current_thread())
+        self.run_with_timeout(pipeline)
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.main_thread(), threads)  # run_with_timeout's thread, not the main one
+
+
+class ErrorTest(PipelineTest):
+
+    def test_fetch_and_parse_errors_go_to_on_error(self):
+        def fetch(u):
+            if u == url(3):
+                raise TimeoutError('timed out')
+            return u
+
+        def parse(u, html):
+            if u == url(5):
+                raise ValueError('no name')
+            return {'profile_url': u}
+
+        outcome = self.run_with_timeout(self.make(discover_urls([url(n) for n in range(10)]), fetch, parse))
+        self.assertEqual(sorted(self.errors), [(url(3), 'timed out'), (url(5), 'no name')])
+        self.assertEqual(self.urls_sunk(), {url(n) for n in range(10)} - {url(3), url(5)})
+        self.assertEqual(outcome['stats']['errors'], 2)
+
+    def test_discovery_error_keeps_urls_already_emitted(self):
+        def discover(emit):
+            emit(url(1))
+            emit(url(2))
+            raise RuntimeError('search page layout changed')
+
+        outcome = self.run_with_timeout(self.make(discover))
+        self.assertEqual(self.urls_sunk(), {url(1), url(2)})
+        self.assertEqual(outcome['stats']['discovery_error'], 'search page layout changed')
+        self.assertEqual(self.errors, [])
+
+
+class StopTest(PipelineTest):
+
+    def test_stop_error_in_fetch_ends_an_endless_discovery(self):
+        def fetch(u):
+            if u == url(20):
+                raise SiteBlocked('blocked')
+            return u
+
+        pipeline = self.make(discover_urls(url(n) for n in itertools.count()), fetch,
+                             buffer_size=5, stop_on=(SiteBlocked,))
+        outcome = self.run_with_timeout(pipeline)
+        self.assertIsInstance(outcome['error'], SiteBlocked)
+        self.assertEqual(pipeline.stats['stopped'], 'blocked')
+        self.assertEqual(self.errors, [])  # Neither the stop nor the unfetched URLs are errors
+        self.assertNotIn(url(20), self.urls_sunk())
+
+    def test_pages_fetched_before_the_stop_are_still_parsed(self):
+        fetched = []
+        lock = threading.Lock()
+
+        def fetch(u):
+            if u == url(5):
+                raise SiteBlocked('blocked')
+            with lock:
+                fetched.append(u)
+            return u
+
+        pipeline = self.make(discover_urls([url(n) for n in range(10)]), fetch, fetch_workers=1, stop_on=(SiteBlocked,))
+        self.run_with_timeout(pipeline)
+        self.assertEqual(self.urls_sunk(), set(fetched))
+        self.assertEqual(self.urls_sunk(), {url(n) for n in range(5)})
+
+    def test_stop_error_in_parse_is_reraised(self):
+        def parse(u, html):
+            raise SiteBlocked('challenge page')
+
+        outcome = self.run_with_timeout(self.make(discover_urls([url(n) for n in range(10)]), parse=parse,
+                                                  stop_on=(SiteBlocked,)))
+        self.assertIsInstance(outcome['error'], SiteBlocked)
+        self.assertEqual(self.records, [])
+
+    def test_stop_error_in_discovery_is_reraised(self):
+        def discover(emit):
+            emit(url(1))
+            raise SiteBlocked('search pages blocked')
+
+        outcome = self.run_with_timeout(self.make(discover, stop_on=(SiteBlocked,)))
+        self.assertEqual(str(outcome['error']), 'search pages blocked')
+        self.assertEqual(self.errors, [])  # url(1) may be left unfetched, but never as an error
+
+    def test_other_errors_do_not_stop_the_run(self):
+        def fetch(u):
+            raise TimeoutError('timed out')
+
+        outcome = self.run_with_timeout(self.make(discover_urls([url(n) for n in range(5)]), fetch,
+                                                  stop_on=(SiteBlocked,)))
+        self.assertEqual(len(self.errors), 5)
+        self.assertIsNone(outcome['stats']['stopped'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointLog  # noqa: E402
+from records import AgentRecord  # noqa: E402
+from recrawl import diff_records, latest_records, write_changes_csv  # noqa: E402
+
+
+def agent(n, **fields):
+    record = {'name': f"Agent {n}", 'phone_number': f"(606) 555-000{n}", 'address': '', 'brokerage': 'Team Realty',
+              'agent_license': '', 'profile_url': f"https://www.realtor.com/realestateagents/{n}"}
+    record.update(fields)
+    return record
+
+
+def by_url(*records):
+    return {record['profile_url']: AgentRecord.from_dict(record) for record in records}
+
+
+class DiffRecordsTest(unittest.TestCase):
+
+    def test_new_agent_is_added(self):
+        changes = list(diff_records({}, [agent(1)]))
+        self.assertEqual([(change['change'], change['name']) for change in changes], [('added', 'Agent 1')])
+
+    def test_unchanged_agent_is_left_out(self):
+        self.assertEqual(list(diff_records(by_url(agent(1)), [agent(1)])), [])
+
+    def test_changed_fields_are_listed_in_record_order(self):
+        current = agent(1, phone_number='(606) 555-9999', brokerage='Other Realty')
+        [change] = diff_records(by_url(agent(1)), [current])
+        self.assertEqual(change['change'], 'changed')
+        self.assertEqual(change['changed_fields'], 'phone_number;brokerage')
+        self.assertEqual(change['phone_number'], '(606) 555-9999')  # The new values
+
+    def test_missing_and_empty_fields_compare_equal(self):
+        current = agent(1)
+        del current['agent_license']
+        self.assertEqual(list(diff_records(by_url(agent(1)), [current])), [])
+
+    def test_removed_agents_come_last(self):
+        changes = list(diff_records(by_url(agent(1)), [agent(2)], removed=[agent(1)]))
+        self.assertEqual([(change['change'], change['name']) for change in changes],
+                         [('added', 'Agent 2'), ('removed', 'Agent 1')])
+
+    def test_current_can_be_a_generator(self):
+        changes = diff_records(by_url(agent(1)), (agent(n) for n in (1, 2)))
+        self.assertEqual([change['name'] for change in changes], ['Agent 2'])
+
+
+class ChangeFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, 'agents_progress.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_latest_record_wins(self):
+        with CheckpointLog(self.log_path) as log:
+            log.append(agent(1))
+            log.append(agent(2))
+            log.append(agent(1, brokerage='Other Realty'))
+        latest = latest_records(self.log_path, [agent(1)['profile_url']])
+        self.assertEqual(list(latest), [agent(1)['profile_url']])
+        self.assertEqual(latest[agent(1)['profile_url']]['brokerage'], 'Other Realty')
+
+    def test_changes_csv_counts_each_type(self):
+        csv_path = os.path.join(self.directory.name, 'agents_changes.csv')
+        changes = diff_records(by_url(agent(1), agent(2)), [agent(1, name='Renamed'), agent(3)], removed=[agent(2)])
+        counts = write_changes_csv(csv_path, changes)
+        self.assertEqual(counts, {'added': 1, 'changed': 1, 'removed': 1})
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(row['change'], row['changed_fields']) for row in rows],
+                         [('changed', 'name'), ('added', ''), ('removed', '')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fixture_server import StandInSite, start_server  # noqa: E402
+from search_pages import discover_profile_urls, page_count, profile_urls, search_page_url  # noqa: E402
+
+
+class RepeatingSite(StandInSite):
+    """Advertises more result pages than it has; past the end it serves the last page again
+
+    That's how realtor.com behaves past its page cap, and what the early stop is for.
+    """
+
+    advertised_pages = 6
+
+    def page_count(self, slug):
+        return self.advertised_pages
+
+    def cards(self, slug, page):
+        real_pages = max(1, -(-len(self.cities[slug][2]) // self.page_size))
+        return super().cards(slug, min(page, real_pages))
+
+
+class SiteTest(unittest.TestCase):
+    site = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server, base_url = start_server(site=cls.site)
+        cls.base_url = f"{base_url}/realestateagents"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.fetched = []
+
+    def fetch(self, url):
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                return response.read().decode('utf-8')
+        except urllib.error.HTTPError:
+            return None
+
+    def fetch_pages(self, urls):
+        self.fetched.extend(urls)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            return dict(zip(urls, pool.map(self.fetch, urls)))
+
+    def discover(self, city='London', state='KY', **kwargs):
+        return discover_profile_urls(city, state, self.fetch_pages, base_url=self.base_url, **kwargs)
+
+    def expected_urls(self, city='London', state='KY'):
+        return {f"{self.base_url}/{agent_id}" for agent_id in self.site.expected_agents([(city, state)])}
+
+
+class ResultsPageTest(SiteTest):
+    site = StandInSite([('London', 'KY')], agents_per_city=45, page_size=20)
+
+    def test_page_parsing(self):
+        url = search_page_url('London', 'KY', 2, self.base_url)
+        html = self.fetch(url)
+        self.assertEqual(page_count(html), 3)
+        self.assertEqual(len(profile_urls(html, url)), 20)
+        self.assertTrue(profile_urls(html, url) <= self.expected_urls())
+
+
+class DiscoveryTest(SiteTest):
+    site = StandInSite([('London', 'KY'), ('Corbin', 'KY')], agents_per_city=45, page_size=20)
+
+    def test_every_page_is_walked(self):
+        urls, pages_read = self.discover(batch_size=2)
+        self.assertEqual(urls, self.expected_urls())
+        self.assertEqual(pages_read, 3)
+
+    def test_on_page_runs_in_page_order_with_new_urls(self):
+        seen = []
+        self.discover(batch_size=8, on_page=lambda n, new_urls: seen.append((n, len(new_urls))))
+        self.assertEqual(seen, [(1, 20), (2, 20), (3, 5)])
+
+    def test_max_pages_caps_the_walk(self):
+        urls, pages_read = self.discover(max_pages=2)
+        self.assertEqual((len(urls), pages_read), (40, 2))
+
+    def test_unknown_city_gives_none(self):
+        self.assertEqual(self.discover(city='Nowhere'), (None, 0))
+
+
+class EarlyStopTest(SiteTest):
+    site = RepeatingSite([('London', 'KY')], agents_per_city=45, page_size=20)
+
+    def test_walk_stops_at_the_first_page_without_new_urls(self):
+        urls, pages_read = self.discover(batch_size=2)
+        self.assertEqual(urls, self.expected_urls())
+        self.assertEqual(pages_read, 4)  # Page 4 repeats page 3
+        fetched_pages = {url.rsplit('/pg-', 1)[-1] for url in self.fetched if '/pg-' in url}
+        self.assertNotIn('6', fetched_pages)  # The batch after the stop is never requested
+
+    def test_failed_page_is_skipped_not_a_stop(self):
+        missing = search_page_url('London', 'KY', 2, self.base_url)
+        fetch_pages = self.fetch_pages
+        self.fetch_pages = lambda urls: {url: html for url, html in fetch_pages(urls).items() if url != missing}
+        urls, pages_read = self.discover(batch_size=8)
+        self.assertEqual(len(urls), 25)  # Pages 1 and 3
+        self.assertEqual(pages_read, 3)
+
+
+class EmptyResultsTest(SiteTest):
+    site = StandInSite([('London', 'KY')], agents_per_city=0)
+
+    def test_page_one_without_profile_links_gives_none(self):
+        self.assertEqual(self.discover(), (None, 0))
+        self.assertEqual(len(self.fetched), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
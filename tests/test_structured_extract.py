@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from field_extraction import fill_missing_fields  # noqa: E402
+from structured_extract import extract_structured_fields, format_phone  # noqa: E402
+
+PROFILES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures', 'profiles')
+
+
+def fixture(agent_id):
+    with open(os.path.join(PROFILES_DIR, f"{agent_id}.html"), encoding='utf-8') as f:
+        return f.read()
+
+
+def next_data_page(agent):
+    blob = {'props': {'pageProps': {'listings': [{'name': 'Not the agent'}], 'agent': agent}}}
+    return (f'<html><head><script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+            '</head><body></body></html>')
+
+
+class FixturePageTest(unittest.TestCase):
+    """Saved realtor.com profile pages"""
+
+    def test_json_ld_fields(self):
+        self.assertEqual(extract_structured_fields(fixture('5c82a365e244bb00120dce62')), {
+            'name': 'Robert Petro',
+            'phone_number': '(606) 878-2097',
+            'address': '208 S Main St Corbin, KY 40701',
+            'brokerage': 'Petro Real Estate Group',
+            'agent_license': '247148',
+        })
+
+    def test_missing_fields_are_left_out(self):
+        fields = extract_structured_fields(fixture('56d68f00b5cc660100bd6f66'))
+        self.assertEqual(fields['brokerage'], 'Team Gumm Realty')
+        self.assertEqual(fields['phone_number'], '(606) 875-6616')
+        self.assertNotIn('agent_license', fields)
+
+    def test_page_without_embedded_json(self):
+        self.assertEqual(extract_structured_fields(fixture('5a4c7ff44107330014165023')), {})
+
+    def test_text_extractors_fill_only_the_gaps(self):
+        page = fixture('56d68f00b5cc660100bd6f66')
+        fields = fill_missing_fields(extract_structured_fields(page), page)
+        self.assertEqual(fields['agent_license'], '268276')
+        self.assertEqual(fields['name'], 'Team Gumm Realty')  # Kept from the JSON
+
+    def test_complete_record_skips_the_text_extractors(self):
+        page = fixture('5c82a365e244bb00120dce62')
+        fields = extract_structured_fields(page)
+        self.assertIs(fill_missing_fields(fields, page), fields)
+
+
+class NextDataTest(unittest.TestCase):
+    """__NEXT_DATA__ shapes the JSON-LD fixtures don't cover"""
+
+    def test_agent_object_is_found_by_its_marker_keys(self):
+        page = next_data_page({
+            'full_name': 'Ann Adams',
+            'phones': [{'type': 'office', 'number': '606-555-0100'}, {'type': 'mobile', 'number': '+1 606 555 0199'}],
+            'office': {'name': 'Bluegrass Realty',
+                       'address': {'line': '1 Main St', 'city': 'London', 'state_code': 'KY', 'postal_code': '40741'}},
+            'licenses': [{'license_number': ' 123456 '}],
+        })
+        self.assertEqual(extract_structured_fields(page), {
+            'name': 'Ann Adams',
+            'phone_number': '(606) 555-0199',  # Mobile beats office
+            'address': '1 Main St London, KY 40741',  # From the office when the agent has none
+            'brokerage': 'Bluegrass Realty',
+            'agent_license': '123456',
+        })
+
+    def test_name_from_first_and_last(self):
+        page = next_data_page({'first_name': 'Bill', 'last_name': 'Baker', 'name': '', 'phone': '6065550123',
+                               'broker': 'Summit Real Estate'})
+        self.assertEqual(extract_structured_fields(page), {
+            'name': 'Bill Baker',
+            'phone_number': '(606) 555-0123',
+            'brokerage': 'Summit Real Estate',
+        })
+
+    def test_unparseable_blob_is_skipped(self):
+        page = ('<script type="application/ld+json">{"@type": "RealEstateAgent", "name": </script>'
+                '<script type="application/ld+json">{"@type": "RealEstateAgent", "name": "Carla Clark"}</script>')
+        self.assertEqual(extract_structured_fields(page), {'name': 'Carla Clark'})
+
+    def test_phone_formats(self):
+        self.assertEqual(format_phone('+1-606-555-0123'), '(606) 555-0123')
+        self.assertEqual(format_phone('(606) 555.0123'), '(606) 555-0123')
+        self.assertEqual(format_phone('555-0123'), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
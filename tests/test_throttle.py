@@ -0,0 +1,174 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import throttle  # noqa: E402
+from page_checks import CHALLENGE, EMPTY, ERROR, OK  # noqa: E402
+from throttle import AdaptiveThrottle, SiteBlocked  # noqa: E402
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class ThrottleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(throttle.time, 'monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make(self, **kwargs):
+        kwargs.setdefault('start_rate', 1.0)
+        kwargs.setdefault('cooldown', 60.0)
+        return AdaptiveThrottle(**kwargs)
+
+
+class AimdTest(ThrottleTest):
+
+    def test_clean_responses_raise_the_rate_additively(self):
+        t = self.make(increase=0.5)
+        t.record(OK)
+        self.assertAlmostEqual(t.rate, 1.5)
+        t.rate = 4.0
+        t.record(OK)
+        self.assertAlmostEqual(t.rate, 4.125)  # increase / rate once above 1/s
+        self.assertAlmostEqual(t.peak_rate, 4.125)
+
+    def test_rate_is_capped(self):
+        t = self.make(max_rate=2.0)
+        for _ in range(50):
+            t.record(OK)
+        self.assertEqual(t.rate, 2.0)
+
+    def test_challenges_and_errors_cut_the_rate_multiplicatively(self):
+        t = self.make(start_rate=8.0, decrease=0.5)
+        t.record(ERROR)
+        self.assertAlmostEqual(t.rate, 4.0)
+        t.record(CHALLENGE)
+        self.assertAlmostEqual(t.rate, 2.0)
+        self.assertAlmostEqual(t.peak_rate, 8.0)
+
+    def test_rate_never_drops_below_the_floor(self):
+        t = self.make(min_rate=0.5)
+        for _ in range(10):
+            t.record(ERROR)
+        self.assertEqual(t.rate, 0.5)
+        self.assertFalse(t.is_open)  # Errors alone never open the breaker
+
+    def test_slots_are_spaced_by_the_rate(self):
+        t = self.make(start_rate=2.0)
+        self.assertEqual([t.reserve() for _ in range(3)], [0.0, 0.5, 1.0])
+        self.clock.advance(5)
+        self.assertEqual(t.reserve(), 0.0)  # Idle time isn't banked as a burst
+
+
+class EmptyPageTest(ThrottleTest):
+
+    def test_run_of_empty_pages_counts_as_a_challenge(self):
+        t = self.make(start_rate=4.0, empty_limit=3)
+        t.record(EMPTY)
+        t.record(EMPTY)
+        self.assertEqual(t.rate, 4.0)
+        t.record(EMPTY)
+        self.assertEqual(t.rate, 2.0)
+        self.assertEqual(t.challenge_streak, 1)
+
+    def test_clean_page_resets_the_empty_streak(self):
+        t = self.make(start_rate=4.0, empty_limit=3)
+        for outcome in (EMPTY, EMPTY, OK, EMPTY, EMPTY):
+            t.record(outcome)
+        self.assertGreater(t.rate, 4.0)
+        self.assertEqual(t.outcomes[EMPTY], 4)
+
+
+class BreakerTest(ThrottleTest):
+
+    def trip(self, t):
+        for _ in range(t.breaker_threshold):
+            t.record(CHALLENGE)
+
+    def test_challenge_streak_opens_the_breaker(self):
+        t = self.make(min_rate=0.1, breaker_threshold=3)
+        t.record(CHALLENGE)
+        t.record(CHALLENGE)
+        self.assertFalse(t.is_open)
+        t.record(CHALLENGE)
+        self.assertTrue(t.is_open)
+        self.assertEqual(t.rate, 0.1)
+        self.assertAlmostEqual(t.reserve(), 60.0)  # Fetches wait out the cooldown
+
+    def test_responses_during_the_cooldown_are_counted_but_ignored(self):
+        t = self.make()
+        self.trip(t)
+        t.record(CHALLENGE)
+        t.record(OK)
+        self.assertEqual(t.trips, 1)
+        self.assertTrue(t.is_open)
+        self.assertEqual(t.outcomes[CHALLENGE], 4)
+
+    def test_blocked_probe_reopens_with_a_doubled_cooldown(self):
+        t = self.make()
+        self.trip(t)
+        self.clock.advance(61)
+        t.record(CHALLENGE)  # Half-open probe
+        self.assertEqual(t.trips, 2)
+        self.assertEqual(t.open_until, self.clock.now + 120.0)
+        self.assertEqual(t.summary()['paused_seconds'], 180.0)
+
+    def test_cooldown_is_capped(self):
+        t = self.make(max_cooldown=100.0)
+        self.trip(t)
+        for _ in range(2):
+            self.clock.advance(t.open_until - self.clock.now + 1)
+            t.record(CHALLENGE)
+        self.assertEqual(t.open_until, self.clock.now + 100.0)
+
+    def test_clean_probe_closes_the_breaker(self):
+        t = self.make()
+        self.trip(t)
+        self.clock.advance(61)
+        t.record(OK)
+        self.assertIsNone(t.open_until)
+        self.assertEqual(t.trips, 0)
+        self.assertEqual(t.breaker_openings, 1)
+
+    def test_site_blocked_after_max_trips(self):
+        t = self.make(max_trips=2)
+        self.trip(t)
+        for _ in range(2):
+            self.clock.advance(t.open_until - self.clock.now + 1)
+            t.reserve()
+            t.record(CHALLENGE)
+        self.assertEqual(t.trips, 3)
+        with self.assertRaises(SiteBlocked):
+            t.reserve()
+        self.clock.advance(10000)
+        with self.assertRaises(SiteBlocked):
+            t.wait()  # Stays blocked after the cooldown, until reset
+
+        t.reset_breaker()
+        self.assertEqual(t.reserve(), 0.0)
+        self.assertFalse(t.is_open)
+
+    def test_reset_keeps_the_learned_rate(self):
+        t = self.make(start_rate=4.0)
+        t.record(ERROR)
+        t.reset_breaker()
+        self.assertEqual(t.rate, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
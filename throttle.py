@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Adaptive Throttling
+Paces requests by each profile response's outcome (ok / empty / challenge /
+error, see page_checks) with AIMD rate control instead of a hand-tuned constant:
+the request rate creeps up additively while responses are clean and is
+cut multiplicatively on challenges and errors. With enough fetches
+allowed in flight, the number actually in flight follows rate x latency,
+so concurrency rises and falls with it. Repeated challenge pages open a
+circuit breaker that pauses all fetches for a cooldown; if the site is
+still blocking after several cooldowns, the run stops (SiteBlocked)
+instead of writing empty records.
+"""
+
+import asyncio
+import threading
+import time
+import logging
+
+from page_checks import OK, EMPTY, CHALLENGE, ERROR, OUTCOMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START_RATE = 1.0  # Requests/sec
+DEFAULT_MAX_RATE = 10.0
+
+
+class SiteBlocked(RuntimeError):
+    """The site kept serving challenge pages through every breaker cooldown"""
+
+
+class AdaptiveThrottle:
+    """AIMD request pacing plus a circuit breaker, shared by every fetch path of one scraper
+
+    Each clean response adds increase/rate requests/sec (about `increase`
+    for every second of clean traffic, at most `increase` per response);
+    each challenge or error multiplies the rate by `decrease`.
+    `empty_limit` empty pages in a row count as a challenge (a soft block).
+    `breaker_threshold` challenges in a row open the breaker for `cooldown`
+    seconds, doubling while the site keeps blocking; after `max_trips`
+    cooldowns without a clean response, wait() raises SiteBlocked until
+    reset_breaker() is called.
+    Thread-safe; wait_async() is the asyncio variant.
+    """
+
+    def __init__(self, start_rate=DEFAULT_START_RATE, min_rate=0.1, max_rate=DEFAULT_MAX_RATE, increase=0.5,
+                 decrease=0.5, empty_limit=5, breaker_threshold=3, cooldown=60.0, max_cooldown=900.0, max_trips=4):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = min(max(start_rate, self.min_rate), max_rate)
+        self.peak_rate = self.rate
+        self.increase = increase
+        self.decrease = decrease
+        self.empty_limit = empty_limit
+        self.breaker_threshold = breaker_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.challenge_streak = 0
+        self.empty_streak = 0
+        self.trips = 0  # Breaker openings since the last clean response
+        self.breaker_openings = 0
+        self.open_until = None  # Breaker open until this time.monotonic()
+        self.next_slot = 0.0
+        self.paused_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Claim the next request slot; returns how long to sleep before sending"""
+        with self.lock:
+            now = time.monotonic()
+            if self.open_until is not None:
+                if self.trips > self.max_trips:
+                    raise SiteBlocked(f"Still blocked after {self.max_trips} breaker cooldowns - stopping")
+                if now < self.open_until:
+                    self.next_slot = max(self.next_slot, self.open_until)
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + 1.0 / self.rate
+            return slot - now
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, outcome):
+        """Feed back one response's outcome (OK / EMPTY / CHALLENGE / ERROR)"""
+        with self.lock:
+            self.outcomes[outcome] += 1
+            if self.is_open:
+                return  # Sent before the breaker opened; the cooldown stands
+            if outcome == EMPTY:
+                self.empty_streak += 1
+                if self.empty_streak < self.empty_limit:
+                    return
+                outcome = CHALLENGE  # A run of empty pages is a soft block
+            else:
+                self.empty_streak = 0
+
+            if outcome == OK:
+                self.challenge_streak = 0
+                self.trips = 0
+                self.open_until = None  # Half-open probe came back clean
+                self.rate = min(self.max_rate, self.rate + min(self.increase, self.increase / self.rate))
+                self.peak_rate = max(self.peak_rate, self.rate)
+                return
+
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if outcome == CHALLENGE:
+                self.challenge_streak += 1
+                if self.open_until is not None or self.challenge_streak >= self.breaker_threshold:
+                    self.open_breaker()
+
+    def open_breaker(self):
+        self.trips += 1
+        self.breaker_openings += 1
+        self.challenge_streak = 0
+        cooldown = min(self.max_cooldown, self.cooldown * 2 ** (self.trips - 1))
+        self.open_until = time.monotonic() + cooldown
+        self.paused_seconds += cooldown
+        self.rate = self.min_rate  # Probe gently once the cooldown is over
+        if self.trips > self.max_trips:
+            logger.error(f"Site still serving challenge pages after {self.max_trips} cooldowns - giving up")
+            return
+        logger.warning(f"Challenge pages from the site - pausing fetches for {cooldown:.0f}s "
+                       f"(breaker trip {self.trips}/{self.max_trips})")
+
+    def reset_breaker(self):
+        """Close the breaker and forget its trips (e.g. before the next city); the learned rate is kept"""
+        with self.lock:
+            self.open_until = None
+            self.trips = 0
+            self.challenge_streak = 0
+            self.empty_streak = 0
+
+    @property
+    def is_open(self):
+        return self.open_until is not None and time.monotonic() < self.open_until
+
+    def summary(self):
+        return dict(self.outcomes, rate=round(self.rate, 2), peak_rate=round(self.peak_rate, 2),
+                    breaker_openings=self.breaker_openings, paused_seconds=round(self.paused_seconds, 1))
+
+    def log_summary(self):
+        if not any(self.outcomes.values()):
+            return
+        s = self.summary()
+        logger.info(f"Throttle: {s[OK]} ok, {s[EMPTY]} empty, {s[CHALLENGE]} challenge, {s[ERROR]} error - "
+                    f"rate now {s['rate']}/s (peak {s['peak_rate']}/s), "
+                    f"breaker opened {s['breaker_openings']}x ({s['paused_seconds']}s paused)")
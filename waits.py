@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Realtor.com Agent Scraper - Readiness Waits
+Blocks on concrete page signals (element present, agent-card count settled,
+network idle) instead of fixed time.sleep calls, with a timeout per page
+type and a latency histogram of every wait.
+"""
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import time
+import logging
+
+from metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before giving up, per page type
+PAGE_TIMEOUTS = {
+    'search': 15,      # realestateagents landing page / search box
+    'results': 20,     # search results after submitting a city
+    'pagination': 15,  # next results page after clicking "Next"
+    'scroll': 5,       # lazy-loaded cards after a scroll
+    'profile': 10,     # agent profile page
+}
+
+AGENT_CARD_SELECTOR = '[data-testid="agent-name"], a[href*="/realestateagents/5"]'
+
+NETWORK_STATE_SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+class PageWaiter:
+    """Readiness waits for one driver, recording how long each wait took"""
+
+    def __init__(self, driver, timeouts=None, poll_interval=0.05):
+        self.driver = driver
+        self.timeouts = dict(PAGE_TIMEOUTS, **(timeouts or {}))
+        self.poll_interval = poll_interval
+        self.histograms = {}
+        self.timeouts_hit = {}
+
+    def wait_until(self, page_type, condition, description):
+        """Poll condition(driver) until truthy; returns its value, or None on timeout"""
+        timeout = self.timeouts.get(page_type, 10)
+        started = time.time()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_interval).until(condition)
+        except TimeoutException:
+            result = None
+            self.timeouts_hit[page_type] = self.timeouts_hit.get(page_type, 0) + 1
+            logger.warning(f"  Timed out after {timeout}s waiting for {description}")
+        self.histograms.setdefault(page_type, LatencyHistogram()).observe(time.time() - started)
+        return result
+
+    def wait_for_element(self, page_type, by, selector, clickable=False):
+        """Element present (or clickable) in the DOM"""
+        condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+        return self.wait_until(page_type, condition((by, selector)), selector)
+
+    def wait_for_profile(self):
+        """Profile page rendered far enough to extract: the agent name h1 is there"""
+        return self.wait_for_element('profile', By.TAG_NAME, 'h1')
+
+    def wait_for_stale(self, page_type, element):
+        """Old page element detached - the navigation actually happened"""
+        return self.wait_until(page_type, EC.staleness_of(element), 'page change')
+
+    def wait_for_cards_settled(self, page_type, selector=AGENT_CARD_SELECTOR, settle_time=0.5):
+        """Agent-card count > 0 and unchanged for settle_time seconds"""
+        state = {'count': -1, 'since': time.time()}
+
+        def settled(driver):
+            count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+            now = time.time()
+            if count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return count if count > 0 and now - state['since'] >= settle_time else False
+
+        return self.wait_until(page_type, settled, 'agent cards to settle')
+
+    def wait_for_network_idle(self, page_type, idle_time=0.5):
+        """Document loaded and no new resource requests for idle_time seconds"""
+        state = {'resources': -1, 'since': time.time()}
+
+        def idle(driver):
+            ready_state, resources = driver.execute_script(NETWORK_STATE_SCRIPT)
+            now = time.time()
+            if resources != state['resources']:
+                state['resources'], state['since'] = resources, now
+                return False
+            return ready_state == 'complete' and now - state['since'] >= idle_time
+
+        return self.wait_until(page_type, idle, 'network idle')
+
+    def log_summary(self):
+        """Log the real wait distribution per page type"""
+        if not self.histograms:
+            return
+        logger.info("Readiness wait latency:")
+        for page_type, histogram in sorted(self.histograms.items()):
+            timeouts = self.timeouts_hit.get(page_type, 0)
+            logger.info(f"  {page_type:<10} {histogram.format_summary()}"
+                        + (f" timeouts={timeouts}" if timeouts else ""))